@@ -0,0 +1,40 @@
+"""product listing indexes
+
+Revision ID: 3f9c2b7d41e8
+Revises: aed0661c104a
+Create Date: 2026-10-18 10:12:44.318902
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9c2b7d41e8'
+down_revision: Union[str, Sequence[str], None] = 'aed0661c104a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # keyset pagination of GET /inventory/products
+    op.create_index('ix_inventory_products_created_at_id', 'inventory_products', ['created_at', 'id'], unique=False)
+    op.create_index('ix_inventory_products_active_created_at_id', 'inventory_products', ['is_active', 'created_at', 'id'], unique=False)
+    # filters
+    op.create_index('ix_inventory_products_sku_pattern', 'inventory_products', ['sku'], unique=False, postgresql_ops={'sku': 'varchar_pattern_ops'})
+    op.create_index('ix_inventory_product_categories_category_id', 'inventory_product_categories', ['category_id', 'product_id'], unique=False)
+    # name search: lower(name) LIKE '%term%'
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.create_index('ix_inventory_products_name_trgm', 'inventory_products', [sa.text('lower(name) gin_trgm_ops')], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_inventory_products_name_trgm', table_name='inventory_products')
+    op.drop_index('ix_inventory_product_categories_category_id', table_name='inventory_product_categories')
+    op.drop_index('ix_inventory_products_sku_pattern', table_name='inventory_products')
+    op.drop_index('ix_inventory_products_active_created_at_id', table_name='inventory_products')
+    op.drop_index('ix_inventory_products_created_at_id', table_name='inventory_products')
@@ -0,0 +1,37 @@
+"""reservation expiry
+
+Revision ID: 5d1f0a8c3e92
+Revises: e2d85b3c9f61
+Create Date: 2026-10-18 18:32:50.774019
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d1f0a8c3e92'
+down_revision: Union[str, Sequence[str], None] = 'e2d85b3c9f61'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("ALTER TYPE orderstatus ADD VALUE IF NOT EXISTS 'EXPIRED'")
+    op.add_column('stock_reservation', sa.Column('expires_at', sa.DateTime(timezone=True), nullable=True))
+    # existing holds get the default TTL (RESERVATION_TTL_MINUTES=1440) from their creation
+    op.execute("UPDATE stock_reservation SET expires_at = created_at + interval '1 day'")
+    op.alter_column('stock_reservation', 'expires_at', nullable=False)
+    op.create_index('ix_stock_reservation_expires_at', 'stock_reservation', ['expires_at'], unique=False, postgresql_where=sa.text("status = 'RESERVED'"))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_stock_reservation_expires_at', table_name='stock_reservation', postgresql_where=sa.text("status = 'RESERVED'"))
+    op.drop_column('stock_reservation', 'expires_at')
+    # Postgres can't drop an enum value: expired orders become cancelled and
+    # 'EXPIRED' stays in the type, unused
+    op.execute("UPDATE orders SET status = 'CANCELLED' WHERE status = 'EXPIRED'")
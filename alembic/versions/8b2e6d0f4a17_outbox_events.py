@@ -0,0 +1,40 @@
+"""outbox events
+
+Revision ID: 8b2e6d0f4a17
+Revises: 3f9c2b7d41e8
+Create Date: 2026-10-18 14:03:27.551204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b2e6d0f4a17'
+down_revision: Union[str, Sequence[str], None] = '3f9c2b7d41e8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('outbox_events',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('topic', sa.String(length=100), nullable=False),
+    sa.Column('key', sa.String(length=255), nullable=True),
+    sa.Column('payload', sa.JSON(), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('available_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_outbox_events_topic_available_at', 'outbox_events', ['topic', 'available_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_outbox_events_topic_available_at', table_name='outbox_events')
+    op.drop_table('outbox_events')
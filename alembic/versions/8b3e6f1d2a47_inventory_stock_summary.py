@@ -0,0 +1,118 @@
+"""inventory stock summary
+
+Revision ID: 8b3e6f1d2a47
+Revises: 5d1f0a8c3e92
+Create Date: 2026-10-18 19:47:12.508316
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b3e6f1d2a47'
+down_revision: Union[str, Sequence[str], None] = '5d1f0a8c3e92'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(sa.schema.CreateSequence(sa.Sequence('inventory_stock_summary_version_seq')))
+    op.create_table('inventory_stock_summary',
+    sa.Column('stock_id', sa.Uuid(), nullable=False),
+    sa.Column('location_id', sa.Uuid(), nullable=False),
+    sa.Column('product_id', sa.Uuid(), nullable=False),
+    sa.Column('sku', sa.String(length=100), nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.Column('reserved_quantity', sa.Integer(), nullable=False),
+    sa.Column('reorder_point', sa.Integer(), nullable=False),
+    sa.Column('available', sa.Integer(), sa.Computed('quantity - reserved_quantity'), nullable=False),
+    sa.Column('low_stock', sa.Boolean(), sa.Computed('quantity - reserved_quantity <= reorder_point'), nullable=False),
+    sa.Column('version', sa.BigInteger(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['stock_id'], ['inventory_stock.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('stock_id')
+    )
+    op.create_index('ix_inventory_stock_summary_location_product', 'inventory_stock_summary', ['location_id', 'product_id'], unique=True)
+
+    # existing stock, before the triggers take over
+    op.execute("""
+        INSERT INTO inventory_stock_summary (
+            stock_id, location_id, product_id, sku, name,
+            quantity, reserved_quantity, reorder_point, version, updated_at
+        )
+        SELECT s.id, s.location_id, s.product_id, p.sku, p.name,
+               s.quantity, s.reserved_quantity, s.reorder_point,
+               nextval('inventory_stock_summary_version_seq'), now()
+        FROM inventory_stock s
+        JOIN inventory_products p ON p.id = s.product_id
+    """)
+
+    # same objects as the after_create DDL in app/inventory/models/stock_summary.py
+    op.execute("""
+        CREATE OR REPLACE FUNCTION inventory_stock_summary_sync() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO inventory_stock_summary (
+                stock_id, location_id, product_id, sku, name,
+                quantity, reserved_quantity, reorder_point, version, updated_at
+            )
+            SELECT NEW.id, NEW.location_id, NEW.product_id, p.sku, p.name,
+                   NEW.quantity, NEW.reserved_quantity, NEW.reorder_point,
+                   nextval('inventory_stock_summary_version_seq'), now()
+            FROM inventory_products p
+            WHERE p.id = NEW.product_id
+            ON CONFLICT (stock_id) DO UPDATE SET
+                location_id = EXCLUDED.location_id,
+                product_id = EXCLUDED.product_id,
+                sku = EXCLUDED.sku,
+                name = EXCLUDED.name,
+                quantity = EXCLUDED.quantity,
+                reserved_quantity = EXCLUDED.reserved_quantity,
+                reorder_point = EXCLUDED.reorder_point,
+                version = EXCLUDED.version,
+                updated_at = EXCLUDED.updated_at;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER inventory_stock_summary_sync
+        AFTER INSERT OR UPDATE OF location_id, product_id, quantity, reserved_quantity, reorder_point
+        ON inventory_stock
+        FOR EACH ROW EXECUTE FUNCTION inventory_stock_summary_sync()
+    """)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION inventory_stock_summary_product_sync() RETURNS trigger AS $$
+        BEGIN
+            UPDATE inventory_stock_summary
+            SET sku = NEW.sku,
+                name = NEW.name,
+                version = nextval('inventory_stock_summary_version_seq'),
+                updated_at = now()
+            WHERE product_id = NEW.id;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER inventory_stock_summary_product_sync
+        AFTER UPDATE OF sku, name ON inventory_products
+        FOR EACH ROW
+        WHEN (OLD.sku IS DISTINCT FROM NEW.sku OR OLD.name IS DISTINCT FROM NEW.name)
+        EXECUTE FUNCTION inventory_stock_summary_product_sync()
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS inventory_stock_summary_product_sync ON inventory_products")
+    op.execute("DROP TRIGGER IF EXISTS inventory_stock_summary_sync ON inventory_stock")
+    op.execute("DROP FUNCTION IF EXISTS inventory_stock_summary_product_sync()")
+    op.execute("DROP FUNCTION IF EXISTS inventory_stock_summary_sync()")
+    op.drop_index('ix_inventory_stock_summary_location_product', table_name='inventory_stock_summary')
+    op.drop_table('inventory_stock_summary')
+    op.execute(sa.schema.DropSequence(sa.Sequence('inventory_stock_summary_version_seq')))
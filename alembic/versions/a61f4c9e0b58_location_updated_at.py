@@ -0,0 +1,28 @@
+"""location updated_at
+
+Revision ID: a61f4c9e0b58
+Revises: 8b3e6f1d2a47
+Create Date: 2026-10-18 20:31:05.219734
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a61f4c9e0b58'
+down_revision: Union[str, Sequence[str], None] = '8b3e6f1d2a47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('inventory_location', sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('inventory_location', 'updated_at')
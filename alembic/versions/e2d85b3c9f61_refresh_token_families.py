@@ -0,0 +1,33 @@
+"""refresh token families
+
+Revision ID: e2d85b3c9f61
+Revises: c4a7e19b2d53
+Create Date: 2026-10-18 17:08:12.402716
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2d85b3c9f61'
+down_revision: Union[str, Sequence[str], None] = 'c4a7e19b2d53'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('refresh_tokens', sa.Column('family_id', sa.Uuid(), nullable=True))
+    # existing tokens each start their own family
+    op.execute('UPDATE refresh_tokens SET family_id = id')
+    op.alter_column('refresh_tokens', 'family_id', nullable=False)
+    op.create_index(op.f('ix_refresh_tokens_family_id'), 'refresh_tokens', ['family_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_refresh_tokens_family_id'), table_name='refresh_tokens')
+    op.drop_column('refresh_tokens', 'family_id')
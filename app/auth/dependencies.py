@@ -1,26 +1,56 @@
 import uuid
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.exceptions import TokenExpired, TokenInvalid
+from app.auth.principal import Principal
 from app.auth.repositories.password_reset import PasswordResetTokenRepository
 from app.auth.repositories.refresh_token import RefreshTokenRepository
 from app.auth.service import AuthService
+from app.core.config import settings
 from app.core.security.tokens import verify_access_token
-from app.database.session import get_session
-from app.mail.mailer import Mailer
+from app.database.session import RequestContext, get_request_context, get_session
+from app.mail.queue import MailQueue
+from app.outbox.repository import OutboxRepository
+from app.ratelimit.limiter import RateLimit, rate_limiter
 from app.users.model import User
 from app.users.repository import UserRepository
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
+AUTH_BY_IP = RateLimit(
+    "auth.ip", settings.AUTH_RATE_LIMIT_IP_BURST, settings.AUTH_RATE_LIMIT_IP_PER_MINUTE
+)
+LOGIN_BY_EMAIL = RateLimit(
+    "auth.login.email",
+    settings.AUTH_RATE_LIMIT_EMAIL_BURST,
+    settings.AUTH_RATE_LIMIT_EMAIL_PER_MINUTE,
+)
+FORGOT_BY_EMAIL = RateLimit(
+    "auth.forgot.email",
+    settings.AUTH_RATE_LIMIT_EMAIL_BURST,
+    settings.AUTH_RATE_LIMIT_EMAIL_PER_MINUTE,
+)
 
-async def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: AsyncSession = Depends(get_session),
-) -> User:
+
+def client_ip(request: Request) -> str:
+    # behind the load balancer this is the forwarded address: ProxyHeadersMiddleware
+    # rewrites it when the peer is in FORWARDED_ALLOW_IPS
+    return request.client.host if request.client else "unknown"
+
+
+async def limit_auth_by_ip(request: Request) -> None:
+    """Router-level guard for /auth/*: runs before the session or any hashing."""
+    await rate_limiter.hit(AUTH_BY_IP, client_ip(request))
+
+
+async def limit_by_email(limit: RateLimit, email: str) -> None:
+    await rate_limiter.hit(limit, email.strip().lower())
+
+
+def _verify_token_subject(token: str) -> tuple[uuid.UUID, dict]:
     try:
         payload = verify_access_token(token)
     except (TokenInvalid, TokenExpired):
@@ -44,8 +74,12 @@ async def get_current_user(
             detail="Invalid token payload",
         )
 
+    return user_uuid, payload
+
+
+async def _load_user(db: AsyncSession, user_id: uuid.UUID) -> User:
     user_repo = UserRepository(db)
-    user = await user_repo.get_by_id(user_uuid)
+    user = await user_repo.get_by_id(user_id)
 
     if user is None:
         raise HTTPException(
@@ -56,11 +90,42 @@ async def get_current_user(
     return user
 
 
-def get_auth_service(session: AsyncSession = Depends(get_session)) -> AuthService:
+async def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_session, scope="function"),
+) -> User:
+    user_id, _ = _verify_token_subject(token)
+    return await _load_user(db, user_id)
+
+
+async def get_current_principal(
+    token: str = Depends(oauth2_scheme),
+    context: RequestContext = Depends(get_request_context, scope="request"),
+) -> Principal:
+    if context.principal is not None:
+        return context.principal
+
+    user_id, payload = _verify_token_subject(token)
+
+    if settings.AUTH_STATELESS:
+        # the signature was verified, so the claims are trusted as issued
+        roles = payload.get("roles") or []
+        principal = Principal(id=user_id, roles=tuple(str(role) for role in roles))
+    else:
+        # the user lands in the session identity map, so a handler that also
+        # depends on get_current_user does not query it again
+        user = await _load_user(context.session, user_id)
+        principal = Principal(id=user.id, roles=tuple(role.name for role in user.roles))
+
+    context.principal = principal
+    return principal
+
+
+def get_auth_service(session: AsyncSession = Depends(get_session, scope="function")) -> AuthService:
     """Dependency injection for AuthService with all repositories."""
     return AuthService(
         user_repo=UserRepository(session),
         refresh_repo=RefreshTokenRepository(session),
         reset_repo=PasswordResetTokenRepository(session),
-        mailer=Mailer() 
-    )
\ No newline at end of file
+        mail_queue=MailQueue(OutboxRepository(session)),
+    )
@@ -33,6 +33,14 @@ class RefreshToken(Base):
         nullable=False,
     )
 
+    # every token rotated from the same login shares the login token's
+    # family; replaying a rotated token revokes the whole family
+    family_id: Mapped[uuid.UUID] = mapped_column(
+        Uuid,
+        index=True,
+        nullable=False,
+    )
+
     expires_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         nullable=False,
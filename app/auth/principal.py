@@ -0,0 +1,16 @@
+import uuid
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class Principal:
+    """
+    the authenticated caller as far as authorization is concerned.
+
+    handlers that only need the caller's id (and guards that only need its
+    roles) depend on this instead of the full `User` row, so the stateless
+    auth mode can serve them without touching the database.
+    """
+
+    id: uuid.UUID
+    roles: tuple[str, ...] = ()
@@ -25,7 +25,7 @@ class PasswordResetTokenRepository:
                 used=False,
             )
         )
-        await self.db.commit()
+        await self.db.flush()
 
     async def get_valid(self, token: str) -> Optional[PasswordResetToken]:
         stmt = select(PasswordResetToken).where(
@@ -43,7 +43,6 @@ class PasswordResetTokenRepository:
             .values(used=True)
         )
         await self.db.execute(stmt)
-        await self.db.commit()
 
     async def invalidate_all_for_user(self, user_id: uuid.UUID) -> None:
         stmt = (
@@ -55,4 +54,3 @@ class PasswordResetTokenRepository:
             .values(used=True)
         )
         await self.db.execute(stmt)
-        await self.db.commit()
@@ -1,10 +1,13 @@
 import hashlib
 import uuid
+from collections.abc import Callable
+from contextlib import AbstractAsyncContextManager
 from datetime import datetime
 from typing import Optional
 
 from app.auth.model import RefreshToken
-from sqlalchemy import select, update
+from app.database.session import get_script_session
+from sqlalchemy import func, insert, literal, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 
@@ -13,8 +16,16 @@ def _hash_token(token: str) -> str:
 
 
 class RefreshTokenRepository:
-    def __init__(self, db: AsyncSession):
+    def __init__(
+        self,
+        db: AsyncSession,
+        session_factory: Callable[
+            [], AbstractAsyncContextManager[AsyncSession]
+        ] | None = None,
+    ):
         self.db = db
+        # for writes that must not share the request's fate (revoke_family)
+        self.session_factory = session_factory or get_script_session
 
     async def create(
         self,
@@ -26,11 +37,59 @@ class RefreshTokenRepository:
             RefreshToken(
                 user_id=user_id,
                 token_hash=_hash_token(token),
+                family_id=uuid.uuid7(),  # a login starts a new family
                 expires_at=expires_at,
                 is_revoked=False,
             )
         )
-        await self.db.commit()
+        await self.db.flush()
+
+    async def rotate(
+        self, token: str, new_token: str, expires_at: datetime
+    ) -> uuid.UUID | None:
+        """
+        Revoke `token` and issue `new_token` in its family, in one statement:
+
+            WITH old AS (UPDATE refresh_tokens SET is_revoked = true
+                         WHERE token_hash = :h AND NOT is_revoked
+                           AND expires_at > now()
+                         RETURNING user_id, family_id)
+            INSERT INTO refresh_tokens ... SELECT ... FROM old
+            RETURNING user_id
+
+        Concurrent rotations of one token queue on the UPDATE's row lock and
+        only the first finds it active. Returns the user id, or None when
+        nothing was rotated (unknown, revoked or expired token); the caller
+        tells those apart.
+        """
+        old = (
+            update(RefreshToken)
+            .where(
+                RefreshToken.token_hash == _hash_token(token),
+                RefreshToken.is_revoked.is_(False),
+                RefreshToken.expires_at > func.now(),
+            )
+            .values(is_revoked=True)
+            .returning(RefreshToken.user_id, RefreshToken.family_id)
+            .cte("old")
+        )
+        stmt = (
+            insert(RefreshToken)
+            .from_select(
+                ["id", "token_hash", "user_id", "family_id", "expires_at", "is_revoked"],
+                select(
+                    literal(uuid.uuid7(), RefreshToken.id.type),
+                    literal(_hash_token(new_token), RefreshToken.token_hash.type),
+                    old.c.user_id,
+                    old.c.family_id,
+                    literal(expires_at, RefreshToken.expires_at.type),
+                    literal(False, RefreshToken.is_revoked.type),
+                ),
+            )
+            .returning(RefreshToken.user_id)
+        )
+        result = await self.db.execute(stmt)
+        return result.scalar_one_or_none()
 
     async def get_by_token(self, token: str) -> Optional[RefreshToken]:
         stmt = select(RefreshToken).where(RefreshToken.token_hash == _hash_token(token))
@@ -52,7 +111,23 @@ class RefreshTokenRepository:
             .values(is_revoked=True)
         )
         await self.db.execute(stmt)
-        await self.db.commit()
+
+    async def revoke_family(self, family_id: uuid.UUID) -> None:
+        """
+        Revoke every active token of the family in its own short transaction,
+        committed even though the request that detected the reuse fails and
+        rolls back.
+        """
+        stmt = (
+            update(RefreshToken)
+            .where(
+                RefreshToken.family_id == family_id,
+                RefreshToken.is_revoked.is_(False),
+            )
+            .values(is_revoked=True)
+        )
+        async with self.session_factory() as session:
+            await session.execute(stmt)
 
     async def revoke_all_for_user(self, user_id: uuid.UUID) -> None:
         stmt = (
@@ -64,4 +139,3 @@ class RefreshTokenRepository:
             .values(is_revoked=True)
         )
         await self.db.execute(stmt)
-        await self.db.commit()
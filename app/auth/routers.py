@@ -2,7 +2,14 @@ import logging
 
 from fastapi import APIRouter, Depends, status
 
-from app.auth.dependencies import get_auth_service, get_current_user
+from app.auth.dependencies import (
+    FORGOT_BY_EMAIL,
+    LOGIN_BY_EMAIL,
+    get_auth_service,
+    get_current_user,
+    limit_auth_by_ip,
+    limit_by_email,
+)
 from app.auth.schemas import (
     ChangePasswordRequest,
     ForgotPasswordRequest,
@@ -17,7 +24,9 @@ from app.users.model import User
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/auth", tags=["AUTH"])
+router = APIRouter(
+    prefix="/auth", tags=["AUTH"], dependencies=[Depends(limit_auth_by_ip)]
+)
 
 
 @router.post("/login", response_model=TokenResponse)
@@ -26,6 +35,8 @@ async def login(
     service: AuthService = Depends(get_auth_service),
 ):
     logger.info("login endpoint called", extra={"email": data.email})
+    # before the user lookup and the Argon2 verify
+    await limit_by_email(LOGIN_BY_EMAIL, data.email)
     tokens = await service.login(data.email, data.password)
     logger.info("login endpoint succeeded", extra={"email": data.email})
     return tokens
@@ -58,6 +69,7 @@ async def forgot_password(
     service: AuthService = Depends(get_auth_service),
 ):
     logger.info("forgot_password endpoint called", extra={"email": data.email})
+    await limit_by_email(FORGOT_BY_EMAIL, data.email)
     await service.forgot_password(data.email)
     logger.info("forgot_password endpoint succeeded", extra={"email": data.email})
 
@@ -1,5 +1,6 @@
 import logging
 from datetime import datetime, timedelta, timezone
+from typing import NoReturn
 
 from app.auth.exceptions import (
     InvalidCredentials,
@@ -10,16 +11,13 @@ from app.auth.repositories.password_reset import PasswordResetTokenRepository
 from app.auth.repositories.refresh_token import RefreshTokenRepository
 from app.auth.schemas import TokenResponse
 from app.core.config import settings
-from app.core.security.passwords import (
-    hash_password,
-    verify_password,
-)
+from app.core.security.passwords import password_hashing
 from app.core.security.tokens import (
     create_access_token,
     generate_refresh_token,
     generate_reset_token,
 )
-from app.mail.mailer import Mailer
+from app.mail.queue import MailQueue
 from app.users.model import User
 from app.users.repository import UserRepository
 
@@ -31,21 +29,33 @@ class AuthService:
         user_repo: UserRepository,
         refresh_repo: RefreshTokenRepository,
         reset_repo: PasswordResetTokenRepository,
-        mailer: Mailer
+        mail_queue: MailQueue
     ):
         self.user_repo = user_repo
         self.refresh_repo = refresh_repo
         self.reset_repo = reset_repo
-        self.mailer = mailer
+        self.mail_queue = mail_queue
 
 
     async def login(self, email: str, password: str) -> TokenResponse:
         user = await self.user_repo.get_by_email(email)
+        if not user:
+            logger.warning("login: invalid credentials", extra={"email": email})
+            raise InvalidCredentials()
 
-        if not user or not verify_password(password, user.hashed_password):
+        valid, new_hash = await password_hashing.verify_and_rehash(
+            password, user.hashed_password
+        )
+        if not valid:
             logger.warning("login: invalid credentials", extra={"email": email})
             raise InvalidCredentials()
 
+        if new_hash:
+            # hashed with older Argon2 parameters: upgrade while we hold the password
+            user.hashed_password = new_hash
+            await self.user_repo.save_user(user)
+            logger.info("login: password rehashed", extra={"user_id": str(user.id)})
+
         access_token = create_access_token(
             user.id,
             roles=[role.name for role in user.roles],
@@ -79,39 +89,46 @@ class AuthService:
         logger.info("user logged out", extra={"user_id": str(token.user_id)})
 
     async def refresh_session(self, refresh_token: str) -> TokenResponse:
-        token = await self.refresh_repo.get_active(refresh_token)
-
-        if not token:
-            logger.warning("refresh_session: invalid refresh token")
-            raise TokenExpired("Invalid refresh token.")
-
-        if token.expires_at < datetime.now(timezone.utc):
-            logger.warning("refresh_session: refresh token expired", extra={"user_id": str(token.user_id)})
-            raise TokenExpired("Invalid refresh token.")
-
-        await self.refresh_repo.revoke(token.id)
-
         new_refresh_token = generate_refresh_token()
         new_expires_at = datetime.now(timezone.utc) + timedelta(
             days=settings.REFRESH_TOKEN_EXPIRE_DAYS
         )
 
-        await self.refresh_repo.create(
-            user_id=token.user_id,
-            token=new_refresh_token,
-            expires_at=new_expires_at,
+        # revoke + insert in one statement: two round trips in all with the roles
+        user_id = await self.refresh_repo.rotate(
+            refresh_token, new_refresh_token, new_expires_at
         )
+        if user_id is None:
+            await self._reject_refresh(refresh_token)
 
-        user = await self.user_repo.get_by_id(token.user_id)
-        roles = [role.name for role in user.roles] if user else []
-        access_token = create_access_token(token.user_id, roles=roles)
+        roles = await self.user_repo.get_role_names(user_id)
+        access_token = create_access_token(user_id, roles=roles)
 
-        logger.info("session refreshed", extra={"user_id": str(token.user_id)})
+        logger.info("session refreshed", extra={"user_id": str(user_id)})
         return TokenResponse(
             access_token=access_token,
             refresh_token=new_refresh_token,
         )
 
+    async def _reject_refresh(self, refresh_token: str) -> NoReturn:
+        token = await self.refresh_repo.get_by_token(refresh_token)
+
+        if token is None:
+            logger.warning("refresh_session: invalid refresh token")
+        elif token.is_revoked:
+            # an already rotated token came back: one of its two holders
+            # stole it, so end every session descended from that login
+            # committed on its own: get_session rolls back on the error below
+            await self.refresh_repo.revoke_family(token.family_id)
+            logger.warning(
+                "refresh_session: refresh token reuse, family revoked",
+                extra={"user_id": str(token.user_id), "family_id": str(token.family_id)},
+            )
+        else:
+            logger.warning("refresh_session: refresh token expired", extra={"user_id": str(token.user_id)})
+
+        raise TokenExpired("Invalid refresh token.")
+
     async def forgot_password(self, email: str) -> None:
         user = await self.user_repo.get_by_email(email)
 
@@ -130,8 +147,9 @@ class AuthService:
             expires_at=expires_at,
         )
 
-        await self.mailer.send_reset_email(user.email, token)
-        logger.info("password reset email sent", extra={"user_id": str(user.id)})
+        # sent by the mail dispatcher once this request commits
+        await self.mail_queue.send_reset_email(user.email, token)
+        logger.info("password reset email queued", extra={"user_id": str(user.id)})
 
 
     async def reset_password(self, token: str, new_password: str) -> None:
@@ -152,7 +170,7 @@ class AuthService:
             logger.warning("reset_password: user not found", extra={"user_id": str(reset.user_id)})
             raise TokenInvalid("Invalid reset token")
 
-        user.hashed_password = hash_password(new_password)
+        user.hashed_password = await password_hashing.hash(new_password)
         await self.user_repo.save_user(user)
 
         await self.reset_repo.invalidate(token)
@@ -163,11 +181,11 @@ class AuthService:
     async def change_password(
         self, current_user: User, old_password: str, new_password: str
     ) -> None:
-        if not verify_password(old_password, current_user.hashed_password):
+        if not await password_hashing.verify(old_password, current_user.hashed_password):
             logger.warning("change_password: invalid old password", extra={"user_id": str(current_user.id)})
             raise InvalidCredentials("Invalid password")
 
-        current_user.hashed_password = hash_password(new_password)
+        current_user.hashed_password = await password_hashing.hash(new_password)
         await self.user_repo.save_user(current_user)
 
         await self.refresh_repo.revoke_all_for_user(current_user.id)
@@ -0,0 +1,83 @@
+"""
+conditional GET (ETag / If-None-Match) for read endpoints.
+
+a route computes a cheap validator for what it would return (the row's
+updated_at, or a count and max(updated_at) / sum(version) over a list from
+one indexed query) and checks it before loading the rest and serializing:
+
+    @router.get("/things/{id}", response_model=ThingResponse)
+    async def get_thing(
+        id: uuid.UUID,
+        conditional: ConditionalGet = Depends(conditional_get("private, no-cache")),
+        ...
+    ):
+        thing = await service.get_thing(id)
+        if cached := conditional.check("thing", thing.id, thing.updated_at):
+            return cached
+        return thing
+
+`check` returns an empty 304 when the client's If-None-Match already names
+the tag, so the response_model serialization never runs. otherwise it puts
+the ETag and the route's Cache-Control on the 200. ETags are weak
+(`W/"..."`): they name the data, not the exact bytes of one encoding.
+"""
+
+import hashlib
+from collections.abc import Callable
+
+from fastapi import Request, Response, status
+
+
+def weak_etag(*parts: object) -> str:
+    digest = hashlib.blake2b(
+        "|".join(map(str, parts)).encode(), digest_size=12
+    ).hexdigest()
+    return f'W/"{digest}"'
+
+
+def _opaque(tag: str) -> str:
+    return tag.strip().removeprefix("W/")
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """If-None-Match uses the weak comparison: W/"x" and "x" are the same tag."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    current = _opaque(etag)
+    return any(_opaque(tag) == current for tag in header.split(","))
+
+
+def not_modified(etag: str, cache_control: str | None = None) -> Response:
+    headers = {"ETag": etag}
+    if cache_control:
+        headers["Cache-Control"] = cache_control
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+
+class ConditionalGet:
+    def __init__(self, request: Request, response: Response, cache_control: str | None):
+        self.request = request
+        self.response = response
+        self.cache_control = cache_control
+
+    def check(self, *parts: object) -> Response | None:
+        """The 304 to return as is, or None after tagging the 200 response."""
+        etag = weak_etag(self.request.url.path, *parts)
+        if etag_matches(self.request, etag):
+            return not_modified(etag, self.cache_control)
+        self.response.headers["ETag"] = etag
+        if self.cache_control:
+            self.response.headers["Cache-Control"] = self.cache_control
+        return None
+
+
+def conditional_get(cache_control: str | None = None) -> Callable[..., ConditionalGet]:
+    """Dependency factory: one Cache-Control policy per route."""
+
+    def dependency(request: Request, response: Response) -> ConditionalGet:
+        return ConditionalGet(request, response, cache_control)
+
+    return dependency
@@ -1,4 +1,5 @@
 from functools import lru_cache
+from typing import Literal
 
 from pydantic import model_validator
 from pydantic_settings import (
@@ -32,6 +33,17 @@ class Settings(BaseSettings):
     DB_POOL_RECYCLE: int = 3600
     DB_POOL_PRE_PING: bool = True
     DB_ECHO: bool = False
+    # size each worker's pool from a connection budget instead: every worker
+    # gets DB_CONNECTION_BUDGET // (GUNICORN_WORKERS * DB_POOL_MAX_TASKS)
+    # connections, less one for its invalidation listener, with DB_POOL_SIZE /
+    # DB_MAX_OVERFLOW as ceilings
+    DB_POOL_ADAPTIVE: bool = False
+    # connections the whole app may hold: Postgres max_connections minus
+    # headroom for migrations, admin sessions and standalone jobs
+    DB_CONNECTION_BUDGET: int = 100
+    # tasks (hosts) running the app at full scale-out, e.g. the ECS service's
+    # autoscaling max capacity
+    DB_POOL_MAX_TASKS: int = 1
 
     # Connection Timeouts
     DB_CONNECT_TIMEOUT: int = 10
@@ -40,11 +52,111 @@ class Settings(BaseSettings):
 
     # Security / Auth
     SECRET_KEY: str
+    # threads hashing/verifying passwords (Argon2) per worker; also the cap
+    # on concurrent hashes, callers beyond it queue
+    PASSWORD_HASH_WORKERS: int = 2
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    # build the request principal from verified JWT claims instead of loading
+    # the user row; role changes then apply on the next token refresh
+    AUTH_STATELESS: bool = False
+
+    # Rate limiting (token buckets: `burst` requests, refilled per minute)
+    RATE_LIMIT_ENABLED: bool = True
+    # "memory" counts per worker process; "postgres" shares the buckets
+    # across workers and hosts (UNLOGGED rate_limit_buckets table)
+    RATE_LIMIT_BACKEND: Literal["memory", "postgres"] = "memory"
+    # every /auth/* request, per client IP
+    AUTH_RATE_LIMIT_IP_BURST: int = 30
+    AUTH_RATE_LIMIT_IP_PER_MINUTE: float = 30
+    # login and forgot-password attempts, per email
+    AUTH_RATE_LIMIT_EMAIL_BURST: int = 5
+    AUTH_RATE_LIMIT_EMAIL_PER_MINUTE: float = 1
+
+    # RBAC
+    # seconds a user's resolved permission set is cached per worker (0 disables)
+    RBAC_CACHE_TTL_SECONDS: int = 60
+
+    # Inventory reservations
+    # stock row locks: "wait" blocks, "nowait" fails fast, "skip_locked" skips
+    # busy rows; the last two are retried like deadlocks
+    RESERVATION_LOCK_MODE: Literal["wait", "nowait", "skip_locked"] = "wait"
+    RESERVATION_MAX_ATTEMPTS: int = 4
+    RESERVATION_RETRY_BASE_MS: int = 20
+    RESERVATION_RETRY_MAX_MS: int = 500
+    # a confirmed order's holds are released (order -> EXPIRED) once they are
+    # this old without being completed or cancelled
+    RESERVATION_TTL_MINUTES: int = 1440
+    # the sweeper releasing them runs in every worker; SKIP LOCKED keeps
+    # concurrent sweeps apart
+    RESERVATION_SWEEPER_ENABLED: bool = True
+    RESERVATION_SWEEP_INTERVAL_SECONDS: int = 60
+    RESERVATION_SWEEP_BATCH_SIZE: int = 200
+
+    # lines applied per transaction by the bulk stock import
+    STOCK_IMPORT_CHUNK_SIZE: int = 500
+
+    # rows fetched per round trip by streamed list responses
+    STREAM_BATCH_SIZE: int = 500
+
+    # Low-stock alerts
+    # digest recipients; the background sender only runs when this is set
+    LOW_STOCK_ALERT_RECIPIENTS: list[str] = []
+    LOW_STOCK_ALERT_INTERVAL_SECONDS: int = 60
+    # outbox events claimed per digest run
+    LOW_STOCK_ALERT_BATCH_SIZE: int = 500
+
+    # Mail dispatch (outbox -> SES)
+    # run the dispatcher in every app worker; turn off when it runs as its
+    # own process (python -m app.mail.dispatcher)
+    MAIL_DISPATCHER_ENABLED: bool = True
+    MAIL_DISPATCH_INTERVAL_SECONDS: float = 1.0
+    MAIL_DISPATCH_BATCH_SIZE: int = 50
+    # a leased batch is not claimed again for this long; must cover sending
+    # it, or a slow batch is sent twice
+    MAIL_DISPATCH_LEASE_SECONDS: int = 300
+    # SES calls in flight per dispatcher
+    MAIL_DISPATCH_CONCURRENCY: int = 4
+    # sends per second of all dispatchers together (a shared bucket in
+    # Postgres); keep it under the SES account's maximum send rate
+    # (0 disables pacing)
+    MAIL_SEND_RATE: float = 10.0
+    MAIL_MAX_ATTEMPTS: int = 8
+    MAIL_RETRY_BASE_SECONDS: int = 5
+    MAIL_RETRY_MAX_SECONDS: int = 900
+    # transport: "ses", or "file" (JSON files in MAIL_FILE_DIR) / "memory"
+    # for local runs and tests
+    MAIL_BACKEND: Literal["ses", "file", "memory"] = "ses"
+    MAIL_FILE_DIR: str = "var/mail"
+    # threads (and pooled SES connections) for blocking SES calls
+    MAIL_EXECUTOR_WORKERS: int = 4
+
+    # Maintenance (deletes expired/revoked tokens and idle rate limit buckets)
+    # run the cleanup job in every app worker; or run
+    # python -m app.maintenance.cleanup from a scheduled task instead
+    MAINTENANCE_ENABLED: bool = False
+    MAINTENANCE_INTERVAL_SECONDS: int = 3600
+    # rows deleted per transaction, and batches per table per run
+    MAINTENANCE_BATCH_SIZE: int = 1000
+    MAINTENANCE_MAX_BATCHES: int = 100
+
+    # Caches
+    # listen for cross-worker invalidation events (Postgres LISTEN/NOTIFY)
+    CACHE_INVALIDATION_ENABLED: bool = True
+
+    # Metrics
+    # Prometheus GET /metrics and the request middleware feeding it; with
+    # several workers set PROMETHEUS_MULTIPROC_DIR (see docker/entrypoint.sh)
+    METRICS_ENABLED: bool = True
 
     # Server
+    # proxies whose X-Forwarded-For / X-Forwarded-Proto are trusted
+    # (addresses or CIDR networks, comma-separated). The default trusts the
+    # private ranges a VPC load balancer connects from; the client address is
+    # then the rightmost forwarded hop that is not itself trusted. Without
+    # it every request shares the balancer's per-IP rate-limit bucket.
+    FORWARDED_ALLOW_IPS: str = "127.0.0.1,10.0.0.0/8,172.16.0.0/12,192.168.0.0/16"
     UVICORN_WORKERS: int = 1
     GUNICORN_WORKERS: int = 4
 
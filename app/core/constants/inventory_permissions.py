@@ -14,6 +14,7 @@ INVENTORY_PERMISSIONS = [
     "stock:in",
     "stock:out",
     "stock:adjust",
+    "stock:import",  # bulk in/out/adjust upload
     "stock:view",
     # location
     "location:list",
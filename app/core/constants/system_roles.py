@@ -17,6 +17,7 @@ SYSTEM_ROLES = {
         "stock:in",
         "stock:out",
         "stock:adjust",
+        "stock:import",
         "stock:view",
         "location:list",
         "location:view",
@@ -1,8 +1,32 @@
+"""
+Argon2 password hashing.
+
+Argon2 is deliberately slow (tens of ms per call with the default
+parameters), so async code never calls it inline: `password_hashing` runs it
+on a dedicated pool of PASSWORD_HASH_WORKERS threads (argon2-cffi releases
+the GIL while hashing). The pool size caps concurrent hashes per worker;
+callers beyond it queue, and `stats()` reports that queue depth.
+
+The plain `hash_password` / `verify_password` stay for scripts and tests.
+"""
+
+import asyncio
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import TypeVar
+
 from argon2 import PasswordHasher
 from argon2.exceptions import InvalidHashError, VerificationError
 
+from app.core.config import settings
+from app.observability.metrics import PASSWORD_HASH_DURATION, PASSWORD_HASH_WAIT
+
 ph = PasswordHasher()
 
+T = TypeVar("T")
+
 
 def hash_password(password: str) -> str:
     return ph.hash(password)
@@ -13,3 +37,87 @@ def verify_password(password: str, hashed_password: str) -> bool:
         return ph.verify(hashed_password, password)
     except (VerificationError, InvalidHashError):
         return False
+
+
+def verify_and_rehash(password: str, hashed_password: str) -> tuple[bool, str | None]:
+    """
+    Verify, and when the hash was made with other parameters than `ph`'s
+    current ones, also return a fresh hash to store (else None).
+    """
+    if not verify_password(password, hashed_password):
+        return False, None
+    if ph.check_needs_rehash(hashed_password):
+        return True, ph.hash(password)
+    return True, None
+
+
+class PasswordHashingService:
+    def __init__(self, max_workers: int | None = None):
+        self.max_workers = max(1, max_workers or settings.PASSWORD_HASH_WORKERS)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="argon2"
+        )
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._peak_queued = 0
+        self._started = 0
+        self._completed = 0
+        self._wait_seconds = 0.0
+
+    async def hash(self, password: str) -> str:
+        return await self._run(hash_password, password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await self._run(verify_password, password, hashed_password)
+
+    async def verify_and_rehash(
+        self, password: str, hashed_password: str
+    ) -> tuple[bool, str | None]:
+        return await self._run(verify_and_rehash, password, hashed_password)
+
+    async def _run(self, fn: Callable[..., T], *args) -> T:
+        queued_at = time.monotonic()
+        with self._lock:
+            self._queued += 1
+            self._peak_queued = max(self._peak_queued, self._queued)
+
+        def job() -> T:
+            started = time.monotonic()
+            waited = started - queued_at
+            with self._lock:
+                self._queued -= 1
+                self._running += 1
+                self._started += 1
+                self._wait_seconds += waited
+            PASSWORD_HASH_WAIT.observe(waited)
+            try:
+                return fn(*args)
+            finally:
+                PASSWORD_HASH_DURATION.labels(fn.__name__).observe(
+                    time.monotonic() - started
+                )
+                with self._lock:
+                    self._running -= 1
+                    self._completed += 1
+
+        return await asyncio.get_running_loop().run_in_executor(self._executor, job)
+
+    def stats(self) -> dict[str, float | int]:
+        with self._lock:
+            return {
+                "workers": self.max_workers,
+                "running": self._running,
+                "queued": self._queued,
+                "peak_queued": self._peak_queued,
+                "completed": self._completed,
+                "avg_wait_ms": round(
+                    1000 * self._wait_seconds / self._started, 3
+                ) if self._started else 0.0,
+            }
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+password_hashing = PasswordHashingService()
@@ -0,0 +1,66 @@
+"""
+streamed JSON / NDJSON bodies for large list endpoints.
+
+a list endpoint streams when the client asks for it:
+- `Accept: application/x-ndjson` -> one JSON object per line
+- `?stream=true`                 -> a plain JSON array of the items
+
+streamed bodies carry the bare items (no `total` / `next_cursor` envelope:
+neither is known before the last row). rows are encoded one partition at a
+time, so the first byte leaves before the query has finished and the worker
+holds one batch in memory. a failure mid-stream aborts the connection, so a
+JSON array arrives truncated (invalid) rather than silently short.
+"""
+
+from collections.abc import AsyncIterator, Sequence
+from typing import Any
+
+from fastapi import Query, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+NDJSON = "application/x-ndjson"
+JSON = "application/json"
+
+
+def stream_format(
+    request: Request,
+    stream: bool = Query(False, description="stream the items as a JSON array"),
+) -> str | None:
+    """Dependency: the media type to stream the list as, or None to respond normally."""
+    if NDJSON in request.headers.get("accept", ""):
+        return NDJSON
+    return JSON if stream else None
+
+
+def streaming_response(
+    partitions: AsyncIterator[Sequence[Any]],
+    schema: type[BaseModel],
+    media_type: str,
+) -> StreamingResponse:
+    body = _ndjson(partitions, schema) if media_type == NDJSON else _json_array(partitions, schema)
+    return StreamingResponse(body, media_type=media_type)
+
+
+def _encode(partition: Sequence[Any], schema: type[BaseModel]) -> list[bytes]:
+    return [schema.model_validate(row).model_dump_json().encode() for row in partition]
+
+
+async def _ndjson(
+    partitions: AsyncIterator[Sequence[Any]], schema: type[BaseModel]
+) -> AsyncIterator[bytes]:
+    async for partition in partitions:
+        if partition:
+            yield b"\n".join(_encode(partition, schema)) + b"\n"
+
+
+async def _json_array(
+    partitions: AsyncIterator[Sequence[Any]], schema: type[BaseModel]
+) -> AsyncIterator[bytes]:
+    yield b"["
+    separator = b""
+    async for partition in partitions:
+        if partition:
+            yield separator + b",".join(_encode(partition, schema))
+            separator = b","
+    yield b"]"
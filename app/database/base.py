@@ -1,6 +1,14 @@
 from sqlalchemy.orm import declarative_base
 
-Base = declarative_base()
+
+class _EagerDefaults:
+    # fetch server-generated values (created_at, updated_at, ...) with
+    # RETURNING on the INSERT/UPDATE itself, so repositories can flush and
+    # hand the object back without a refresh() SELECT
+    __mapper_args__ = {"eager_defaults": True}
+
+
+Base = declarative_base(cls=_EagerDefaults)
 
 # Import all model modules so their tables register on Base.metadata.
 # Required for Alembic autogenerate to detect the full schema.
@@ -16,7 +24,10 @@ from app.inventory.models import location as _inv_location  # noqa: E402,F401
 from app.inventory.models import product as _inv_product  # noqa: E402,F401
 from app.inventory.models import reservation as _inv_reservation  # noqa: E402,F401
 from app.inventory.models import stock as _inv_stock  # noqa: E402,F401
+from app.inventory.models import stock_summary as _inv_stock_summary  # noqa: E402,F401
 from app.orders.models import order as _orders_order  # noqa: E402,F401
+from app.outbox import model as _outbox_model  # noqa: E402,F401
+from app.ratelimit import model as _ratelimit_model  # noqa: E402,F401
 
 """ Alembic commands
 
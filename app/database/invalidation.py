@@ -0,0 +1,136 @@
+"""
+cross-worker cache invalidation over Postgres LISTEN/NOTIFY.
+
+writers call `publish_invalidation()` inside their request transaction, so
+the event is delivered by Postgres only if (and when) that transaction
+commits. every worker runs one `InvalidationBus` (started in the app
+lifespan) holding a dedicated asyncpg connection that LISTENs on the channel
+and hands each event to the handlers subscribed to its topic.
+
+payload: {"topic": str, "key": str | null}
+- key=None means "drop everything for this topic"
+
+every event is dispatched: handlers only drop cache entries, so applying one
+twice is harmless, while Postgres delivers notifications in commit order,
+not publish order, so no counter could tell a duplicate from a late event.
+Postgres already folds identical notifications within one transaction.
+"""
+
+import asyncio
+import json
+import logging
+from collections import defaultdict
+from collections.abc import Callable
+
+import asyncpg
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "cache_invalidation"
+
+# topics
+RBAC_USER = "rbac.user"  # key: user_id, the user's role links changed
+RBAC_ROLE = "rbac.role"  # key: role_id, a role or its permissions changed
+INVENTORY_PRODUCT = "inventory.product"  # key: product_id
+
+Handler = Callable[[str | None], None]
+
+
+async def publish_invalidation(
+    session: AsyncSession, topic: str, key: object | None = None
+) -> None:
+    """Queue an invalidation event; Postgres delivers it on commit."""
+    payload = json.dumps({"topic": topic, "key": None if key is None else str(key)})
+    await session.execute(select(func.pg_notify(CHANNEL, payload)))
+
+
+def _asyncpg_dsn(url: str) -> str:
+    # SQLAlchemy URL -> plain libpq DSN for asyncpg
+    return url.replace("postgresql+asyncpg://", "postgresql://", 1)
+
+
+class InvalidationBus:
+    def __init__(self, dsn: str, reconnect_delay: float = 1.0, max_delay: float = 30.0):
+        self.dsn = dsn
+        self.reconnect_delay = reconnect_delay
+        self.max_delay = max_delay
+        self._handlers: dict[str, list[Handler]] = defaultdict(list)
+        self._task: asyncio.Task | None = None
+        self._closed: asyncio.Event | None = None
+
+    def subscribe(self, topic: str, handler: Handler) -> None:
+        self._handlers[topic].append(handler)
+
+    def dispatch(self, topic: str, key: str | None) -> None:
+        for handler in self._handlers.get(topic, []):
+            try:
+                handler(key)
+            except Exception:
+                logger.exception("invalidation handler failed", extra={"topic": topic})
+
+    def _drop_everything(self) -> None:
+        # events may have been missed while disconnected
+        for topic in list(self._handlers):
+            self.dispatch(topic, None)
+
+    def _on_notification(self, connection, pid: int, channel: str, payload: str) -> None:
+        try:
+            event = json.loads(payload)
+            topic = event["topic"]
+        except (ValueError, KeyError, TypeError):
+            logger.warning("invalidation: malformed payload", extra={"payload": payload})
+            return
+
+        self.dispatch(topic, event.get("key"))
+
+    def _on_termination(self, connection) -> None:
+        if self._closed is not None:
+            self._closed.set()
+
+    async def _listen_forever(self) -> None:
+        delay = self.reconnect_delay
+        first = True
+        while True:
+            try:
+                connection = await asyncpg.connect(self.dsn, ssl="require")
+            except Exception:
+                logger.warning("invalidation: listener connect failed", extra={"retry_in": delay})
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.max_delay)
+                continue
+
+            self._closed = asyncio.Event()
+            connection.add_termination_listener(self._on_termination)
+            try:
+                await connection.add_listener(CHANNEL, self._on_notification)
+                if not first:
+                    self._drop_everything()
+                first = False
+                delay = self.reconnect_delay
+                logger.info("invalidation: listening", extra={"channel": CHANNEL})
+                await self._closed.wait()
+                logger.warning("invalidation: listener connection lost")
+            finally:
+                if not connection.is_closed():
+                    await connection.close()
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._listen_forever())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+
+invalidation_bus = InvalidationBus(_asyncpg_dsn(settings.DATABASE_URL))
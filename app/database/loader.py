@@ -0,0 +1,146 @@
+"""
+request-scoped primary-key loader.
+
+one Loader per AsyncSession, kept in `session.info`, so every dependency and
+repository sharing the request's session (see RequestContext)
+shares its lookups too:
+
+- a row already in the session's identity map, with the relationships the
+  caller asked for loaded, is returned without a query
+- identical lookups in flight are awaited once
+- lookups for one model issued in the same event-loop tick (asyncio.gather,
+  load_many) go out as a single `WHERE id IN (...)`
+
+only plain reads go through it: locking reads (FOR UPDATE) and reads that
+must see another transaction's writes keep their own queries.
+"""
+
+import asyncio
+from collections.abc import Iterable
+from typing import Any, TypeVar
+
+from sqlalchemy import inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.util import identity_key
+
+T = TypeVar("T")
+
+_INFO_KEY = "loader"
+
+
+def _eager_option(model: type, path: str):
+    """"items.reservation" -> selectinload(Order.items).selectinload(OrderItem.reservation)"""
+    option = None
+    cls = model
+    for name in path.split("."):
+        attr = getattr(cls, name)
+        option = selectinload(attr) if option is None else option.selectinload(attr)
+        cls = attr.property.mapper.class_
+    return option
+
+
+def _loaded(obj: Any, path: str) -> bool:
+    """True when reading `path` off obj needs no IO (lazy loads fail under asyncio)."""
+    name, _, rest = path.partition(".")
+    state = inspect(obj)
+    if name in state.unloaded:
+        return False
+    if not rest:
+        return True
+    value = state.dict[name]
+    targets = value if isinstance(value, (list, set)) else [value]
+    return all(_loaded(target, rest) for target in targets if target is not None)
+
+
+class Loader:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self._pending: dict[tuple[type, tuple[str, ...]], list[Any]] = {}
+        self._inflight: dict[tuple[type, tuple[str, ...], Any], asyncio.Future] = {}
+        # an AsyncSession runs one statement at a time
+        self._lock = asyncio.Lock()
+        self.queries = 0
+
+    @classmethod
+    def of(cls, session: AsyncSession) -> "Loader":
+        loader = session.info.get(_INFO_KEY)
+        if loader is None:
+            loader = session.info[_INFO_KEY] = cls(session)
+        return loader
+
+    def _cached(self, model: type[T], key: Any, eager: tuple[str, ...]) -> T | None:
+        obj = self.session.sync_session.identity_map.get(identity_key(model, key))
+        if obj is None:
+            return None
+        state = inspect(obj)
+        if state.was_deleted or state.expired_attributes:
+            return None
+        if not all(_loaded(obj, path) for path in eager):
+            return None
+        return obj
+
+    async def load(self, model: type[T], key: Any, eager: tuple[str, ...] = ()) -> T | None:
+        """
+        The row with this primary key, or None. `eager`: relationship paths
+        ("roles", "items.reservation") the caller will read.
+        """
+        cached = self._cached(model, key, eager)
+        if cached is not None:
+            return cached
+
+        token = (model, eager, key)
+        future = self._inflight.get(token)
+        if future is None:
+            future = self._inflight[token] = asyncio.get_running_loop().create_future()
+            pending = self._pending.setdefault((model, eager), [])
+            pending.append(key)
+            if len(pending) == 1:
+                # first key of a batch: this caller sends it
+                await self._dispatch(model, eager)
+        return await future
+
+    async def load_many(
+        self, model: type[T], keys: Iterable[Any], eager: tuple[str, ...] = ()
+    ) -> dict[Any, T]:
+        """The found rows by key, in one query for every key not already loaded."""
+        keys = list(dict.fromkeys(keys))
+        rows = await asyncio.gather(*(self.load(model, key, eager) for key in keys))
+        return {key: row for key, row in zip(keys, rows) if row is not None}
+
+    async def _dispatch(self, model: type, eager: tuple[str, ...]) -> None:
+        """
+        Send the batch once lookups issued in this tick have joined it. Every
+        future in it ends resolved or, when the sending caller is cancelled,
+        cancelled: its other waiters never hang, and the batch is closed so
+        later lookups open a new one.
+        """
+        batch = (model, eager)
+        try:
+            await asyncio.sleep(0)
+        except BaseException:
+            for key in self._pending.pop(batch):
+                self._inflight.pop((model, eager, key)).cancel()
+            raise
+
+        keys = self._pending.pop(batch)
+        futures = [self._inflight.pop((model, eager, key)) for key in keys]
+        pk = inspect(model).primary_key[0]
+        stmt = select(model).where(pk.in_(keys))
+        for path in eager:
+            stmt = stmt.options(_eager_option(model, path))
+        try:
+            async with self._lock:
+                self.queries += 1
+                result = await self.session.execute(stmt)
+                found = {getattr(row, pk.key): row for row in result.scalars()}
+        except Exception as exc:
+            for future in futures:
+                future.set_exception(exc)
+            return
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+        for key, future in zip(keys, futures):
+            future.set_result(found.get(key))
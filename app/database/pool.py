@@ -0,0 +1,204 @@
+"""
+connection pool telemetry and budget-based sizing.
+
+`InstrumentedPool` is the engine's pool class. SQLAlchemy pool events feed
+`PoolMetrics` (one per engine, in this worker):
+
+- checkout: time from asking the pool to holding a usable connection,
+  split into the queue wait (a free connection, or room to open a new one)
+  and the pre-ping that follows it
+- checkin / checkout: connections in use; `overflow` and `idle` are read
+  off the pool when reported
+- connect / invalidate / soft_invalidate: new physical connections and the
+  ones thrown away (failed pre-ping, disconnect errors, recycle)
+- checkout timeouts (DB_POOL_TIMEOUT exceeded)
+
+there is no "checkout started" event, so the pool class stamps the queue
+wait on the connection record and the checkout event picks it up.
+
+events fire on the event loop thread (asyncpg runs the pool in greenlets),
+so the counters need no lock.
+"""
+
+import logging
+import time
+from bisect import bisect_left
+from dataclasses import dataclass
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+logger = logging.getLogger(__name__)
+
+# upper bounds in milliseconds; the last bucket is +Inf
+LATENCY_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+_WAIT_KEY = "checkout_wait"
+_GOT_AT_KEY = "checkout_got_at"
+
+
+class LatencyHistogram:
+    def __init__(self, buckets_ms: tuple[float, ...] = LATENCY_BUCKETS_MS):
+        self.buckets_ms = buckets_ms
+        self._counts = [0] * (len(buckets_ms) + 1)
+        self.count = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, seconds: float) -> None:
+        ms = seconds * 1000
+        self._counts[bisect_left(self.buckets_ms, ms)] += 1
+        self.count += 1
+        self.sum_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def snapshot(self) -> dict:
+        # cumulative, like Prometheus `le` buckets
+        buckets, running = {}, 0
+        for bound, count in zip((*self.buckets_ms, "+Inf"), self._counts):
+            running += count
+            buckets[str(bound)] = running
+        return {
+            "count": self.count,
+            "avg_ms": round(self.sum_ms / self.count, 3) if self.count else 0.0,
+            "max_ms": round(self.max_ms, 3),
+            "buckets_ms": buckets,
+        }
+
+
+class PoolMetrics:
+    def __init__(self):
+        self.checkout = LatencyHistogram()
+        self.wait = LatencyHistogram()
+        self.pre_ping = LatencyHistogram()
+        self.checked_out = 0
+        self.peak_checked_out = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.soft_invalidations = 0
+        self.timeouts = 0
+
+    def on_checkout(self, dbapi_connection, record, proxy) -> None:
+        got_at = record.record_info.pop(_GOT_AT_KEY, None)
+        wait = record.record_info.pop(_WAIT_KEY, 0.0)
+        pre_ping = time.perf_counter() - got_at if got_at is not None else 0.0
+        self.wait.observe(wait)
+        self.pre_ping.observe(pre_ping)
+        self.checkout.observe(wait + pre_ping)
+        self.checked_out += 1
+        self.peak_checked_out = max(self.peak_checked_out, self.checked_out)
+
+    def on_checkin(self, dbapi_connection, record) -> None:
+        # a connection invalidated while checked out is checked in as well
+        self.checked_out = max(0, self.checked_out - 1)
+
+    def on_connect(self, dbapi_connection, record) -> None:
+        self.connects += 1
+
+    def on_invalidate(self, dbapi_connection, record, exception) -> None:
+        self.invalidations += 1
+
+    def on_soft_invalidate(self, dbapi_connection, record, exception) -> None:
+        self.soft_invalidations += 1
+
+    def snapshot(self, pool: "InstrumentedPool") -> dict:
+        return {
+            "pool_size": pool.size(),
+            "max_overflow": pool._max_overflow,
+            "checked_out": self.checked_out,
+            "peak_checked_out": self.peak_checked_out,
+            # QueuePool counts overflow from -pool_size; only the part above
+            # pool_size is extra connections
+            "overflow": max(0, pool.overflow()),
+            "idle": pool.checkedin(),
+            "connects": self.connects,
+            "invalidations": self.invalidations,
+            "soft_invalidations": self.soft_invalidations,
+            "timeouts": self.timeouts,
+            "checkout": self.checkout.snapshot(),
+            "wait": self.wait.snapshot(),
+            "pre_ping": self.pre_ping.snapshot(),
+        }
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that times the queue wait and counts timeouts."""
+
+    metrics: PoolMetrics
+
+    def _do_get(self):
+        # QueuePool._do_get may call itself after a lost race; the outermost
+        # call writes last, so the record carries the whole wait
+        started = time.perf_counter()
+        record = super()._do_get()
+        now = time.perf_counter()
+        record.record_info[_WAIT_KEY] = now - started
+        record.record_info[_GOT_AT_KEY] = now
+        return record
+
+    def connect(self):
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            self.metrics.timeouts += 1
+            raise
+
+    def recreate(self) -> "InstrumentedPool":
+        # engine.dispose() swaps in a new pool; keep counting into the same
+        # metrics (the event listeners travel with the dispatch)
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+def instrument_pool(pool: InstrumentedPool) -> PoolMetrics:
+    metrics = pool.metrics = PoolMetrics()
+    event.listen(pool, "checkout", metrics.on_checkout)
+    event.listen(pool, "checkin", metrics.on_checkin)
+    event.listen(pool, "connect", metrics.on_connect)
+    event.listen(pool, "invalidate", metrics.on_invalidate)
+    event.listen(pool, "soft_invalidate", metrics.on_soft_invalidate)
+    return metrics
+
+
+@dataclass(frozen=True)
+class PoolSizing:
+    pool_size: int
+    max_overflow: int
+    # connections one worker may hold; None when not budgeted
+    worker_limit: int | None = None
+
+
+def budget_pool_sizing(
+    *,
+    budget: int,
+    workers: int,
+    tasks: int,
+    pool_size: int,
+    max_overflow: int,
+    reserved_per_worker: int = 0,
+) -> PoolSizing:
+    """
+    Share `budget` connections between `workers` processes on each of
+    `tasks` hosts. Each worker's share is budget // (workers * tasks), less
+    `reserved_per_worker` connections it opens outside the pool (the
+    invalidation listener); the pool may use the rest, but at least one.
+    The configured pool_size and max_overflow are kept as ceilings; the
+    retained pool takes its share first and overflow gets what is left.
+    """
+    processes = max(1, workers * tasks)
+    worker_limit = budget // processes - reserved_per_worker
+    if worker_limit < 1:
+        worker_limit = 1
+        logger.warning(
+            "connection budget too small: every worker still opens one pooled connection",
+            extra={
+                "budget": budget,
+                "workers": workers,
+                "tasks": tasks,
+                "connections": processes * (1 + reserved_per_worker),
+            },
+        )
+    size = min(pool_size, worker_limit)
+    overflow = min(max_overflow, worker_limit - size)
+    return PoolSizing(pool_size=size, max_overflow=overflow, worker_limit=worker_limit)
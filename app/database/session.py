@@ -1,23 +1,58 @@
+from __future__ import annotations
+
+from collections.abc import Callable
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, AsyncGenerator
 
-from sqlalchemy import text
+from fastapi import Depends
+from sqlalchemy import event, text
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
+from sqlalchemy.orm import Session, SessionTransaction
 
 from app.core.config import settings
+from app.database.pool import (
+    InstrumentedPool,
+    PoolSizing,
+    budget_pool_sizing,
+    instrument_pool,
+)
+
+if TYPE_CHECKING:
+    from app.auth.principal import Principal
+    from app.inventory.models.location import Location
+
+# pool sizes: fixed per worker, or derived from the connection budget shared
+# by every worker of every task
+if settings.DB_POOL_ADAPTIVE:
+    pool_sizing = budget_pool_sizing(
+        budget=settings.DB_CONNECTION_BUDGET,
+        workers=settings.GUNICORN_WORKERS,
+        tasks=settings.DB_POOL_MAX_TASKS,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        # the InvalidationBus listener holds its own connection per worker
+        reserved_per_worker=1 if settings.CACHE_INVALIDATION_ENABLED else 0,
+    )
+else:
+    pool_sizing = PoolSizing(
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+    )
 
 # engine with connection pooling
 engine: AsyncEngine = create_async_engine(
     settings.DATABASE_URL,
     echo=settings.DB_ECHO,
     future=True,
-    pool_size=settings.DB_POOL_SIZE,
-    max_overflow=settings.DB_MAX_OVERFLOW,
+    poolclass=InstrumentedPool,
+    pool_size=pool_sizing.pool_size,
+    max_overflow=pool_sizing.max_overflow,
     pool_timeout=settings.DB_POOL_TIMEOUT,
     pool_recycle=settings.DB_POOL_RECYCLE,
     pool_pre_ping=settings.DB_POOL_PRE_PING,
@@ -34,6 +69,9 @@ engine: AsyncEngine = create_async_engine(
     },
 )
 
+# checkout latency, in-use, overflow, invalidations (GET /health/pool)
+pool_metrics = instrument_pool(engine.sync_engine.pool)
+
 # session factory
 AsyncSessionLocal = async_sessionmaker(
     bind=engine,
@@ -43,16 +81,105 @@ AsyncSessionLocal = async_sessionmaker(
 
 
 # dependency fastAPI (transactions)
-async def get_session() -> AsyncGenerator[AsyncSession, None]:
+
+
+@dataclass
+class RequestContext:
+    """
+    what a request resolves once and shares: its one session (so at most one
+    pool checkout at a time), plus the caller, their permission codes and the
+    branch location, filled in by get_current_principal, require_permission
+    and get_current_location the first time each runs.
+    """
+
+    session: AsyncSession
+    principal: Principal | None = None
+    permissions: frozenset[str] | None = None
+    location: Location | None = None
+    # set by get_read_session: a streamed body still reads from the session
+    # after the endpoint returns, so the commit waits for the response
+    commit_after_response: bool = False
+
+
+async def get_request_context() -> AsyncGenerator[RequestContext, None]:
+    """
+    Opens the request's session and closes it once the response has been
+    sent. Depend on it with scope="request"; it is cached per request, so
+    every dependency below shares the one context.
+    """
     async with AsyncSessionLocal() as session:
+        context = RequestContext(session=session)
         try:
-            yield session
-            await session.commit()  # ← auto-commit on success
+            yield context
+            if context.commit_after_response:
+                await session.commit()
         except Exception:
-            await session.rollback()  # ← auto-rollback on error
+            await session.rollback()
             raise
-        finally:
-            await session.close()
+
+
+async def get_session(
+    context: RequestContext = Depends(get_request_context, scope="request"),
+) -> AsyncGenerator[AsyncSession, None]:
+    """
+    The request's unit of work: repositories only flush, and this commits
+    once at the end (or rolls back on error).
+
+    Depend on it with scope="function" so the commit runs as soon as the
+    endpoint returns, *before* the response is sent; a client never sees a
+    success whose writes are not durable. The scope is part of FastAPI's
+    dependency cache key, so every dependency must use the same one.
+    """
+    session = context.session
+    try:
+        yield session
+    except Exception:
+        await session.rollback()  # ← auto-rollback on error
+        raise
+    if not context.commit_after_response:
+        await session.commit()  # ← auto-commit on success
+
+
+def get_read_session(
+    context: RequestContext = Depends(get_request_context, scope="request"),
+) -> AsyncSession:
+    """
+    For read-only list endpoints that may stream: the same session, but its
+    commit moves after the response so an open server-side cursor survives
+    the endpoint returning. Never combine with writes in one route.
+    """
+    context.commit_after_response = True
+    return context.session
+
+
+# after-commit callbacks
+
+_AFTER_COMMIT_KEY = "after_commit"
+
+
+def after_commit(session: AsyncSession, callback: Callable[[], None]) -> None:
+    """
+    Run `callback` once the session's current transaction commits, e.g. to
+    drop an in-process cache entry only when the change is visible to other
+    requests. Discarded if the transaction rolls back instead.
+    """
+    session.info.setdefault(_AFTER_COMMIT_KEY, []).append(callback)
+
+
+@event.listens_for(Session, "after_commit")
+def _run_after_commit(session: Session) -> None:
+    if session.in_nested_transaction():
+        return  # a savepoint was released; wait for the real commit
+    for callback in session.info.pop(_AFTER_COMMIT_KEY, ()):
+        callback()
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _discard_after_commit(session: Session, transaction: SessionTransaction) -> None:
+    # the outermost transaction ended without a commit (after_commit has
+    # already taken the callbacks otherwise); savepoints don't count
+    if transaction.parent is None:
+        session.info.pop(_AFTER_COMMIT_KEY, None)
 
 
 # lifecycle management
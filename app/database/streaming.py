@@ -0,0 +1,43 @@
+"""
+server-side cursor reads for streamed list responses.
+
+`open_stream()` runs the query (so a failing query still surfaces as a
+normal error response) and hands back its rows in partitions of
+STREAM_BATCH_SIZE, fetched from a server-side cursor (`yield_per`). Each
+partition is expunged from the session once the consumer moves on, so the
+identity map holds one batch at a time instead of the whole result.
+
+the session must stay open, and its transaction uncommitted, until the last
+partition is read: take it with `Depends(get_read_session)`, which moves the
+request's commit after the response.
+"""
+
+from collections.abc import AsyncIterator, Sequence
+from typing import Any
+
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncScalarResult, AsyncSession
+
+from app.core.config import settings
+
+
+async def open_stream(
+    session: AsyncSession, stmt: Select, batch_size: int | None = None
+) -> AsyncIterator[Sequence[Any]]:
+    result = await session.stream_scalars(
+        stmt.execution_options(yield_per=batch_size or settings.STREAM_BATCH_SIZE)
+    )
+    return _partitions(session, result)
+
+
+async def _partitions(
+    session: AsyncSession, result: AsyncScalarResult
+) -> AsyncIterator[Sequence[Any]]:
+    try:
+        async for partition in result.partitions():
+            yield partition
+            for obj in partition:
+                if obj in session:
+                    session.expunge(obj)
+    finally:
+        await result.close()
@@ -0,0 +1,169 @@
+"""
+low-stock alerts.
+
+detection (request path): whenever available stock (quantity - reserved)
+drops from above a row's reorder_point to at or below it, LowStockDetector
+writes an outbox event in the same transaction as the stock change. a
+rolled-back change leaves no event, and nothing on the request path talks
+to SES.
+
+- remove_stock / adjust_stock and the bulk import lower `quantity`
+- reservations raise `reserved_quantity`
+- fulfilment lowers both by the same amount, so availability is unchanged:
+  the alert for reserved units already fired when they were reserved
+
+digests (background): every worker runs one LowStockAlertWorker (started in
+the app lifespan when LOW_STOCK_ALERT_RECIPIENTS is set). each tick it claims
+a batch of pending events (SKIP LOCKED, so workers never share one), collapses
+them to one line per stock row, drops rows replenished since, and queues one
+digest per location on the mail outbox, in the same transaction that consumes
+the events. sending (rate limits, retries) is MailDispatcher's job.
+"""
+
+import asyncio
+import logging
+import uuid
+from collections import defaultdict
+from collections.abc import Callable, Iterable
+from contextlib import AbstractAsyncContextManager
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.database.session import get_script_session
+from app.inventory.models.stock import InventoryStock
+from app.inventory.repositories.stock_repo import StockRepository
+from app.mail.queue import MailQueue
+from app.outbox.repository import OutboxRepository
+
+logger = logging.getLogger(__name__)
+
+LOW_STOCK = "inventory.low_stock"  # key: stock_id
+
+
+def crossed_reorder_point(stock: InventoryStock, available_before: int) -> bool:
+    available = stock.quantity - stock.reserved_quantity
+    return available_before > stock.reorder_point >= available
+
+
+class LowStockDetector:
+    def __init__(self, outbox_repo: OutboxRepository):
+        self.outbox_repo = outbox_repo
+
+    async def check(self, stock: InventoryStock, available_before: int) -> bool:
+        return bool(await self.check_many([(stock, available_before)]))
+
+    async def check_many(
+        self, changes: Iterable[tuple[InventoryStock, int]]
+    ) -> list[InventoryStock]:
+        """
+        `changes`: (stock after the change, its available quantity before).
+        Enqueues one event per row that crossed, in a single INSERT.
+        """
+        crossed = [
+            stock for stock, available_before in changes
+            if crossed_reorder_point(stock, available_before)
+        ]
+        if crossed:
+            await self.outbox_repo.enqueue_many(
+                LOW_STOCK, [(str(stock.id), _event_payload(stock)) for stock in crossed]
+            )
+            logger.info(
+                "low stock detected",
+                extra={"stock_ids": [str(stock.id) for stock in crossed]},
+            )
+        return crossed
+
+
+def _event_payload(stock: InventoryStock) -> dict:
+    return {
+        "stock_id": str(stock.id),
+        "product_id": str(stock.product_id),
+        "location_id": str(stock.location_id),
+        "available": stock.quantity - stock.reserved_quantity,
+        "reorder_point": stock.reorder_point,
+    }
+
+
+class LowStockAlertWorker:
+    def __init__(
+        self,
+        recipients: list[str],
+        session_factory: Callable[
+            [], AbstractAsyncContextManager[AsyncSession]
+        ] = get_script_session,
+        interval: float | None = None,
+        batch_size: int | None = None,
+    ):
+        self.recipients = recipients
+        self.session_factory = session_factory
+        self.interval = interval or settings.LOW_STOCK_ALERT_INTERVAL_SECONDS
+        self.batch_size = batch_size or settings.LOW_STOCK_ALERT_BATCH_SIZE
+        self._task: asyncio.Task | None = None
+
+    async def run_once(self) -> int:
+        """Handle one batch; returns how many events it consumed."""
+        async with self.session_factory() as session:
+            outbox = OutboxRepository(session)
+            events = await outbox.claim(LOW_STOCK, self.batch_size)
+            if not events:
+                return 0
+
+            # one line per stock row, however many events it has
+            stock_ids = {uuid.UUID(event.key) for event in events}
+            # current state, not the one at enqueue time; replenished rows drop out
+            stocks = await StockRepository(session).get_low_stocks(stock_ids)
+            stocks_by_location: dict[uuid.UUID, list[InventoryStock]] = defaultdict(list)
+            for stock in stocks:
+                stocks_by_location[stock.location_id].append(stock)
+
+            mail_queue = MailQueue(outbox)
+            for location_stocks in stocks_by_location.values():
+                await mail_queue.send_low_stock_digest(
+                    to=self.recipients,
+                    location_name=location_stocks[0].location.name,
+                    items=[_digest_item(stock) for stock in location_stocks],
+                )
+
+            await outbox.complete(event.id for event in events)
+            logger.info(
+                "low stock alerts processed",
+                extra={"events": len(events), "locations": len(stocks_by_location)},
+            )
+            return len(events)
+
+    async def _run_forever(self) -> None:
+        while True:
+            try:
+                # drain the backlog, then wait for the next tick
+                while await self.run_once() >= self.batch_size:
+                    pass
+            except Exception:
+                logger.exception("low stock alert worker: batch failed")
+            await asyncio.sleep(self.interval)
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run_forever())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+
+def _digest_item(stock: InventoryStock) -> dict:
+    return {
+        "sku": stock.product.sku,
+        "name": stock.product.name,
+        "available": stock.quantity - stock.reserved_quantity,
+        "reorder_point": stock.reorder_point,
+    }
+
+
+low_stock_alert_worker = LowStockAlertWorker(settings.LOW_STOCK_ALERT_RECIPIENTS)
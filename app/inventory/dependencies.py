@@ -3,7 +3,12 @@ import uuid
 from fastapi import Depends, Header, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database.session import get_session
+from app.database.session import (
+    RequestContext,
+    get_read_session,
+    get_request_context,
+    get_session,
+)
 from app.inventory.models.location import Location
 from app.inventory.repositories.category_repo import CategoryRepository
 from app.inventory.repositories.location_repo import LocationRepository
@@ -13,9 +18,7 @@ from app.inventory.repositories.stock_repo import StockRepository
 from app.inventory.service import InventoryService
 
 
-def provide_inventory_service(
-    db: AsyncSession = Depends(get_session),
-) -> InventoryService:
+def _inventory_service(db: AsyncSession) -> InventoryService:
     return InventoryService(
         stock_repo=StockRepository(db),
         product_repo=ProductRepository(db),
@@ -25,17 +28,37 @@ def provide_inventory_service(
     )
 
 
+def provide_inventory_service(
+    db: AsyncSession = Depends(get_session, scope="function"),
+) -> InventoryService:
+    return _inventory_service(db)
+
+
+def provide_inventory_reader(
+    db: AsyncSession = Depends(get_read_session),
+) -> InventoryService:
+    """
+    For list endpoints that may stream: the request's session stays open
+    until the response is sent. Read-only use — its commit comes after the
+    response.
+    """
+    return _inventory_service(db)
+
+
 async def get_current_location(
     x_location_id: uuid.UUID | None = Header(default=None),
-    db: AsyncSession = Depends(get_session),
+    context: RequestContext = Depends(get_request_context, scope="request"),
 ) -> Location:
+    if context.location is not None:
+        return context.location
+
     if x_location_id is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Missing X-Location-Id header",
         )
 
-    location_repo = LocationRepository(db)
+    location_repo = LocationRepository(context.session)
     location = await location_repo.get_location(x_location_id)
 
     if location is None:
@@ -44,4 +67,5 @@ async def get_current_location(
             detail="Location not found",
         )
 
+    context.location = location
     return location
@@ -205,4 +205,38 @@ class InvalidReservationStatus(InventoryError):
             message=message,
             status_code=409,
             error_code="INVALID_RESERVATION_STATUS",
-        )
\ No newline at end of file
+        )
+class StockLocked(InventoryError):
+    def __init__(self, message: str = "Stock is busy, please retry"):
+        super().__init__(
+            message=message,
+            status_code=409,
+            error_code="STOCK_LOCKED",
+        )
+
+class InvalidImportLine(InventoryError):
+    def __init__(self, message: str = "Import line is not valid"):
+        super().__init__(
+            message=message,
+            status_code=400,
+            error_code="INVALID_IMPORT_LINE",
+        )
+
+class UnsupportedImportFormat(InventoryError):
+    def __init__(
+        self,
+        message: str = "Content-Type must be application/x-ndjson or text/csv",
+    ):
+        super().__init__(
+            message=message,
+            status_code=415,
+            error_code="UNSUPPORTED_IMPORT_FORMAT",
+        )
+
+class InvalidCursor(InventoryError):
+    def __init__(self, message: str = "Invalid pagination cursor"):
+        super().__init__(
+            message=message,
+            status_code=400,
+            error_code="INVALID_CURSOR",
+        )
@@ -0,0 +1,351 @@
+"""
+bulk stock movements: streaming NDJSON / CSV ingestion.
+
+POST /inventory/import feeds the raw request body through `iter_rows()`,
+which splits and parses it incrementally (the body is never held in memory
+as a whole), and `StockImporter` applies the rows in chunks of
+STOCK_IMPORT_CHUNK_SIZE, each in its own transaction:
+
+1. resolve every SKU / product id of the chunk with one query
+2. lock the chunk's stock rows with one ordered SELECT ... FOR UPDATE
+3. apply the lines in order, in memory; a bad line is reported and skipped
+4. one UPDATE ... FROM (VALUES ...) for the quantities, one multi-row
+   INSERT for the movements (plus low-stock outbox events), commit
+
+line formats:
+- NDJSON: {"sku": "ABC-1", "quantity": 5, "type": "in"}  ("product_id" may
+  replace "sku")
+- CSV:    a header row naming `sku` and/or `product_id`, `quantity`, `type`;
+  quoted fields may not contain newlines
+"""
+
+import csv
+import json
+import logging
+import uuid
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.core.config import settings
+from app.core.global_errors import AppError
+from app.inventory.alerts import LowStockDetector
+from app.inventory.exceptions import (
+    InvalidImportLine,
+    InvalidProductOrLocation,
+    InvalidQuantityStock,
+    ProductNotFound,
+    StockNegative,
+    UnsupportedImportFormat,
+)
+from app.inventory.models.enums import StockMovementType
+from app.inventory.repositories.product_repo import ProductRepository
+from app.inventory.repositories.stock_repo import StockRepository
+from app.inventory.schemas import StockImportLineResult, StockImportReport
+
+logger = logging.getLogger(__name__)
+
+NDJSON = "application/x-ndjson"
+CSV = "text/csv"
+
+MAX_LINE_BYTES = 64 * 1024
+
+
+@dataclass
+class ImportRow:
+    line: int
+    movement_type: StockMovementType
+    quantity: int
+    sku: str | None = None
+    product_id: uuid.UUID | None = None
+
+
+@dataclass
+class ImportLineError:
+    line: int
+    error: AppError
+
+
+# parsing
+
+
+async def _iter_lines(
+    chunks: AsyncIterator[bytes],
+) -> AsyncIterator[tuple[int, bytes | None]]:
+    """(line number, raw line) for every non-blank line; None = line too long."""
+    buffer = b""
+    line_no = 0
+    oversized = False
+
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for raw in lines:
+            line_no += 1
+            if oversized:
+                # tail of a line whose head was already dropped
+                oversized = False
+                yield line_no, None
+            elif raw.strip():
+                yield line_no, raw
+        if len(buffer) > MAX_LINE_BYTES:
+            oversized = True
+            buffer = b""
+
+    if oversized:
+        yield line_no + 1, None
+    elif buffer.strip():
+        yield line_no + 1, buffer
+
+
+def _build_row(line: int, fields: dict) -> ImportRow:
+    try:
+        movement_type = StockMovementType(str(fields.get("type", "")).strip().lower())
+    except ValueError:
+        raise InvalidImportLine("type must be one of: in, out, adjust")
+
+    quantity = fields.get("quantity")
+    if isinstance(quantity, str):
+        quantity = quantity.strip()
+    if isinstance(quantity, (bool, float)):
+        raise InvalidImportLine("quantity must be an integer")
+    try:
+        quantity = int(quantity)  # type: ignore[arg-type]
+    except (TypeError, ValueError):
+        raise InvalidImportLine("quantity must be an integer")
+
+    sku = str(fields.get("sku") or "").strip().upper() or None
+    product_id = None
+    raw_product_id = str(fields.get("product_id") or "").strip()
+    if raw_product_id:
+        try:
+            product_id = uuid.UUID(raw_product_id)
+        except ValueError:
+            raise InvalidImportLine("product_id is not a valid UUID")
+
+    if sku is None and product_id is None:
+        raise InvalidImportLine("sku or product_id is required")
+
+    return ImportRow(
+        line=line,
+        movement_type=movement_type,
+        quantity=quantity,
+        sku=sku,
+        product_id=product_id,
+    )
+
+
+async def _iter_ndjson(
+    lines: AsyncIterator[tuple[int, bytes | None]],
+) -> AsyncIterator[ImportRow | ImportLineError]:
+    async for line_no, raw in lines:
+        try:
+            if raw is None:
+                raise InvalidImportLine("line is too long")
+            try:
+                fields = json.loads(raw)
+            except ValueError:
+                raise InvalidImportLine("line is not valid JSON")
+            if not isinstance(fields, dict):
+                raise InvalidImportLine("line must be a JSON object")
+            yield _build_row(line_no, fields)
+        except InvalidImportLine as exc:
+            yield ImportLineError(line_no, exc)
+
+
+async def _iter_csv(
+    lines: AsyncIterator[tuple[int, bytes | None]],
+) -> AsyncIterator[ImportRow | ImportLineError]:
+    header: list[str] | None = None
+    async for line_no, raw in lines:
+        try:
+            if raw is None:
+                raise InvalidImportLine("line is too long")
+            try:
+                text = raw.decode("utf-8-sig").rstrip("\r")
+            except UnicodeDecodeError:
+                raise InvalidImportLine("line is not valid UTF-8")
+            try:
+                values = next(csv.reader([text]))
+            except csv.Error:
+                raise InvalidImportLine("line is not valid CSV")
+        except InvalidImportLine as exc:
+            if header is None:
+                raise
+            yield ImportLineError(line_no, exc)
+            continue
+
+        if header is None:
+            # nothing has been applied yet, so a bad header fails the whole upload
+            header = [name.strip().lower() for name in values]
+            if "quantity" not in header or "type" not in header:
+                raise InvalidImportLine("CSV header must name quantity and type columns")
+            continue
+
+        try:
+            yield _build_row(line_no, dict(zip(header, values)))
+        except InvalidImportLine as exc:
+            yield ImportLineError(line_no, exc)
+
+
+def iter_rows(
+    chunks: AsyncIterator[bytes], content_type: str
+) -> AsyncIterator[ImportRow | ImportLineError]:
+    if content_type == NDJSON:
+        return _iter_ndjson(_iter_lines(chunks))
+    if content_type == CSV:
+        return _iter_csv(_iter_lines(chunks))
+    raise UnsupportedImportFormat()
+
+
+# applying
+
+
+class StockImporter:
+    def __init__(
+        self,
+        stock_repo: StockRepository,
+        product_repo: ProductRepository,
+        location_id: uuid.UUID,
+        user_id: uuid.UUID,
+        low_stock: LowStockDetector,
+        chunk_size: int | None = None,
+    ):
+        self.stock_repo = stock_repo
+        self.product_repo = product_repo
+        self.location_id = location_id
+        self.user_id = user_id
+        self.low_stock = low_stock
+        self.chunk_size = max(1, chunk_size or settings.STOCK_IMPORT_CHUNK_SIZE)
+
+    async def run(
+        self, rows: AsyncIterator[ImportRow | ImportLineError]
+    ) -> StockImportReport:
+        results: list[StockImportLineResult] = []
+        chunk: list[ImportRow] = []
+
+        async for row in rows:
+            if isinstance(row, ImportLineError):
+                results.append(_failed(row.line, row.error))
+                continue
+            chunk.append(row)
+            if len(chunk) >= self.chunk_size:
+                results.extend(await self._apply_chunk(chunk))
+                chunk = []
+
+        if chunk:
+            results.extend(await self._apply_chunk(chunk))
+
+        results.sort(key=lambda result: result.line)
+        applied = sum(1 for result in results if result.ok)
+        return StockImportReport(
+            total=len(results),
+            applied=applied,
+            failed=len(results) - applied,
+            results=results,
+        )
+
+    async def _apply_chunk(self, rows: list[ImportRow]) -> list[StockImportLineResult]:
+        products = await self.product_repo.resolve_product_ids(
+            skus={row.sku for row in rows if row.sku},
+            product_ids={row.product_id for row in rows if row.product_id},
+        )
+        id_by_sku = {sku: product_id for product_id, sku in products}
+        known_ids = {product_id for product_id, _ in products}
+
+        def product_of(row: ImportRow) -> uuid.UUID | None:
+            if row.product_id is not None:
+                return row.product_id if row.product_id in known_ids else None
+            return id_by_sku.get(row.sku)  # type: ignore[arg-type]
+
+        stocks = await self.stock_repo.get_stocks_for_update(
+            {(product_id, self.location_id) for product_id in known_ids}
+        )
+        stock_by_product = {stock.product_id: stock for stock in stocks}
+        quantities = {stock.id: stock.quantity for stock in stocks}
+
+        results: list[StockImportLineResult] = []
+        movements: list[dict] = []
+        changed: dict[uuid.UUID, int] = {}
+
+        for row in rows:
+            try:
+                product_id = product_of(row)
+                if product_id is None:
+                    raise ProductNotFound()
+                stock = stock_by_product.get(product_id)
+                if stock is None:
+                    raise InvalidProductOrLocation()
+
+                previous = quantities[stock.id]
+                new = _new_quantity(row, previous)
+            except AppError as exc:
+                results.append(_failed(row.line, exc))
+                continue
+
+            quantities[stock.id] = changed[stock.id] = new
+            movements.append(
+                {
+                    "id": uuid.uuid7(),
+                    "movement_type": row.movement_type,
+                    "quantity": abs(new - previous),
+                    "stock_id": stock.id,
+                    "previous_quantity": previous,
+                    "new_quantity": new,
+                    "created_by": self.user_id,
+                }
+            )
+            results.append(
+                StockImportLineResult(
+                    line=row.line,
+                    ok=True,
+                    stock_id=stock.id,
+                    movement_type=row.movement_type,
+                    new_quantity=new,
+                )
+            )
+
+        await self.stock_repo.apply_bulk_movements(changed, movements)
+
+        changes = []
+        for stock in stocks:
+            if stock.id in changed:
+                available_before = stock.quantity - stock.reserved_quantity
+                # the UPDATE ran in Core: sync the instance without dirtying it
+                set_committed_value(stock, "quantity", changed[stock.id])
+                changes.append((stock, available_before))
+        await self.low_stock.check_many(changes)
+
+        # each chunk is its own unit of work: commit releases its row locks
+        await self.stock_repo.db.commit()
+        logger.info(
+            "import_stock_movements: chunk applied",
+            extra={"location_id": self.location_id, "lines": len(rows), "movements": len(movements)},
+        )
+        return results
+
+
+def _new_quantity(row: ImportRow, previous: int) -> int:
+    if row.movement_type == StockMovementType.ADJUST:
+        if row.quantity < 0:
+            raise StockNegative()
+        return row.quantity
+
+    if row.quantity <= 0:
+        raise InvalidQuantityStock()
+    if row.movement_type == StockMovementType.IN:
+        return previous + row.quantity
+
+    if previous < row.quantity:
+        raise StockNegative()
+    return previous - row.quantity
+
+
+def _failed(line: int, error: AppError) -> StockImportLineResult:
+    return StockImportLineResult(
+        line=line,
+        ok=False,
+        error_code=error.error_code,
+        message=error.message,
+    )
@@ -3,7 +3,7 @@ from __future__ import annotations
 import uuid
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Boolean, Column, ForeignKey, String, Table, Text, Uuid
+from sqlalchemy import Boolean, Column, ForeignKey, Index, String, Table, Text, Uuid
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database.base import Base
@@ -16,6 +16,8 @@ product_category = Table(
     Base.metadata,
     Column("product_id", Uuid, ForeignKey("inventory_products.id"), primary_key=True),
     Column("category_id", Uuid, ForeignKey("inventory_categories.id"), primary_key=True),
+    # the primary key leads with product_id; filtering by category needs this
+    Index("ix_inventory_product_categories_category_id", "category_id", "product_id"),
 )
 
 
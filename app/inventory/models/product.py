@@ -4,7 +4,7 @@ import uuid
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Boolean, DateTime, String, Uuid, func
+from sqlalchemy import Boolean, DateTime, Index, String, Uuid, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database.base import Base
@@ -17,6 +17,19 @@ if TYPE_CHECKING:
 
 class Product(Base):
     __tablename__ = "inventory_products"
+    __table_args__ = (
+        # keyset pagination order, plus the same order per active flag
+        Index("ix_inventory_products_created_at_id", "created_at", "id"),
+        Index("ix_inventory_products_active_created_at_id", "is_active", "created_at", "id"),
+        # sku LIKE 'prefix%' (the unique index only serves equality)
+        Index(
+            "ix_inventory_products_sku_pattern",
+            "sku",
+            postgresql_ops={"sku": "varchar_pattern_ops"},
+        ),
+        # name search uses ix_inventory_products_name_trgm, which needs the
+        # pg_trgm extension and so is managed by the migration only
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         Uuid,
@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime, timezone
 
-from sqlalchemy import DateTime, Enum, ForeignKey, Integer, Uuid
+from sqlalchemy import DateTime, Enum, ForeignKey, Index, Integer, Uuid, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database.base import Base
@@ -12,6 +12,14 @@ from app.orders.models.order import OrderItem
 
 class StockReservation(Base):
     __tablename__ = "stock_reservation"
+    __table_args__ = (
+        # the sweeper's scan: only live holds, oldest deadline first
+        Index(
+            "ix_stock_reservation_expires_at",
+            "expires_at",
+            postgresql_where=text("status = 'RESERVED'"),
+        ),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         Uuid,
@@ -49,12 +57,22 @@ class StockReservation(Base):
         default=lambda: datetime.now(timezone.utc),
     )
 
+    # a hold still RESERVED after this is released by the sweeper
+    expires_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+    )
+
     order_item: Mapped["OrderItem"] = relationship(back_populates="reservation")
     stock: Mapped["InventoryStock"] = relationship(back_populates="reservations")
 
     @classmethod
     def create(
-        cls, order_item_id: uuid.UUID, stock_id: uuid.UUID, quantity: int
+        cls,
+        order_item_id: uuid.UUID,
+        stock_id: uuid.UUID,
+        quantity: int,
+        expires_at: datetime,
     ) -> "StockReservation":
         if quantity <= 0:
             raise ValueError("Quantity must be greater than zero")
@@ -63,4 +81,5 @@ class StockReservation(Base):
             stock_id=stock_id,
             quantity=quantity,
             status=ReservationStatus.RESERVED,
+            expires_at=expires_at,
         )
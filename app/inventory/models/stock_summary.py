@@ -0,0 +1,148 @@
+"""
+inventory_stock_summary: one denormalized row per stock row for dashboards.
+
+the table is maintained by Postgres triggers, never by the application:
+- every INSERT / UPDATE of quantity, reserved_quantity, reorder_point (or the
+  keys) on inventory_stock upserts the row, copying the product's sku and name
+- a sku / name change on inventory_products is copied to its summary rows
+- deleting a stock row cascades through the FK
+
+so the summary commits together with the stock write that caused it, and a
+read is one index scan with no joins. each write also stamps `version` from a
+sequence; a (count, sum(version)) aggregate over a location changes whenever
+any of its rows does, which the read endpoint turns into an ETag.
+
+the triggers are attached on `after_create` so `create_all` (tests) gets them;
+the migration creates the same objects.
+"""
+import uuid
+from datetime import datetime
+
+from sqlalchemy import (
+    DDL,
+    BigInteger,
+    Boolean,
+    Computed,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    Sequence,
+    String,
+    Uuid,
+    event,
+)
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database.base import Base
+
+# sequences are not transactional: every write gets a fresh, increasing value
+# even inside one long transaction
+summary_version_seq = Sequence(
+    "inventory_stock_summary_version_seq", metadata=Base.metadata
+)
+
+
+class StockSummary(Base):
+    __tablename__ = "inventory_stock_summary"
+    __table_args__ = (
+        Index(
+            "ix_inventory_stock_summary_location_product",
+            "location_id",
+            "product_id",
+            unique=True,
+        ),
+    )
+
+    stock_id: Mapped[uuid.UUID] = mapped_column(
+        Uuid,
+        ForeignKey("inventory_stock.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    location_id: Mapped[uuid.UUID] = mapped_column(Uuid, nullable=False)
+    product_id: Mapped[uuid.UUID] = mapped_column(Uuid, nullable=False)
+    sku: Mapped[str] = mapped_column(String(100), nullable=False)
+    name: Mapped[str] = mapped_column(String(255), nullable=False)
+    quantity: Mapped[int] = mapped_column(Integer, nullable=False)
+    reserved_quantity: Mapped[int] = mapped_column(Integer, nullable=False)
+    reorder_point: Mapped[int] = mapped_column(Integer, nullable=False)
+    # same threshold as the low-stock alerts (app/inventory/alerts.py)
+    available: Mapped[int] = mapped_column(
+        Integer, Computed("quantity - reserved_quantity")
+    )
+    low_stock: Mapped[bool] = mapped_column(
+        Boolean, Computed("quantity - reserved_quantity <= reorder_point")
+    )
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
+
+
+# one statement per DDL: asyncpg prepares each one, so no multi-statement strings
+
+SYNC_STOCK_FUNCTION = DDL("""
+CREATE OR REPLACE FUNCTION inventory_stock_summary_sync() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO inventory_stock_summary (
+        stock_id, location_id, product_id, sku, name,
+        quantity, reserved_quantity, reorder_point, version, updated_at
+    )
+    SELECT NEW.id, NEW.location_id, NEW.product_id, p.sku, p.name,
+           NEW.quantity, NEW.reserved_quantity, NEW.reorder_point,
+           nextval('inventory_stock_summary_version_seq'), now()
+    FROM inventory_products p
+    WHERE p.id = NEW.product_id
+    ON CONFLICT (stock_id) DO UPDATE SET
+        location_id = EXCLUDED.location_id,
+        product_id = EXCLUDED.product_id,
+        sku = EXCLUDED.sku,
+        name = EXCLUDED.name,
+        quantity = EXCLUDED.quantity,
+        reserved_quantity = EXCLUDED.reserved_quantity,
+        reorder_point = EXCLUDED.reorder_point,
+        version = EXCLUDED.version,
+        updated_at = EXCLUDED.updated_at;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+""")
+
+SYNC_STOCK_TRIGGER = DDL("""
+CREATE TRIGGER inventory_stock_summary_sync
+AFTER INSERT OR UPDATE OF location_id, product_id, quantity, reserved_quantity, reorder_point
+ON inventory_stock
+FOR EACH ROW EXECUTE FUNCTION inventory_stock_summary_sync()
+""")
+
+SYNC_PRODUCT_FUNCTION = DDL("""
+CREATE OR REPLACE FUNCTION inventory_stock_summary_product_sync() RETURNS trigger AS $$
+BEGIN
+    UPDATE inventory_stock_summary
+    SET sku = NEW.sku,
+        name = NEW.name,
+        version = nextval('inventory_stock_summary_version_seq'),
+        updated_at = now()
+    WHERE product_id = NEW.id;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+""")
+
+SYNC_PRODUCT_TRIGGER = DDL("""
+CREATE TRIGGER inventory_stock_summary_product_sync
+AFTER UPDATE OF sku, name ON inventory_products
+FOR EACH ROW
+WHEN (OLD.sku IS DISTINCT FROM NEW.sku OR OLD.name IS DISTINCT FROM NEW.name)
+EXECUTE FUNCTION inventory_stock_summary_product_sync()
+""")
+
+# the FK makes create_all build this table after inventory_stock and
+# inventory_products, so both exist when the triggers are attached
+for _ddl in (
+    SYNC_STOCK_FUNCTION,
+    SYNC_STOCK_TRIGGER,
+    SYNC_PRODUCT_FUNCTION,
+    SYNC_PRODUCT_TRIGGER,
+):
+    event.listen(StockSummary.__table__, "after_create", _ddl)
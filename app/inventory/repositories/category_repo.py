@@ -33,20 +33,17 @@ class CategoryRepository:
     async def create_category(self, name: str, description: str) -> Category:
         category = Category(name=name, description=description)
         self.db.add(category)
-        await self.db.commit()
-        await self.db.refresh(category)
+        await self.db.flush()
         return category
 
     async def save_category(self, category: Category) -> Category:
-        await self.db.commit()
-        await self.db.refresh(category)
+        await self.db.flush()
         return category
 
     async def remove_product(self, category: Category, product: Product) -> Category:
         if product in category.products:
             category.products.remove(product)
-            await self.db.commit()
-            await self.db.refresh(category)
+            await self.db.flush()
         return category
 
     async def delete_category(self, category_id: uuid.UUID) -> bool:
@@ -55,5 +52,5 @@ class CategoryRepository:
             return False
 
         await self.db.delete(category)
-        await self.db.commit()
+        await self.db.flush()
         return True
@@ -1,7 +1,11 @@
 import uuid
+from collections.abc import AsyncIterator, Sequence
+from datetime import datetime
 
+from app.database.loader import Loader
+from app.database.streaming import open_stream
 from app.inventory.models.location import Location
-from sqlalchemy import select
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 
@@ -11,15 +15,24 @@ class LocationRepository:
 
     # used by stock
     async def get_location(self, location_id: uuid.UUID) -> Location | None:
-        stmt = select(Location).where(Location.id == location_id)
-        result = await self.db.execute(stmt)
-        return result.scalar_one_or_none()
+        # get_current_location and the service's checks share one lookup
+        return await Loader.of(self.db).load(Location, location_id)
 
     async def list_locations(self) -> list[Location]:
         stmt = select(Location).order_by(Location.id)
         result = await self.db.execute(stmt)
         return list(result.scalars().all())
 
+    async def get_locations_version(self) -> tuple[int, datetime | None]:
+        """(count, latest updated_at): an insert, update or delete changes one of them."""
+        stmt = select(func.count(), func.max(Location.updated_at))
+        result = await self.db.execute(stmt)
+        total, last_updated = result.one()
+        return total, last_updated
+
+    async def stream_locations(self) -> AsyncIterator[Sequence[Location]]:
+        return await open_stream(self.db, select(Location).order_by(Location.id))
+
     async def get_by_name(self, name: str) -> Location | None:
         stmt = select(Location).where(Location.name == name)
         result = await self.db.execute(stmt)
@@ -28,8 +41,7 @@ class LocationRepository:
     async def create_location(self, name: str, city: str, address: str) -> Location:
         location = Location(name=name, city=city, address=address)
         self.db.add(location)
-        await self.db.commit()
-        await self.db.refresh(location)
+        await self.db.flush()
         return location
 
     async def update_location(
@@ -50,8 +62,7 @@ class LocationRepository:
         if address is not None:
             location.address = address
 
-        await self.db.commit()
-        await self.db.refresh(location)
+        await self.db.flush()
         return location
 
     async def delete_location(self, location_id: uuid.UUID) -> bool:
@@ -60,5 +71,5 @@ class LocationRepository:
             return False
 
         await self.db.delete(location)
-        await self.db.commit()
+        await self.db.flush()
         return True
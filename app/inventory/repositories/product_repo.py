@@ -1,8 +1,13 @@
 import uuid
+from collections.abc import AsyncIterator, Sequence
+from datetime import datetime
 
-from app.inventory.models.category import Category
+from app.database.invalidation import INVENTORY_PRODUCT, publish_invalidation
+from app.database.loader import Loader
+from app.database.streaming import open_stream
+from app.inventory.models.category import Category, product_category
 from app.inventory.models.product import Product
-from sqlalchemy import select
+from sqlalchemy import Select, or_, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 
@@ -11,20 +16,47 @@ class ProductRepository:
         self.db = db
 
     async def get_product(self, product_id: uuid.UUID) -> Product | None:
-        stmt = select(Product).where(Product.id == product_id)
-        result = await self.db.execute(stmt)
-        return result.scalar_one_or_none()
+        return await Loader.of(self.db).load(Product, product_id)
 
     async def get_by_sku(self, sku: str) -> Product | None:
         stmt = select(Product).where(Product.sku == sku)
         result = await self.db.execute(stmt)
         return result.scalar_one_or_none()
 
-    async def list_products(self) -> list[Product]:
-        stmt = select(Product)
+    async def resolve_product_ids(
+        self, skus: set[str], product_ids: set[uuid.UUID]
+    ) -> list[tuple[uuid.UUID, str]]:
+        """(id, sku) of every product matching one of the SKUs or ids."""
+        if not skus and not product_ids:
+            return []
+        stmt = select(Product.id, Product.sku).where(
+            or_(Product.sku.in_(skus), Product.id.in_(product_ids))
+        )
+        result = await self.db.execute(stmt)
+        return [(row.id, row.sku) for row in result]
+
+    async def list_products(
+        self,
+        limit: int,
+        after: tuple[datetime, uuid.UUID] | None = None,
+        **filters,
+    ) -> list[Product]:
+        """
+        One keyset page, newest first: products strictly after the
+        (created_at, id) of the previous page's last row. Walks
+        ix_inventory_products_created_at_id, so a page costs the same
+        whatever its depth.
+        """
+        stmt = _products_query(after, **filters).limit(limit)
         result = await self.db.execute(stmt)
         return list(result.scalars().all())
 
+    async def stream_products(
+        self, after: tuple[datetime, uuid.UUID] | None = None, **filters
+    ) -> AsyncIterator[Sequence[Product]]:
+        """Every matching product in listing order, in batches (see open_stream)."""
+        return await open_stream(self.db, _products_query(after, **filters))
+
     async def create_product(
         self, name: str, sku: str, category_id: uuid.UUID
     ) -> Product:
@@ -35,8 +67,7 @@ class ProductRepository:
             categories=[category] if category else [],
         )
         self.db.add(product)
-        await self.db.commit()
-        await self.db.refresh(product)
+        await self.db.flush()
         return product
 
     async def update_product(
@@ -54,8 +85,8 @@ class ProductRepository:
         if sku is not None:
             product.sku = sku
 
-        await self.db.commit()
-        await self.db.refresh(product)
+        await publish_invalidation(self.db, INVENTORY_PRODUCT, product.id)
+        await self.db.flush()
 
         return product
 
@@ -69,8 +100,8 @@ class ProductRepository:
 
         product.is_active = True
 
-        await self.db.commit()
-        await self.db.refresh(product)
+        await publish_invalidation(self.db, INVENTORY_PRODUCT, product.id)
+        await self.db.flush()
 
         return product
 
@@ -84,14 +115,14 @@ class ProductRepository:
 
         product.is_active = False
 
-        await self.db.commit()
-        await self.db.refresh(product)
+        await publish_invalidation(self.db, INVENTORY_PRODUCT, product.id)
+        await self.db.flush()
 
         return product
 
     async def save(self, product: Product) -> Product:
-        await self.db.commit()
-        await self.db.refresh(product)
+        await publish_invalidation(self.db, INVENTORY_PRODUCT, product.id)
+        await self.db.flush()
         return product
 
     # Category operations
@@ -120,3 +151,28 @@ class ProductRepository:
 
         await self.save(product)
         return product
+
+
+def _products_query(
+    after: tuple[datetime, uuid.UUID] | None = None,
+    is_active: bool | None = None,
+    category_id: uuid.UUID | None = None,
+    sku_prefix: str | None = None,
+    search: str | None = None,
+) -> Select:
+    stmt = select(Product)
+
+    if after is not None:
+        stmt = stmt.where(tuple_(Product.created_at, Product.id) < tuple_(*after))
+    if is_active is not None:
+        stmt = stmt.where(Product.is_active == is_active)
+    if category_id is not None:
+        stmt = stmt.join(
+            product_category, product_category.c.product_id == Product.id
+        ).where(product_category.c.category_id == category_id)
+    if sku_prefix:
+        stmt = stmt.where(Product.sku.startswith(sku_prefix, autoescape=True))
+    if search:
+        stmt = stmt.where(Product.name.icontains(search, autoescape=True))
+
+    return stmt.order_by(Product.created_at.desc(), Product.id.desc())
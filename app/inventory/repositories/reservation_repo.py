@@ -1,4 +1,6 @@
 import uuid
+from collections.abc import Iterable
+from datetime import datetime
 
 from app.inventory.models.reservation import StockReservation
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -9,13 +11,35 @@ class ReservationRepository:
         self.db = db
 
     async def create_reservation(
-        self, order_item_id: uuid.UUID, stock_id: uuid.UUID, quantity: int
+        self,
+        order_item_id: uuid.UUID,
+        stock_id: uuid.UUID,
+        quantity: int,
+        expires_at: datetime,
     ) -> StockReservation:
         reservation = StockReservation.create(
             order_item_id=order_item_id,
             stock_id=stock_id,
             quantity=quantity,
+            expires_at=expires_at,
         )
         self.db.add(reservation)
         await self.db.flush()
         return reservation
+
+    async def create_reservations(
+        self, rows: Iterable[tuple[uuid.UUID, uuid.UUID, int]], expires_at: datetime
+    ) -> list[StockReservation]:
+        """(order_item_id, stock_id, quantity) rows, sent as one multi-row INSERT."""
+        reservations = [
+            StockReservation.create(
+                order_item_id=order_item_id,
+                stock_id=stock_id,
+                quantity=quantity,
+                expires_at=expires_at,
+            )
+            for order_item_id, stock_id, quantity in rows
+        ]
+        self.db.add_all(reservations)
+        await self.db.flush()
+        return reservations
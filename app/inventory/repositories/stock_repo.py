@@ -1,11 +1,42 @@
 import uuid
-from typing import Optional
+from collections.abc import AsyncIterator, Iterable, Sequence
+from typing import NamedTuple, Optional
 
+from app.database.streaming import open_stream
+from app.inventory.models.enums import ReservationStatus, StockMovementType
 from app.inventory.models.reservation import StockReservation
 from app.inventory.models.stock import InventoryStock, StockMovement
-from sqlalchemy import select
+from app.inventory.models.stock_summary import StockSummary
+from sqlalchemy import (
+    Integer,
+    Select,
+    Uuid,
+    column,
+    func,
+    insert,
+    literal,
+    select,
+    tuple_,
+    update,
+    values,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import aliased, selectinload
+
+
+class AppliedMovement(NamedTuple):
+    movement: StockMovement
+    # the stock row's other counters after the change (low-stock check)
+    reserved_quantity: int
+    reorder_point: int
+
+
+def _for_update(stmt: Select, lock_mode: str) -> Select:
+    if lock_mode == "nowait":
+        return stmt.with_for_update(nowait=True)
+    if lock_mode == "skip_locked":
+        return stmt.with_for_update(skip_locked=True)
+    return stmt.with_for_update()
 
 
 class StockRepository:
@@ -26,6 +57,20 @@ class StockRepository:
         result = await self.db.execute(stmt)
         return result.scalar_one_or_none() is not None
 
+    async def get_stock_by_location_and_product(
+        self, product_id: uuid.UUID, location_id: uuid.UUID
+    ) -> InventoryStock | None:
+        stmt = (
+            select(InventoryStock)
+            .where(
+                InventoryStock.product_id == product_id,
+                InventoryStock.location_id == location_id,
+            )
+            .execution_options(populate_existing=True)
+        )
+        result = await self.db.execute(stmt)
+        return result.scalar_one_or_none()
+
     async def get_stock_by_location_and_product_for_update(
         self, product_id: uuid.UUID, location_id: uuid.UUID
     ) -> InventoryStock | None:
@@ -40,6 +85,56 @@ class StockRepository:
         result = await self.db.execute(stmt)
         return result.scalar_one_or_none()
 
+    async def get_stocks_for_update(
+        self, keys: Iterable[tuple[uuid.UUID, uuid.UUID]], lock_mode: str = "wait"
+    ) -> list[InventoryStock]:
+        """
+        Lock every (product_id, location_id) row in one statement.
+        Rows are locked in id order so concurrent batches can't deadlock,
+        and populate_existing makes the locked values win over instances
+        already in the session.
+        """
+        keys = list(keys)
+        if not keys:
+            return []
+        stmt = (
+            select(InventoryStock)
+            .where(
+                tuple_(InventoryStock.product_id, InventoryStock.location_id).in_(keys)
+            )
+            .order_by(InventoryStock.id)
+            .execution_options(populate_existing=True)
+        )
+        result = await self.db.execute(_for_update(stmt, lock_mode))
+        return list(result.scalars().all())
+
+    async def get_stocks_by_ids_for_update(
+        self, stock_ids: Iterable[uuid.UUID], lock_mode: str = "wait"
+    ) -> list[InventoryStock]:
+        """Same as get_stocks_for_update, keyed by stock id."""
+        stock_ids = list(stock_ids)
+        if not stock_ids:
+            return []
+        stmt = (
+            select(InventoryStock)
+            .where(InventoryStock.id.in_(stock_ids))
+            .order_by(InventoryStock.id)
+            .execution_options(populate_existing=True)
+        )
+        result = await self.db.execute(_for_update(stmt, lock_mode))
+        return list(result.scalars().all())
+
+    async def count_stocks(self, keys: Iterable[tuple[uuid.UUID, uuid.UUID]]) -> int:
+        """Unlocked existence check, tells a skipped row from a missing one."""
+        keys = list(keys)
+        if not keys:
+            return 0
+        stmt = select(func.count()).where(
+            tuple_(InventoryStock.product_id, InventoryStock.location_id).in_(keys)
+        )
+        result = await self.db.execute(stmt)
+        return result.scalar_one()
+
     async def get_stock_by_id_for_update(
         self, stock_id: uuid.UUID
     ) -> InventoryStock | None:
@@ -60,6 +155,37 @@ class StockRepository:
         result = await self.db.execute(stmt)
         return result.scalar_one_or_none()
 
+    async def get_reservations_by_ids(
+        self, reservation_ids: Iterable[uuid.UUID]
+    ) -> list[StockReservation]:
+        reservation_ids = list(reservation_ids)
+        if not reservation_ids:
+            return []
+        stmt = (
+            select(StockReservation)
+            .where(StockReservation.id.in_(reservation_ids))
+            .execution_options(populate_existing=True)
+        )
+        result = await self.db.execute(stmt)
+        return list(result.scalars().all())
+
+    async def get_expired_reservations(self, limit: int) -> list[StockReservation]:
+        """
+        RESERVED holds past their expires_at, oldest first. Unlocked: the
+        caller locks their stock rows and re-reads them before releasing.
+        """
+        stmt = (
+            select(StockReservation)
+            .where(
+                StockReservation.status == ReservationStatus.RESERVED,
+                StockReservation.expires_at <= func.now(),
+            )
+            .order_by(StockReservation.expires_at)
+            .limit(limit)
+        )
+        result = await self.db.execute(stmt)
+        return list(result.scalars().all())
+
     async def get_available_stock_by_product(
         self, product_id: uuid.UUID
     ) -> InventoryStock | None:
@@ -77,21 +203,125 @@ class StockRepository:
             reorder_point=reorder_point,
         )
         self.db.add(stock)
-        await self.db.commit()
-        await self.db.refresh(stock)
+        await self.db.flush()
         return stock
 
     async def update_quantity_stock(self, stock: InventoryStock) -> InventoryStock:
-        await self.db.commit()
-        await self.db.refresh(stock)
+        await self.db.flush()
         return stock
 
     async def create_movement(self, movement: StockMovement) -> StockMovement:
         self.db.add(movement)
-        await self.db.commit()
-        await self.db.refresh(movement)
+        await self.db.flush()
         return movement
 
+    async def apply_movement(
+        self,
+        product_id: uuid.UUID,
+        location_id: uuid.UUID,
+        movement_type: StockMovementType,
+        user_id: uuid.UUID,
+        delta: int | None = None,
+        absolute: int | None = None,
+    ) -> AppliedMovement | None:
+        """
+        Change the quantity and write its StockMovement in one statement:
+
+            WITH old AS (SELECT id, quantity ... FOR UPDATE),
+                 upd AS (UPDATE inventory_stock SET quantity = <new>
+                         FROM old WHERE id = old.id AND <new> >= 0
+                         RETURNING id, old.quantity, quantity,
+                                   reserved_quantity, reorder_point),
+                 ins AS (INSERT INTO inventory_stock_movement ...
+                         SELECT ... FROM upd RETURNING *)
+            SELECT ins.*, upd.reserved_quantity, upd.reorder_point
+            FROM ins JOIN upd ON upd.id = ins.stock_id
+
+        <new> is old.quantity + delta, or `absolute` for an adjustment. The
+        row lock is taken by this statement and released by the request's
+        commit. Returns None when nothing was updated (no such stock row, or
+        it would go negative); the caller tells the two apart.
+        """
+        old = (
+            select(InventoryStock.id, InventoryStock.quantity)
+            .where(
+                InventoryStock.product_id == product_id,
+                InventoryStock.location_id == location_id,
+            )
+            .with_for_update()
+            .cte("old")
+        )
+        new_quantity = (
+            old.c.quantity + delta if absolute is None else literal(absolute)
+        )
+        upd = (
+            update(InventoryStock)
+            .where(InventoryStock.id == old.c.id, new_quantity >= 0)
+            .values(quantity=new_quantity)
+            .returning(
+                InventoryStock.id.label("stock_id"),
+                old.c.quantity.label("previous_quantity"),
+                InventoryStock.quantity.label("new_quantity"),
+                InventoryStock.reserved_quantity,
+                InventoryStock.reorder_point,
+            )
+            .cte("upd")
+        )
+        ins = (
+            insert(StockMovement)
+            .from_select(
+                [
+                    "id",
+                    "movement_type",
+                    "quantity",
+                    "stock_id",
+                    "previous_quantity",
+                    "new_quantity",
+                    "created_by",
+                ],
+                select(
+                    literal(uuid.uuid7(), StockMovement.id.type),
+                    literal(movement_type, StockMovement.movement_type.type),
+                    # the magnitude of the change, also for adjustments
+                    func.abs(upd.c.new_quantity - upd.c.previous_quantity),
+                    upd.c.stock_id,
+                    upd.c.previous_quantity,
+                    upd.c.new_quantity,
+                    literal(user_id, StockMovement.created_by.type),
+                ),
+            )
+            .returning(*StockMovement.__table__.c)
+            .cte("ins")
+        )
+        movement = aliased(StockMovement, ins)
+        stmt = select(
+            movement, upd.c.reserved_quantity, upd.c.reorder_point
+        ).join(upd, upd.c.stock_id == movement.stock_id)
+        row = (await self.db.execute(stmt)).one_or_none()
+        return None if row is None else AppliedMovement(*row)
+
+    async def apply_bulk_movements(
+        self, quantities: dict[uuid.UUID, int], movements: list[dict]
+    ) -> None:
+        """
+        Write a batch computed by the caller (rows already locked): one
+        UPDATE ... FROM (VALUES ...) for the new quantities, one multi-row
+        INSERT for the movements.
+        """
+        if quantities:
+            new_values = values(
+                column("id", Uuid), column("quantity", Integer), name="new_values"
+            ).data(list(quantities.items()))
+            stmt = (
+                update(InventoryStock)
+                .where(InventoryStock.id == new_values.c.id)
+                .values(quantity=new_values.c.quantity)
+                .execution_options(synchronize_session=False)
+            )
+            await self.db.execute(stmt)
+        if movements:
+            await self.db.execute(insert(StockMovement), movements)
+
     async def list_stock_movements(
         self, stock_id: uuid.UUID, limit: int = 100
     ) -> list[StockMovement]:
@@ -127,6 +357,87 @@ class StockRepository:
         result = await self.db.execute(stmt)
         return list(result.scalars().all())
 
+    async def stream_stock_levels(
+        self,
+        location_id: Optional[uuid.UUID] = None,
+        product_id: Optional[uuid.UUID] = None,
+    ) -> AsyncIterator[Sequence[InventoryStock]]:
+        # no product/location eager loads: the stream only needs the stock
+        # columns, and loaded relations would outlive each batch
+        stmt = select(InventoryStock)
+        if location_id:
+            stmt = stmt.where(InventoryStock.location_id == location_id)
+        if product_id:
+            stmt = stmt.where(InventoryStock.product_id == product_id)
+        stmt = stmt.order_by(InventoryStock.product_id, InventoryStock.location_id)
+        return await open_stream(self.db, stmt)
+
+    # summary (trigger-maintained, see app/inventory/models/stock_summary.py)
+
+    @staticmethod
+    def _summary_filters(
+        stmt: Select,
+        location_id: uuid.UUID,
+        product_id: Optional[uuid.UUID],
+        low_stock: bool,
+    ) -> Select:
+        stmt = stmt.where(StockSummary.location_id == location_id)
+        if product_id:
+            stmt = stmt.where(StockSummary.product_id == product_id)
+        if low_stock:
+            stmt = stmt.where(StockSummary.low_stock.is_(True))
+        return stmt
+
+    async def get_stock_summary(
+        self,
+        location_id: uuid.UUID,
+        product_id: Optional[uuid.UUID] = None,
+        low_stock: bool = False,
+    ) -> list[StockSummary]:
+        stmt = self._summary_filters(
+            select(StockSummary), location_id, product_id, low_stock
+        ).order_by(StockSummary.sku)
+        result = await self.db.execute(stmt)
+        return list(result.scalars().all())
+
+    async def get_stock_summary_version(
+        self,
+        location_id: uuid.UUID,
+        product_id: Optional[uuid.UUID] = None,
+        low_stock: bool = False,
+    ) -> tuple[int, int]:
+        """(rows, sum of their versions): changes whenever a matching row is written, added or removed."""
+        stmt = self._summary_filters(
+            select(func.count(), func.coalesce(func.sum(StockSummary.version), 0)),
+            location_id,
+            product_id,
+            low_stock,
+        )
+        result = await self.db.execute(stmt)
+        rows, version = result.one()
+        return rows, int(version)
+
+    async def get_low_stocks(self, stock_ids: Iterable[uuid.UUID]) -> list[InventoryStock]:
+        """The given rows still at or below their reorder point, with product and location."""
+        stock_ids = list(stock_ids)
+        if not stock_ids:
+            return []
+        stmt = (
+            select(InventoryStock)
+            .where(
+                InventoryStock.id.in_(stock_ids),
+                InventoryStock.quantity - InventoryStock.reserved_quantity
+                <= InventoryStock.reorder_point,
+            )
+            .options(
+                selectinload(InventoryStock.product), selectinload(InventoryStock.location)
+            )
+            .order_by(InventoryStock.location_id, InventoryStock.product_id)
+            .execution_options(populate_existing=True)
+        )
+        result = await self.db.execute(stmt)
+        return list(result.scalars().all())
+
     async def get_available_stock(self, stock_id: uuid.UUID) -> int | None:
         stmt = select(InventoryStock.quantity - InventoryStock.reserved_quantity).where(
             InventoryStock.id == stock_id
@@ -1,5 +1,5 @@
 """
-GET    /inventory/products                             - list
+GET    /inventory/products                             - list (keyset pages, filters)
 GET    /inventory/products/{id}                        - get a product
 POST   /inventory/products                             - create product
 PATCH  /inventory/products/{id}                        - update a product
@@ -16,8 +16,10 @@ POST   /inventory/stock/new                            - create stock
 POST   /inventory/stock/in                             - add stock
 POST   /inventory/stock/out                            - remove stock
 POST   /inventory/stock/adjust                         - adjust stock
+POST   /inventory/stock/import                         - bulk in/out/adjust (NDJSON or CSV body)
 GET    /inventory/stock/movements                      - list stock movements
 GET    /inventory/stock?product_id                      - get current stock levels
+GET    /inventory/stock/summary?product_id&low_stock   - dashboard summary (ETag / 304)
 
 (stock endpoints operate on the current branch, resolved from the
  X-Location-Id header via get_current_location)
@@ -28,15 +30,24 @@ GET    /inventory/locations/{id}                       - get location
 PATCH  /inventory/locations/{id}                       - update location
 DELETE /inventory/locations/{id}                       - delete location
 
+(the GET list endpoints stream their items for `?stream=true` or
+ `Accept: application/x-ndjson`, see app/core/streaming.py)
 """
 import logging
 import uuid
 from typing import Optional
 
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Query, Request, status
 
-from app.auth.dependencies import get_current_user
-from app.inventory.dependencies import get_current_location, provide_inventory_service
+from app.auth.dependencies import get_current_principal
+from app.auth.principal import Principal
+from app.core.conditional import ConditionalGet, conditional_get
+from app.core.streaming import stream_format, streaming_response
+from app.inventory.dependencies import (
+    get_current_location,
+    provide_inventory_reader,
+    provide_inventory_service,
+)
 from app.inventory.models.location import Location
 from app.inventory.schemas import (
     AddProductToCategory,
@@ -48,19 +59,21 @@ from app.inventory.schemas import (
     LocationUpdate,
     ProductCreate,
     ProductListItemResponse,
+    ProductListResponse,
     ProductResponse,
     ProductUpdate,
     RemoveProducFromCategory,
+    StockImportReport,
     StockInitialize,
     StockListResponse,
     StockMovementListResponse,
     StockMovementResponse,
     StockResponse,
+    StockSummaryListResponse,
     StockTransaction,
 )
 from app.inventory.service import InventoryService
 from app.rbac.dependencies import require_permission
-from app.users.model import User
 
 logger = logging.getLogger(__name__)
 
@@ -74,13 +87,44 @@ router = APIRouter(
 
 @router.get(
     "/products",
-    response_model=list[ProductListItemResponse],
+    response_model=ProductListResponse,
     dependencies=[Depends(require_permission("product:view"))],
 )
 async def list_products(
-    service: InventoryService = Depends(provide_inventory_service),
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, max_length=200),
+    is_active: Optional[bool] = Query(None),
+    category_id: Optional[uuid.UUID] = Query(None),
+    sku_prefix: Optional[str] = Query(None, min_length=1, max_length=100),
+    q: Optional[str] = Query(None, min_length=1, max_length=255),
+    media_type: Optional[str] = Depends(stream_format),
+    service: InventoryService = Depends(provide_inventory_reader),
 ):
-    return await service.list_products()
+    if media_type is not None:
+        # an export: every match from the cursor on, limit does not apply
+        logger.info("list_products endpoint streaming", extra={"media_type": media_type})
+        partitions = await service.stream_products(
+            cursor=cursor,
+            is_active=is_active,
+            category_id=category_id,
+            sku_prefix=sku_prefix,
+            search=q,
+        )
+        return streaming_response(partitions, ProductListItemResponse, media_type)
+
+    products, next_cursor = await service.list_products(
+        limit=limit,
+        cursor=cursor,
+        is_active=is_active,
+        category_id=category_id,
+        sku_prefix=sku_prefix,
+        search=q,
+    )
+    return ProductListResponse(items=products, next_cursor=next_cursor)
+
+
+# catalogue data changes rarely: clients may reuse a copy for a minute
+PRODUCT_CACHE_CONTROL = "private, max-age=60"
 
 
 @router.get(
@@ -90,9 +134,13 @@ async def list_products(
 )
 async def get_product(
     id: uuid.UUID,
+    conditional: ConditionalGet = Depends(conditional_get(PRODUCT_CACHE_CONTROL)),
     service: InventoryService = Depends(provide_inventory_service),
 ):
-    return await service.get_product(id)
+    product = await service.get_product(id)
+    if cached := conditional.check(product.id, product.updated_at):
+        return cached
+    return product
 
 
 @router.post(
@@ -271,7 +319,7 @@ async def create_stock(
 )
 async def add_stock(
     payload: StockTransaction,
-    current_user: User = Depends(get_current_user),
+    principal: Principal = Depends(get_current_principal),
     location: Location = Depends(get_current_location),
     service: InventoryService = Depends(provide_inventory_service),
 ):
@@ -279,13 +327,13 @@ async def add_stock(
         "product_id": payload.product_id,
         "location_id": location.id,
         "quantity": payload.quantity,
-        "user_id": current_user.id,
+        "user_id": principal.id,
     })
     result = await service.add_stock(
         product_id=payload.product_id,
         location_id=location.id,
         quantity=payload.quantity,
-        user_id=current_user.id,
+        user_id=principal.id,
     )
     logger.info("add_stock endpoint succeeded", extra={"movement_id": result.id})
     return result
@@ -298,7 +346,7 @@ async def add_stock(
 )
 async def remove_stock(
     payload: StockTransaction,
-    current_user: User = Depends(get_current_user),
+    principal: Principal = Depends(get_current_principal),
     location: Location = Depends(get_current_location),
     service: InventoryService = Depends(provide_inventory_service),
 ):
@@ -306,13 +354,13 @@ async def remove_stock(
         "product_id": payload.product_id,
         "location_id": location.id,
         "quantity": payload.quantity,
-        "user_id": current_user.id,
+        "user_id": principal.id,
     })
     result = await service.remove_stock(
         product_id=payload.product_id,
         location_id=location.id,
         quantity=payload.quantity,
-        user_id=current_user.id,
+        user_id=principal.id,
     )
     logger.info("remove_stock endpoint succeeded", extra={"movement_id": result.id})
     return result
@@ -325,7 +373,7 @@ async def remove_stock(
 )
 async def adjust_stock(
     payload: StockTransaction,
-    current_user: User = Depends(get_current_user),
+    principal: Principal = Depends(get_current_principal),
     location: Location = Depends(get_current_location),
     service: InventoryService = Depends(provide_inventory_service),
 ):
@@ -333,18 +381,46 @@ async def adjust_stock(
         "product_id": payload.product_id,
         "location_id": location.id,
         "quantity": payload.quantity,
-        "user_id": current_user.id,
+        "user_id": principal.id,
     })
     result = await service.adjust_stock(
         product_id=payload.product_id,
         location_id=location.id,
         quantity=payload.quantity,
-        user_id=current_user.id,
+        user_id=principal.id,
     )
     logger.info("adjust_stock endpoint succeeded", extra={"movement_id": result.id})
     return result
 
 
+@router.post(
+    "/import",
+    response_model=StockImportReport,
+    dependencies=[Depends(require_permission("stock:import"))],
+)
+async def import_stock(
+    request: Request,
+    principal: Principal = Depends(get_current_principal),
+    location: Location = Depends(get_current_location),
+    service: InventoryService = Depends(provide_inventory_service),
+):
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    logger.info("import_stock endpoint called", extra={
+        "content_type": content_type,
+        "location_id": location.id,
+        "user_id": principal.id,
+    })
+    # the body is consumed as it arrives, never buffered whole
+    result = await service.import_stock_movements(
+        body=request.stream(),
+        content_type=content_type,
+        location_id=location.id,
+        user_id=principal.id,
+    )
+    logger.info("import_stock endpoint succeeded", extra={"applied": result.applied, "failed": result.failed})
+    return result
+
+
 @router.get(
     "/movements",
     response_model=StockMovementListResponse,
@@ -371,12 +447,19 @@ async def list_movements(
 async def get_stock_levels(
     product_id: Optional[uuid.UUID] = Query(None),
     location: Location = Depends(get_current_location),
-    service: InventoryService = Depends(provide_inventory_service),
+    media_type: Optional[str] = Depends(stream_format),
+    service: InventoryService = Depends(provide_inventory_reader),
 ):
     logger.info("get_stock_levels endpoint called", extra={
         "location_id": location.id,
         "product_id": product_id,
     })
+    if media_type is not None:
+        partitions = await service.stream_stock_levels(
+            location_id=location.id, product_id=product_id
+        )
+        return streaming_response(partitions, StockResponse, media_type)
+
     stocks = await service.get_stock_levels(
         location_id=location.id, product_id=product_id
     )
@@ -385,18 +468,62 @@ async def get_stock_levels(
     return StockListResponse(items=list(stocks), total=len(stocks))
 
 
+# dashboards poll this: revalidate on every request, answered with a 304
+# from one aggregate over the summary index while nothing changed
+STOCK_SUMMARY_CACHE_CONTROL = "private, no-cache"
+
+
+@router.get(
+    "/stock/summary",
+    response_model=StockSummaryListResponse,
+    dependencies=[Depends(require_permission("stock:view"))],
+)
+async def get_stock_summary(
+    product_id: Optional[uuid.UUID] = Query(None),
+    low_stock: bool = Query(False),
+    location: Location = Depends(get_current_location),
+    conditional: ConditionalGet = Depends(conditional_get(STOCK_SUMMARY_CACHE_CONTROL)),
+    service: InventoryService = Depends(provide_inventory_reader),
+):
+    rows, version = await service.get_stock_summary_version(
+        location_id=location.id, product_id=product_id, low_stock=low_stock
+    )
+    if cached := conditional.check(location.id, product_id, low_stock, rows, version):
+        return cached
+
+    items = await service.get_stock_summary(
+        location_id=location.id, product_id=product_id, low_stock=low_stock
+    )
+
+    logger.info("get_stock_summary endpoint succeeded", extra={"total": len(items)})
+    return StockSummaryListResponse(items=items, total=len(items))
+
+
 # location
 
 
+LOCATION_CACHE_CONTROL = "private, max-age=60"
+
+
 @router.get(
     "/locations",
     response_model=LocationListResponse,
     dependencies=[Depends(require_permission("location:list"))],
 )
 async def get_location_list(
-    service: InventoryService = Depends(provide_inventory_service),
+    media_type: Optional[str] = Depends(stream_format),
+    conditional: ConditionalGet = Depends(conditional_get(LOCATION_CACHE_CONTROL)),
+    service: InventoryService = Depends(provide_inventory_reader),
 ):
     logger.info("get_location_list endpoint called")
+    if media_type is not None:
+        partitions = await service.stream_location_list()
+        return streaming_response(partitions, LocationResponse, media_type)
+
+    total, last_updated = await service.get_location_list_version()
+    if cached := conditional.check(total, last_updated):
+        return cached
+
     locations = await service.get_location_list()
 
     logger.info("get_location_list endpoint succeeded", extra={"total": len(locations)})
@@ -74,6 +74,11 @@ class ProductListItemResponse(ORMModel):
     updated_at: datetime
 
 
+class ProductListResponse(ORMModel):
+    items: List[ProductListItemResponse]
+    next_cursor: str | None = None
+
+
 class ProductResponse(ORMModel):
     id: uuid.UUID
     name: str
@@ -110,6 +115,25 @@ class StockResponse(ORMModel):
     updated_at: datetime
 
 
+class StockSummaryResponse(ORMModel):
+    stock_id: uuid.UUID
+    location_id: uuid.UUID
+    product_id: uuid.UUID
+    sku: str
+    name: str
+    quantity: int
+    reserved_quantity: int
+    available: int
+    reorder_point: int
+    low_stock: bool
+    updated_at: datetime
+
+
+class StockSummaryListResponse(ORMModel):
+    items: List[StockSummaryResponse]
+    total: int
+
+
 class StockMovementListResponse(ORMModel):
     items: List[StockMovementResponse]
     total: int
@@ -130,3 +154,20 @@ class LocationListResponse(ORMModel):
 class StockListResponse(ORMModel):
     items: List[StockResponse]
     total: int
+
+
+class StockImportLineResult(ORMModel):
+    line: int
+    ok: bool
+    stock_id: uuid.UUID | None = None
+    movement_type: StockMovementType | None = None
+    new_quantity: int | None = None
+    error_code: str | None = None
+    message: str | None = None
+
+
+class StockImportReport(ORMModel):
+    total: int
+    applied: int
+    failed: int
+    results: List[StockImportLineResult]
@@ -2,6 +2,7 @@
 PRODUCT:
   get_product()
   list_products()
+  stream_products()
   create_product()
   update_product()
   activate_product()
@@ -20,30 +21,54 @@ STOCK:
   adjust_stock()
   list_stock_movements()
   get_stock_levels()
+  stream_stock_levels()
+  get_stock_summary()
+  get_stock_summary_version()
+  import_stock_movements()
 
 LOCATION:
   get_location_list()
+  stream_location_list()
+  get_location_list_version()
   get_location()
   create_location()
   update_location()
   delete_location()
 
-RESERVATION:
+(stock decreases and reservations enqueue low-stock alerts, see alerts.py)
+
+RESERVATION (locking and retries go through ReservationCoordinator):
   reserve_for_item()
+  reserve_for_items()
   release_for_item()
+  release_for_items()
   fulfill_for_item()
+  fulfill_for_items()
 
 """
+import asyncio
+import base64
+import binascii
+import json
 import logging
+import random
 import uuid
-from typing import Optional
+from collections import defaultdict
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable, Sequence
+from datetime import datetime, timedelta, timezone
+from typing import NamedTuple, Optional, TypeVar
+
+from sqlalchemy.exc import DBAPIError
 
+from app.core.config import settings
+from app.inventory.alerts import LowStockDetector
 from app.inventory.exceptions import (
     CategoryAlreadyExists,
     CategoryDescriptionIsRequired,
     CategoryNameIsRequired,
     CategoryNotFound,
     InsufficientStock,
+    InvalidCursor,
     InvalidLocation,
     InvalidProductOrLocation,
     InvalidQuantityStock,
@@ -61,20 +86,151 @@ from app.inventory.exceptions import (
     ReservationNotFound,
     SKUIsRequired,
     StockAlreadyExists,
+    StockLocked,
     StockNegative,
     StockNotFound,
 )
+from app.inventory.importer import StockImporter, iter_rows
 from app.inventory.models.enums import ReservationStatus, StockMovementType
+from app.inventory.models.location import Location
+from app.inventory.models.product import Product
 from app.inventory.models.reservation import StockReservation
-from app.inventory.models.stock import InventoryStock, StockMovement
+from app.inventory.models.stock import InventoryStock
+from app.inventory.models.stock_summary import StockSummary
 from app.inventory.repositories.category_repo import CategoryRepository
 from app.inventory.repositories.location_repo import LocationRepository
 from app.inventory.repositories.product_repo import ProductRepository
 from app.inventory.repositories.reservation_repo import ReservationRepository
-from app.inventory.repositories.stock_repo import StockRepository
+from app.inventory.repositories.stock_repo import AppliedMovement, StockRepository
+from app.inventory.schemas import StockImportReport
+from app.outbox.repository import OutboxRepository
 
 logger = logging.getLogger(__name__)
 
+
+class ReservationLine(NamedTuple):
+    order_item_id: uuid.UUID
+    product_id: uuid.UUID
+    quantity: int
+
+
+T = TypeVar("T")
+
+# postgres errors that mean "lost a race", not "bad request"
+_RETRYABLE_SQLSTATES = {
+    "40001",  # serialization_failure
+    "40P01",  # deadlock_detected
+    "55P03",  # lock_not_available (NOWAIT)
+}
+
+
+# products listing cursor: opaque to clients, (created_at, id) of the
+# previous page's last row
+
+
+def _encode_cursor(product: Product) -> str:
+    raw = json.dumps([product.created_at.isoformat(), str(product.id)])
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    try:
+        created_at, product_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        after = datetime.fromisoformat(created_at), uuid.UUID(product_id)
+    except (binascii.Error, UnicodeError, ValueError, TypeError):
+        raise InvalidCursor()
+    if after[0].tzinfo is None:
+        raise InvalidCursor()
+    return after
+
+
+def _sqlstate(exc: DBAPIError) -> str | None:
+    orig = exc.orig
+    return getattr(orig, "sqlstate", None) or getattr(
+        getattr(orig, "__cause__", None), "sqlstate", None
+    )
+
+
+class ReservationCoordinator:
+    """
+    Owns the inventory_stock row locks taken by reservations.
+
+    - rows are always locked in stock id order, so two confirmations (or a
+      confirmation and a cancel) touching the same SKUs queue up instead of
+      deadlocking
+    - RESERVATION_LOCK_MODE "nowait" / "skip_locked" turn a busy row into a
+      quick retry instead of a blocked connection
+    - every attempt runs in a SAVEPOINT; deadlock, serialization and lock
+      errors roll back only that attempt and retry with jittered exponential
+      backoff, then surface as StockLocked (409) instead of a 500
+    """
+
+    def __init__(
+        self,
+        stock_repo: StockRepository,
+        lock_mode: str | None = None,
+        max_attempts: int | None = None,
+        base_delay: float | None = None,
+        max_delay: float | None = None,
+    ):
+        self.stock_repo = stock_repo
+        self.lock_mode = lock_mode or settings.RESERVATION_LOCK_MODE
+        self.max_attempts = max(1, max_attempts or settings.RESERVATION_MAX_ATTEMPTS)
+        self.base_delay = (
+            base_delay if base_delay is not None else settings.RESERVATION_RETRY_BASE_MS / 1000
+        )
+        self.max_delay = (
+            max_delay if max_delay is not None else settings.RESERVATION_RETRY_MAX_MS / 1000
+        )
+
+    async def lock_stocks(
+        self, keys: Iterable[tuple[uuid.UUID, uuid.UUID]]
+    ) -> list[InventoryStock]:
+        keys = list(keys)
+        stocks = await self.stock_repo.get_stocks_for_update(keys, self.lock_mode)
+        # a skipped row looks like a missing one; only a real gap is StockNotFound
+        if self.lock_mode == "skip_locked" and len(stocks) < len(keys):
+            if await self.stock_repo.count_stocks(keys) > len(stocks):
+                raise StockLocked()
+        return stocks
+
+    async def lock_stocks_by_ids(
+        self, stock_ids: Iterable[uuid.UUID]
+    ) -> list[InventoryStock]:
+        stock_ids = list(stock_ids)
+        stocks = await self.stock_repo.get_stocks_by_ids_for_update(stock_ids, self.lock_mode)
+        # ids come from reservations, so the rows exist
+        if self.lock_mode == "skip_locked" and len(stocks) < len(stock_ids):
+            raise StockLocked()
+        return stocks
+
+    async def run(self, operation: str, attempt: Callable[[], Awaitable[T]]) -> T:
+        db = self.stock_repo.db
+        for attempt_no in range(1, self.max_attempts + 1):
+            try:
+                async with db.begin_nested():
+                    return await attempt()
+            except (StockLocked, DBAPIError) as exc:
+                if isinstance(exc, DBAPIError) and _sqlstate(exc) not in _RETRYABLE_SQLSTATES:
+                    raise
+                if attempt_no == self.max_attempts:
+                    logger.warning(
+                        "%s: stock still contended, giving up", operation,
+                        extra={"attempts": attempt_no},
+                    )
+                    raise StockLocked() from exc
+
+                delay = min(self.max_delay, self.base_delay * 2 ** (attempt_no - 1))
+                delay = random.uniform(delay / 2, delay)
+                logger.warning(
+                    "%s: stock contended, retrying", operation,
+                    extra={"attempt": attempt_no, "retry_in": round(delay, 3)},
+                )
+                await asyncio.sleep(delay)
+
+        raise StockLocked()  # unreachable, keeps type checkers happy
+
+
 class InventoryService:
     def __init__(
         self,
@@ -83,12 +239,16 @@ class InventoryService:
         category_repo: CategoryRepository,
         location_repo: LocationRepository,
         reservation_repo: ReservationRepository,
+        coordinator: ReservationCoordinator | None = None,
+        low_stock: LowStockDetector | None = None,
     ):
         self.stock_repo = stock_repo
         self.product_repo = product_repo
         self.category_repo = category_repo
         self.location_repo = location_repo
         self.reservation_repo = reservation_repo
+        self.coordinator = coordinator or ReservationCoordinator(stock_repo)
+        self.low_stock = low_stock or LowStockDetector(OutboxRepository(stock_repo.db))
 
     # product
 
@@ -99,9 +259,52 @@ class InventoryService:
             raise ProductNotFound()
         return result
 
-    async def list_products(self):
-        result = await self.product_repo.list_products()
-        return result
+    async def list_products(
+        self,
+        limit: int,
+        cursor: str | None = None,
+        is_active: bool | None = None,
+        category_id: uuid.UUID | None = None,
+        sku_prefix: str | None = None,
+        search: str | None = None,
+    ) -> tuple[list[Product], str | None]:
+        """One page of products, newest first, and the cursor of the next one."""
+        after = _decode_cursor(cursor) if cursor else None
+
+        # normalize like create_product does
+        sku_prefix = sku_prefix.strip().upper() if sku_prefix else None
+        search = search.strip() if search else None
+
+        # one extra row tells whether another page exists
+        products = await self.product_repo.list_products(
+            limit=limit + 1,
+            after=after,
+            is_active=is_active,
+            category_id=category_id,
+            sku_prefix=sku_prefix,
+            search=search,
+        )
+        if len(products) <= limit:
+            return products, None
+        products = products[:limit]
+        return products, _encode_cursor(products[-1])
+
+    async def stream_products(
+        self,
+        cursor: str | None = None,
+        is_active: bool | None = None,
+        category_id: uuid.UUID | None = None,
+        sku_prefix: str | None = None,
+        search: str | None = None,
+    ) -> AsyncIterator[Sequence[Product]]:
+        """Every product from the cursor on, same order and filters as list_products."""
+        return await self.product_repo.stream_products(
+            after=_decode_cursor(cursor) if cursor else None,
+            is_active=is_active,
+            category_id=category_id,
+            sku_prefix=sku_prefix.strip().upper() if sku_prefix else None,
+            search=search.strip() if search else None,
+        )
 
     async def create_product(self, name: str, sku: str, category_id: uuid.UUID):
         if not name or not name.strip():
@@ -283,32 +486,21 @@ class InventoryService:
             logger.warning("add_stock: 0 or negative quantity", extra={"quantity": quantity})
             raise InvalidQuantityStock()
 
-        stock = await self.stock_repo.get_stock_by_location_and_product_for_update(
-            product_id, location_id
+        applied = await self.stock_repo.apply_movement(
+            product_id,
+            location_id,
+            StockMovementType.IN,
+            user_id,
+            delta=quantity,
         )
-        if not stock:
+        if not applied:
             logger.warning("add_stock: invalid product or location", extra={"product_id": product_id, "location_id": location_id})
             raise InvalidProductOrLocation()
-
-        previous_quantity = stock.quantity
-
-        stock.quantity += quantity
-        new_quantity = stock.quantity
-
-        movement = StockMovement(
-            stock_id=stock.id,
-            movement_type=StockMovementType.IN,
-            quantity=quantity,
-            previous_quantity=previous_quantity,
-            new_quantity=new_quantity,
-            created_by=user_id,
-        )
-        await self.stock_repo.update_quantity_stock(stock)
-        await self.stock_repo.create_movement(movement)
+        movement = applied.movement
 
         logger.info(
             "add_stock: movement created",
-            extra={"stock_id": stock.id, "quantity": quantity, "new_quantity": new_quantity, "user_id": user_id},
+            extra={"stock_id": movement.stock_id, "quantity": quantity, "new_quantity": movement.new_quantity, "user_id": user_id},
         )
         return movement
 
@@ -317,73 +509,99 @@ class InventoryService:
             logger.warning("remove_stock: 0 or negative quantity", extra={"quantity": quantity})
             raise InvalidQuantityStock()
 
-        stock = await self.stock_repo.get_stock_by_location_and_product_for_update(
-            product_id, location_id
+        applied = await self.stock_repo.apply_movement(
+            product_id,
+            location_id,
+            StockMovementType.OUT,
+            user_id,
+            delta=-quantity,
         )
-        if not stock:
-            logger.warning("remove_stock: invalid product or location", extra={"product_id": product_id, "location_id": location_id})
-            raise InvalidProductOrLocation()
+        if not applied:
+            # the statement refused the change; only now is it worth a lookup
+            stock = await self.stock_repo.get_stock_by_location_and_product(
+                product_id, location_id
+            )
+            if not stock:
+                logger.warning("remove_stock: invalid product or location", extra={"product_id": product_id, "location_id": location_id})
+                raise InvalidProductOrLocation()
 
-        if stock.quantity < quantity:
             logger.warning("remove_stock: quantity exceeds available stock", extra={"stock_id": stock.id, "quantity": quantity, "available": stock.quantity})
             raise StockNegative()
 
-        previous_quantity = stock.quantity
-
-        stock.quantity -= quantity
-        new_quantity = stock.quantity
-
-        movement = StockMovement(
-            stock_id=stock.id,
-            movement_type=StockMovementType.OUT,
-            quantity=quantity,
-            previous_quantity=previous_quantity,
-            new_quantity=new_quantity,
-            created_by=user_id,
-        )
-        await self.stock_repo.update_quantity_stock(stock)
-        await self.stock_repo.create_movement(movement)
-
+        movement = applied.movement
+        await self._check_low_stock(product_id, location_id, applied)
         logger.info(
             "remove_stock: movement created",
-            extra={"stock_id": stock.id, "quantity": quantity, "new_quantity": new_quantity, "user_id": user_id},
+            extra={"stock_id": movement.stock_id, "quantity": quantity, "new_quantity": movement.new_quantity, "user_id": user_id},
         )
         return movement
 
     async def adjust_stock(self, product_id, location_id, quantity, user_id):
-        stock = await self.stock_repo.get_stock_by_location_and_product_for_update(
-            product_id, location_id
-        )
-        if not stock:
-            logger.warning("adjust_stock: invalid product or location", extra={"product_id": product_id, "location_id": location_id})
-            raise InvalidProductOrLocation()
-
         if quantity < 0:
             logger.warning("adjust_stock: negative quantity", extra={"quantity": quantity})
             raise StockNegative()
 
-        previous_quantity = stock.quantity
-        stock.quantity = quantity
-        new_quantity = stock.quantity
-
-        movement = StockMovement(
-            stock_id=stock.id,
-            movement_type=StockMovementType.ADJUST,
-            quantity=abs(new_quantity - previous_quantity),  # store the difference
-            previous_quantity=previous_quantity,
-            new_quantity=new_quantity,
-            created_by=user_id,
+        applied = await self.stock_repo.apply_movement(
+            product_id,
+            location_id,
+            StockMovementType.ADJUST,
+            user_id,
+            absolute=quantity,
         )
+        if not applied:
+            logger.warning("adjust_stock: invalid product or location", extra={"product_id": product_id, "location_id": location_id})
+            raise InvalidProductOrLocation()
 
-        await self.stock_repo.update_quantity_stock(stock)
-        await self.stock_repo.create_movement(movement)
-
+        movement = applied.movement
+        if movement.new_quantity < movement.previous_quantity:
+            await self._check_low_stock(product_id, location_id, applied)
         logger.info(
             "adjust_stock: movement created",
-            extra={"stock_id": stock.id, "previous_quantity": previous_quantity, "new_quantity": new_quantity, "user_id": user_id},
+            extra={"stock_id": movement.stock_id, "previous_quantity": movement.previous_quantity, "new_quantity": movement.new_quantity, "user_id": user_id},
         )
         return movement
 
+    async def _check_low_stock(
+        self, product_id: uuid.UUID, location_id: uuid.UUID, applied: AppliedMovement
+    ) -> None:
+        # the row as apply_movement left it, from its RETURNING; never added
+        # to the session
+        movement = applied.movement
+        stock = InventoryStock(
+            id=movement.stock_id,
+            product_id=product_id,
+            location_id=location_id,
+            quantity=movement.new_quantity,
+            reserved_quantity=applied.reserved_quantity,
+            reorder_point=applied.reorder_point,
+        )
+        await self.low_stock.check(
+            stock, movement.previous_quantity - applied.reserved_quantity
+        )
+
+    async def import_stock_movements(
+        self,
+        body: AsyncIterator[bytes],
+        content_type: str,
+        location_id: uuid.UUID,
+        user_id: uuid.UUID,
+    ) -> StockImportReport:
+        rows = iter_rows(body, content_type)
+        importer = StockImporter(
+            stock_repo=self.stock_repo,
+            product_repo=self.product_repo,
+            location_id=location_id,
+            user_id=user_id,
+            low_stock=self.low_stock,
+        )
+        report = await importer.run(rows)
+
+        logger.info(
+            "import_stock_movements: import finished",
+            extra={"location_id": location_id, "total": report.total, "applied": report.applied, "failed": report.failed, "user_id": user_id},
+        )
+        return report
+
     async def list_stock_movements(self, stock_id: uuid.UUID, location_id: uuid.UUID, limit: int = 100):
         stock = await self.stock_repo.get_stock(stock_id)
         if not stock:
@@ -410,12 +628,47 @@ class InventoryService:
             location_id=location_id, product_id=product_id
         )
 
+    async def stream_stock_levels(
+        self,
+        location_id: Optional[uuid.UUID] = None,
+        product_id: Optional[uuid.UUID] = None,
+    ) -> AsyncIterator[Sequence[InventoryStock]]:
+        return await self.stock_repo.stream_stock_levels(
+            location_id=location_id, product_id=product_id
+        )
+
+    async def get_stock_summary(
+        self,
+        location_id: uuid.UUID,
+        product_id: Optional[uuid.UUID] = None,
+        low_stock: bool = False,
+    ) -> list[StockSummary]:
+        return await self.stock_repo.get_stock_summary(
+            location_id=location_id, product_id=product_id, low_stock=low_stock
+        )
+
+    async def get_stock_summary_version(
+        self,
+        location_id: uuid.UUID,
+        product_id: Optional[uuid.UUID] = None,
+        low_stock: bool = False,
+    ) -> tuple[int, int]:
+        return await self.stock_repo.get_stock_summary_version(
+            location_id=location_id, product_id=product_id, low_stock=low_stock
+        )
+
     # location
 
     async def get_location_list(self):
         result = await self.location_repo.list_locations()
         return result
 
+    async def stream_location_list(self) -> AsyncIterator[Sequence[Location]]:
+        return await self.location_repo.stream_locations()
+
+    async def get_location_list_version(self) -> tuple[int, datetime | None]:
+        return await self.location_repo.get_locations_version()
+
     async def get_location(self, location_id: uuid.UUID):
         location = await self.location_repo.get_location(location_id)
         if location is None:
@@ -509,81 +762,145 @@ class InventoryService:
         location_id: uuid.UUID,
         quantity: int,
     ) -> StockReservation:
-        if quantity <= 0:
-            logger.warning("reserve_for_item: 0 or negative quantity", extra={"quantity": quantity})
-            raise InvalidQuantityStock()
-
-        stock = await self.stock_repo.get_stock_by_location_and_product_for_update(
-            product_id=product_id,
+        reservations = await self.reserve_for_items(
+            [ReservationLine(order_item_id, product_id, quantity)],
             location_id=location_id,
         )
-        if not stock:
-            logger.warning("reserve_for_item: stock not found", extra={"product_id": product_id, "location_id": location_id})
-            raise StockNotFound()
-
-        available = stock.quantity - stock.reserved_quantity
-        if available < quantity:
-            logger.warning(
-                "reserve_for_item: insufficient stock",
-                extra={"product_id": product_id, "available": available, "requested": quantity},
-            )
-            raise InsufficientStock()
-
-        stock.reserved_quantity += quantity
-        reservation = await self.reservation_repo.create_reservation(
-            order_item_id=order_item_id,
-            stock_id=stock.id,
-            quantity=quantity,
+        return reservations[0]
+
+    async def reserve_for_items(
+        self, lines: Sequence[ReservationLine], location_id: uuid.UUID
+    ) -> list[StockReservation]:
+        """
+        Reserve every line at one location with a fixed number of statements:
+        one locking SELECT for all stock rows, one INSERT for the reservations
+        and the reserved_quantity UPDATEs on flush. All or nothing.
+        """
+        for line in lines:
+            if line.quantity <= 0:
+                logger.warning("reserve_for_items: 0 or negative quantity", extra={"order_item_id": line.order_item_id, "quantity": line.quantity})
+                raise InvalidQuantityStock()
+
+        requested: dict[uuid.UUID, int] = defaultdict(int)
+        for line in lines:
+            requested[line.product_id] += line.quantity
+
+        reservations = await self.coordinator.run(
+            "reserve_for_items",
+            lambda: self._reserve_locked(lines, requested, location_id),
         )
         logger.info(
-            "reserve_for_item: reservation created",
-            extra={"reservation_id": reservation.id, "stock_id": stock.id, "quantity": quantity},
+            "reserve_for_items: reservations created",
+            extra={"location_id": location_id, "lines": len(reservations)},
         )
-        return reservation
+        return reservations
 
-    async def release_for_item(self, reservation_id: uuid.UUID) -> StockReservation:
-        reservation = await self.stock_repo.get_reservation_by_id(reservation_id)
-        if not reservation:
-            logger.warning("release_for_item: reservation not found", extra={"reservation_id": reservation_id})
-            raise ReservationNotFound()
-
-        if reservation.status != ReservationStatus.RESERVED:
-            logger.warning("release_for_item: invalid reservation status", extra={"reservation_id": reservation_id, "status": reservation.status})
-            raise InvalidReservationStatus()
-
-        stock = await self.stock_repo.get_stock_by_id_for_update(
-            reservation.stock_id
+    async def _reserve_locked(
+        self,
+        lines: Sequence[ReservationLine],
+        requested: dict[uuid.UUID, int],
+        location_id: uuid.UUID,
+    ) -> list[StockReservation]:
+        stocks = await self.coordinator.lock_stocks(
+            [(product_id, location_id) for product_id in requested]
+        )
+        stock_by_product = {stock.product_id: stock for stock in stocks}
+
+        for product_id, quantity in requested.items():
+            stock = stock_by_product.get(product_id)
+            if not stock:
+                logger.warning("reserve_for_items: stock not found", extra={"product_id": product_id, "location_id": location_id})
+                raise StockNotFound()
+
+            available = stock.quantity - stock.reserved_quantity
+            if available < quantity:
+                logger.warning(
+                    "reserve_for_items: insufficient stock",
+                    extra={"product_id": product_id, "available": available, "requested": quantity},
+                )
+                raise InsufficientStock()
+
+        changes = []
+        for product_id, quantity in requested.items():
+            stock = stock_by_product[product_id]
+            changes.append((stock, stock.quantity - stock.reserved_quantity))
+            stock.reserved_quantity += quantity
+        # inside the attempt's savepoint: a retried attempt leaves no event behind
+        await self.low_stock.check_many(changes)
+
+        expires_at = datetime.now(timezone.utc) + timedelta(
+            minutes=settings.RESERVATION_TTL_MINUTES
+        )
+        return await self.reservation_repo.create_reservations(
+            (
+                (line.order_item_id, stock_by_product[line.product_id].id, line.quantity)
+                for line in lines
+            ),
+            expires_at=expires_at,
         )
-        if not stock:
-            logger.warning("release_for_item: stock not found", extra={"reservation_id": reservation.id, "stock_id": reservation.stock_id})
-            raise StockNotFound()
-
-        stock.reserved_quantity -= reservation.quantity
-        reservation.status = ReservationStatus.RELEASED
 
-        logger.info("release_for_item: reservation released", extra={"reservation_id": reservation.id, "stock_id": stock.id})
-        return reservation
+    async def release_for_item(self, reservation_id: uuid.UUID) -> StockReservation:
+        reservations = await self.release_for_items([reservation_id])
+        return reservations[0]
+
+    async def release_for_items(
+        self, reservation_ids: Sequence[uuid.UUID]
+    ) -> list[StockReservation]:
+        """Drop the holds: reserved_quantity goes down, quantity is untouched."""
+        reservations = await self.coordinator.run(
+            "release_for_items",
+            lambda: self._settle_locked(reservation_ids, ReservationStatus.RELEASED),
+        )
+        logger.info("release_for_items: reservations released", extra={"reservations": len(reservations)})
+        return reservations
 
     async def fulfill_for_item(self, reservation_id: uuid.UUID) -> StockReservation:
-        reservation = await self.stock_repo.get_reservation_by_id(reservation_id)
-        if not reservation:
-            logger.warning("fulfill_for_item: reservation not found", extra={"reservation_id": reservation_id})
-            raise ReservationNotFound()
-
-        if reservation.status != ReservationStatus.RESERVED:
-            logger.warning("fulfill_for_item: invalid reservation status", extra={"reservation_id": reservation_id, "status": reservation.status})
-            raise InvalidReservationStatus()
-
-        stock = await self.stock_repo.get_stock_by_id_for_update(
-            reservation.stock_id
+        reservations = await self.fulfill_for_items([reservation_id])
+        return reservations[0]
+
+    async def fulfill_for_items(
+        self, reservation_ids: Sequence[uuid.UUID]
+    ) -> list[StockReservation]:
+        """Turn the holds into real outflows: both quantities go down."""
+        reservations = await self.coordinator.run(
+            "fulfill_for_items",
+            lambda: self._settle_locked(reservation_ids, ReservationStatus.FULFILLED),
         )
-        if not stock:
-            logger.warning("fulfill_for_item: stock not found", extra={"reservation_id": reservation.id, "stock_id": reservation.stock_id})
-            raise StockNotFound()
-
-        stock.quantity -= reservation.quantity
-        stock.reserved_quantity -= reservation.quantity
-        reservation.status = ReservationStatus.FULFILLED
-
-        logger.info("fulfill_for_item: reservation fulfilled", extra={"reservation_id": reservation.id, "stock_id": stock.id})
-        return reservation
+        logger.info("fulfill_for_items: reservations fulfilled", extra={"reservations": len(reservations)})
+        return reservations
+
+    async def _settle_locked(
+        self, reservation_ids: Sequence[uuid.UUID], status: ReservationStatus
+    ) -> list[StockReservation]:
+        reservations = await self.stock_repo.get_reservations_by_ids(reservation_ids)
+        stock_ids = {reservation.stock_id for reservation in reservations}
+        stocks = await self.coordinator.lock_stocks_by_ids(stock_ids)
+
+        # status only changes under the stock lock, so re-read it now that we hold it
+        reservations = await self.stock_repo.get_reservations_by_ids(reservation_ids)
+        reservation_by_id = {reservation.id: reservation for reservation in reservations}
+        stock_by_id = {stock.id: stock for stock in stocks}
+
+        for reservation_id in reservation_ids:
+            reservation = reservation_by_id.get(reservation_id)
+            if not reservation:
+                logger.warning("settle_reservations: reservation not found", extra={"reservation_id": reservation_id})
+                raise ReservationNotFound()
+
+            if reservation.status != ReservationStatus.RESERVED:
+                logger.warning("settle_reservations: invalid reservation status", extra={"reservation_id": reservation_id, "status": reservation.status})
+                raise InvalidReservationStatus()
+
+            if reservation.stock_id not in stock_by_id:
+                logger.warning("settle_reservations: stock not found", extra={"reservation_id": reservation_id, "stock_id": reservation.stock_id})
+                raise StockNotFound()
+
+        for reservation_id in reservation_ids:
+            reservation = reservation_by_id[reservation_id]
+            stock = stock_by_id[reservation.stock_id]
+            if status == ReservationStatus.FULFILLED:
+                stock.quantity -= reservation.quantity
+            stock.reserved_quantity -= reservation.quantity
+            reservation.status = status
+
+        return [reservation_by_id[reservation_id] for reservation_id in reservation_ids]
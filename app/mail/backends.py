@@ -0,0 +1,145 @@
+"""
+mail transports. Mailer renders messages; a backend delivers them.
+
+- SESBackend: one boto3 SES client per process (thread-safe, keeps its
+  HTTPS connections alive) driven from a dedicated, bounded thread pool, so
+  slow SES calls can't starve the event loop's default executor
+- FileBackend: writes each message as JSON into a directory (local dev)
+- MemoryBackend: keeps messages in a list (tests)
+
+MAIL_BACKEND picks one for the process, see `build_backend()`.
+"""
+
+import asyncio
+import json
+import logging
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Protocol
+
+import boto3
+from botocore.config import Config
+from botocore.exceptions import BotoCoreError, ClientError
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class MailerError(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class MailMessage:
+    to: list[str]
+    subject: str
+    body_text: str
+    body_html: str
+
+
+class MailBackend(Protocol):
+    async def send(self, message: MailMessage) -> None: ...
+
+    def close(self) -> None: ...
+
+
+class SESBackend:
+    def __init__(self, sender: str, region: str, max_workers: int):
+        self.sender = sender
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="ses"
+        )
+        # Credentials resolve through boto3's default chain, which on
+        # ECS/Fargate is the task's IAM role. One pooled connection per
+        # executor thread.
+        self.client = boto3.client(
+            "ses",
+            region_name=region,
+            config=Config(max_pool_connections=max_workers),
+        )
+
+    async def send(self, message: MailMessage) -> None:
+        request = {
+            "Source": self.sender,
+            "Destination": {
+                "ToAddresses": message.to,
+            },
+            "Message": {
+                "Subject": {
+                    "Data": message.subject,
+                    "Charset": "UTF-8",
+                },
+                "Body": {
+                    "Text": {
+                        "Data": message.body_text,
+                        "Charset": "UTF-8",
+                    },
+                    "Html": {
+                        "Data": message.body_html,
+                        "Charset": "UTF-8",
+                    },
+                },
+            },
+        }
+
+        try:
+            await asyncio.get_running_loop().run_in_executor(
+                self._executor,
+                lambda: self.client.send_email(**request),
+            )
+        except ClientError as e:
+            error_code = e.response["Error"]["Code"]
+            logger.error(
+                "SES send_email failed",
+                extra={
+                    "to": message.to,
+                    "error_code": error_code,
+                },
+            )
+            raise MailerError("Failed to send email") from e
+        except BotoCoreError as e:
+            logger.error("SES send_email failed", extra={"to": message.to})
+            raise MailerError("Failed to send email") from e
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class FileBackend:
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    async def send(self, message: MailMessage) -> None:
+        path = self.directory / f"{uuid.uuid7()}.json"
+        await asyncio.to_thread(path.write_text, json.dumps(asdict(message), indent=2))
+        logger.info("mail written to file", extra={"path": str(path)})
+
+    def close(self) -> None:
+        pass
+
+
+class MemoryBackend:
+    def __init__(self):
+        self.sent: list[MailMessage] = []
+
+    async def send(self, message: MailMessage) -> None:
+        self.sent.append(message)
+
+    def close(self) -> None:
+        pass
+
+
+def build_backend() -> MailBackend:
+    if settings.MAIL_BACKEND == "file":
+        return FileBackend(settings.MAIL_FILE_DIR)
+    if settings.MAIL_BACKEND == "memory":
+        return MemoryBackend()
+    return SESBackend(
+        sender=settings.SENDER_EMAIL,
+        region=settings.AWS_REGION,
+        max_workers=settings.MAIL_EXECUTOR_WORKERS,
+    )
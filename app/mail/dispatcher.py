@@ -0,0 +1,200 @@
+"""
+background mail delivery: drains the "mail" outbox topic through Mailer.
+
+every run leases up to MAIL_DISPATCH_BATCH_SIZE due messages for
+MAIL_DISPATCH_LEASE_SECONDS (SKIP LOCKED, so any number of dispatchers can
+run side by side) in a short transaction, sends them outside it, then deletes
+the sent ones and reschedules the failed ones in a second short transaction.
+no row lock or pool connection is held while SES is called.
+
+sends run with at most MAIL_DISPATCH_CONCURRENCY SES calls in flight per
+dispatcher, and every send first takes a token from the "mail:ses" bucket in
+rate_limit_buckets, so MAIL_SEND_RATE caps all dispatchers together. a failed
+message is retried with jittered exponential backoff and, after
+MAIL_MAX_ATTEMPTS, moved to the "mail.dead" topic for inspection, with its
+reset token redacted. sent messages are deleted, so no live token outlives
+its delivery in the outbox.
+
+delivery is at-least-once: a message whose lease runs out before its outcome
+is recorded (the dispatcher stopped mid-batch) is sent again.
+
+runs in the app lifespan (MAIL_DISPATCHER_ENABLED) or on its own:
+
+    python -m app.mail.dispatcher
+"""
+
+import asyncio
+import logging
+import random
+from collections.abc import Callable
+from contextlib import AbstractAsyncContextManager
+from datetime import timedelta
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.database.session import get_script_session, shutdown
+from app.mail.mailer import Mailer, close_mailer, get_mailer
+from app.mail.queue import MAIL, MAIL_METHODS, redact
+from app.observability.logging import setup_logging
+from app.outbox.model import OutboxEvent
+from app.outbox.repository import OutboxRepository
+from app.ratelimit.limiter import PostgresRateLimitStore, RateLimit, RateLimitStore
+
+logger = logging.getLogger(__name__)
+
+
+class _Pacer:
+    """
+    Takes a token from the shared "mail:ses" bucket before every send, and
+    waits for the refill when it is empty. The bucket holds one second of
+    sends, so an idle dispatcher may start with a short burst.
+    """
+
+    KEY = "ses"
+
+    def __init__(self, rate: float, store: RateLimitStore):
+        self.limit = RateLimit("mail", max(1, int(rate)), rate * 60) if rate > 0 else None
+        self.store = store
+
+    async def wait(self) -> None:
+        if self.limit is None:
+            return
+        key = f"{self.limit.name}:{self.KEY}"
+        while (delay := await self.store.take(key, self.limit)) > 0:
+            await asyncio.sleep(delay)
+
+
+class MailDispatcher:
+    def __init__(
+        self,
+        mailer_factory: Callable[[], Mailer] = get_mailer,
+        session_factory: Callable[
+            [], AbstractAsyncContextManager[AsyncSession]
+        ] = get_script_session,
+        interval: float | None = None,
+        batch_size: int | None = None,
+        concurrency: int | None = None,
+        rate: float | None = None,
+        rate_store: RateLimitStore | None = None,
+        max_attempts: int | None = None,
+        lease: float | None = None,
+    ):
+        self.mailer_factory = mailer_factory
+        self.session_factory = session_factory
+        self.interval = interval or settings.MAIL_DISPATCH_INTERVAL_SECONDS
+        self.batch_size = batch_size or settings.MAIL_DISPATCH_BATCH_SIZE
+        self.max_attempts = max(1, max_attempts or settings.MAIL_MAX_ATTEMPTS)
+        self._semaphore = asyncio.Semaphore(concurrency or settings.MAIL_DISPATCH_CONCURRENCY)
+        self.lease = timedelta(seconds=lease or settings.MAIL_DISPATCH_LEASE_SECONDS)
+        self._pacer = _Pacer(
+            rate if rate is not None else settings.MAIL_SEND_RATE,
+            rate_store or PostgresRateLimitStore(session_factory),
+        )
+        self._mailer: Mailer | None = None
+        self._task: asyncio.Task | None = None
+
+    @property
+    def mailer(self) -> Mailer:
+        if self._mailer is None:
+            self._mailer = self.mailer_factory()
+        return self._mailer
+
+    async def run_once(self) -> int:
+        """Send one batch; returns how many messages it handled."""
+        async with self.session_factory() as session:
+            events = await OutboxRepository(session).lease(MAIL, self.batch_size, self.lease)
+        if not events:
+            return 0
+
+        errors = await asyncio.gather(*(self._deliver(event) for event in events))
+
+        async with self.session_factory() as session:
+            outbox = OutboxRepository(session)
+            await outbox.complete(
+                event.id for event, error in zip(events, errors) if error is None
+            )
+            for event, error in zip(events, errors):
+                if error is None:
+                    continue
+                if event.attempts + 1 >= self.max_attempts:
+                    logger.error(
+                        "mail dispatch: giving up",
+                        extra={"event_id": str(event.id), "attempts": event.attempts + 1},
+                    )
+                    await outbox.dead_letter([event.id], error, payload=redact(event.payload))
+                else:
+                    await outbox.retry_later([event.id], self._backoff(event.attempts), error)
+
+        failed = sum(1 for error in errors if error is not None)
+        logger.info(
+            "mail dispatch: batch handled",
+            extra={"sent": len(events) - failed, "failed": failed},
+        )
+        return len(events)
+
+    async def _deliver(self, event: OutboxEvent) -> str | None:
+        """Returns None once sent, else the error to record."""
+        method = event.payload.get("method")
+        if method not in MAIL_METHODS:
+            return f"unknown mail method {method!r}"
+
+        async with self._semaphore:
+            await self._pacer.wait()
+            try:
+                await getattr(self.mailer, method)(**event.payload.get("kwargs", {}))
+            except Exception as exc:
+                logger.warning(
+                    "mail dispatch: send failed",
+                    extra={"event_id": str(event.id), "method": method, "attempt": event.attempts + 1},
+                )
+                return repr(exc)
+        return None
+
+    def _backoff(self, attempts: int) -> timedelta:
+        delay = min(
+            settings.MAIL_RETRY_MAX_SECONDS,
+            settings.MAIL_RETRY_BASE_SECONDS * 2**attempts,
+        )
+        return timedelta(seconds=random.uniform(delay / 2, delay))
+
+    async def run_forever(self) -> None:
+        while True:
+            try:
+                # drain the backlog, then wait for the next tick
+                while await self.run_once() >= self.batch_size:
+                    pass
+            except Exception:
+                logger.exception("mail dispatch: batch failed")
+            await asyncio.sleep(self.interval)
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self.run_forever())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+
+mail_dispatcher = MailDispatcher()
+
+
+async def main() -> None:
+    setup_logging()
+    logger.info("mail dispatcher started")
+    try:
+        await mail_dispatcher.run_forever()
+    finally:
+        close_mailer()
+        await shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
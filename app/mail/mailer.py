@@ -1,28 +1,24 @@
-import asyncio
 import logging
-
-import boto3
-from botocore.exceptions import ClientError
+import time
+from collections.abc import Sequence
+from html import escape
 
 from app.core.config import settings
+from app.mail.backends import (
+    MailBackend,
+    MailerError,  # noqa: F401  (raised by the backends)
+    MailMessage,
+    build_backend,
+)
+from app.observability.metrics import MAIL_SEND_DURATION
 
 logger = logging.getLogger(__name__)
 
 
-class MailerError(Exception):
-    pass
-
-
 class Mailer:
-    def __init__(self):
-        self.sender = settings.SENDER_EMAIL
+    def __init__(self, backend: MailBackend | None = None):
         self.base_url = settings.APP_BASE_URL
-        # Credentials resolve through boto3's default chain, which on
-        # ECS/Fargate is the task's IAM role.
-        self.ses_client = boto3.client(
-            "ses",
-            region_name=settings.AWS_REGION,
-        )
+        self.backend = backend or build_backend()
 
     async def send_reset_email(self, email: str, token: str) -> None:
         reset_link = f"{self.base_url}/reset-password?token={token}"
@@ -71,53 +67,110 @@ class Mailer:
             subject=subject,
             body_text=body_text,
             body_html=body_html,
+            template="password_reset",
         )
 
         logger.info("reset email sent", extra={"email": email})
 
+    async def send_low_stock_digest(
+        self, to: Sequence[str], location_name: str, items: Sequence[dict]
+    ) -> None:
+        """One email per location; items carry sku, name, available, reorder_point."""
+        subject = f"Low stock at {location_name}: {len(items)} product(s)"
+
+        lines = "\n".join(
+            f"- {item['sku']} {item['name']}: {item['available']} available "
+            f"(reorder point {item['reorder_point']})"
+            for item in items
+        )
+        body_text = (
+            f"The following products are at or below their reorder point at {location_name}:\n\n"
+            f"{lines}\n"
+        )
+
+        rows = "".join(
+            f"""
+                    <tr>
+                        <td style="padding: 4px 12px 4px 0;">{escape(item['sku'])}</td>
+                        <td style="padding: 4px 12px 4px 0;">{escape(item['name'])}</td>
+                        <td style="padding: 4px 12px 4px 0; text-align: right;">{item['available']}</td>
+                        <td style="padding: 4px 0; text-align: right;">{item['reorder_point']}</td>
+                    </tr>"""
+            for item in items
+        )
+        body_html = f"""
+        <html>
+            <body style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
+                <h2>Low stock at {escape(location_name)}</h2>
+                <p>The following products are at or below their reorder point.</p>
+                <table style="border-collapse: collapse; font-size: 14px;">
+                    <tr style="text-align: left; color: #555;">
+                        <th style="padding: 4px 12px 4px 0;">SKU</th>
+                        <th style="padding: 4px 12px 4px 0;">Product</th>
+                        <th style="padding: 4px 12px 4px 0;">Available</th>
+                        <th style="padding: 4px 0;">Reorder point</th>
+                    </tr>{rows}
+                </table>
+            </body>
+        </html>
+        """
+
+        await self._send(
+            to=to,
+            subject=subject,
+            body_text=body_text,
+            body_html=body_html,
+            template="low_stock_digest",
+        )
+
+        logger.info(
+            "low stock digest sent",
+            extra={"location_name": location_name, "items": len(items)},
+        )
+
     async def _send(
         self,
-        to: str,
+        to: str | Sequence[str],
         subject: str,
         body_text: str,
         body_html: str,
+        template: str,
     ) -> None:
-        message = {
-            "Source": self.sender,
-            "Destination": {
-                "ToAddresses": [to],
-            },
-            "Message": {
-                "Subject": {
-                    "Data": subject,
-                    "Charset": "UTF-8",
-                },
-                "Body": {
-                    "Text": {
-                        "Data": body_text,
-                        "Charset": "UTF-8",
-                    },
-                    "Html": {
-                        "Data": body_html,
-                        "Charset": "UTF-8",
-                    },
-                },
-            },
-        }
-
+        outcome = "failed"
+        started = time.perf_counter()
         try:
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(
-                None,
-                lambda: self.ses_client.send_email(**message),
+            await self.backend.send(
+                MailMessage(
+                    to=[to] if isinstance(to, str) else list(to),
+                    subject=subject,
+                    body_text=body_text,
+                    body_html=body_html,
+                )
             )
-        except ClientError as e:
-            error_code = e.response["Error"]["Code"]
-            logger.error(
-                "SES send_email failed",
-                extra={
-                    "to": to,
-                    "error_code": error_code,
-                },
+            outcome = "sent"
+        finally:
+            MAIL_SEND_DURATION.labels(template, outcome).observe(
+                time.perf_counter() - started
             )
-            raise MailerError("Failed to send email") from e
\ No newline at end of file
+
+    def close(self) -> None:
+        self.backend.close()
+
+
+_mailer: Mailer | None = None
+
+
+def get_mailer() -> Mailer:
+    """The process-wide mailer: its backend (and SES client) is built once."""
+    global _mailer
+    if _mailer is None:
+        _mailer = Mailer()
+    return _mailer
+
+
+def close_mailer() -> None:
+    """Release the backend's threads on shutdown."""
+    global _mailer
+    if _mailer is not None:
+        _mailer.close()
+        _mailer = None
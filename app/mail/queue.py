@@ -0,0 +1,56 @@
+"""
+request-side mail API: queue a message in the caller's transaction.
+
+MailQueue mirrors Mailer's send methods, but each call only writes an outbox
+event (topic "mail") with the method name and its arguments. The message
+exists once the request commits and is sent later by MailDispatcher, so SES
+latency and outages never reach the request.
+"""
+
+from collections.abc import Sequence
+
+from app.outbox.repository import OutboxRepository
+
+MAIL = "mail"  # key: first recipient
+
+# Mailer methods the dispatcher may call
+MAIL_METHODS = frozenset({"send_reset_email", "send_low_stock_digest"})
+
+# arguments that are credentials (a live reset token): needed to send, but
+# never kept on a dead-lettered message
+SECRET_KWARGS = frozenset({"token"})
+
+
+def redact(payload: dict) -> dict:
+    kwargs = payload.get("kwargs", {})
+    return {
+        **payload,
+        "kwargs": {
+            name: "[redacted]" if name in SECRET_KWARGS else value
+            for name, value in kwargs.items()
+        },
+    }
+
+
+class MailQueue:
+    def __init__(self, outbox_repo: OutboxRepository):
+        self.outbox_repo = outbox_repo
+
+    async def send_reset_email(self, email: str, token: str) -> None:
+        await self._enqueue("send_reset_email", email, email=email, token=token)
+
+    async def send_low_stock_digest(
+        self, to: Sequence[str], location_name: str, items: Sequence[dict]
+    ) -> None:
+        await self._enqueue(
+            "send_low_stock_digest",
+            to[0] if to else None,
+            to=list(to),
+            location_name=location_name,
+            items=list(items),
+        )
+
+    async def _enqueue(self, method: str, recipient: str | None, **kwargs) -> None:
+        await self.outbox_repo.enqueue(
+            MAIL, {"method": method, "kwargs": kwargs}, key=recipient
+        )
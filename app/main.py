@@ -1,40 +1,89 @@
 import logging
+import math
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
+from uvicorn.middleware.proxy_headers import ProxyHeadersMiddleware
 
 from app.auth.routers import router as auth_router
 from app.core.config import settings
 from app.core.global_errors import AppError
+from app.core.security.passwords import password_hashing
+from app.database.invalidation import invalidation_bus
+from app.database.session import shutdown
+from app.inventory.alerts import low_stock_alert_worker
 from app.inventory.router import router as inventory_router
+from app.mail.dispatcher import mail_dispatcher
+from app.mail.mailer import close_mailer
+from app.maintenance.cleanup import cleanup_job
 from app.observability.health import router as health_router
 from app.observability.logging import setup_logging
+from app.observability.metrics import (
+    MetricsMiddleware,
+    instrument_engines,
+    router as metrics_router,
+)
 from app.observability.request_id import RequestIdMiddleware
+from app.orders.expiry import reservation_sweeper
 from app.orders.router import router as order_router
+from app.ratelimit.limiter import RateLimitExceeded
 from app.rbac.routers import router as rbac_router
 from app.users.router import router as users_router
 
 setup_logging()
 logger = logging.getLogger(__name__)
 
+if settings.METRICS_ENABLED:
+    instrument_engines()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.CACHE_INVALIDATION_ENABLED:
+        await invalidation_bus.start()
+    if settings.LOW_STOCK_ALERT_RECIPIENTS:
+        await low_stock_alert_worker.start()
+    if settings.MAIL_DISPATCHER_ENABLED:
+        await mail_dispatcher.start()
+    if settings.RESERVATION_SWEEPER_ENABLED:
+        await reservation_sweeper.start()
+    if settings.MAINTENANCE_ENABLED:
+        await cleanup_job.start()
+    yield
+    await cleanup_job.stop()
+    await reservation_sweeper.stop()
+    await mail_dispatcher.stop()
+    close_mailer()
+    password_hashing.close()
+    await low_stock_alert_worker.stop()
+    await invalidation_bus.stop()
+    await shutdown()
+
 
 app = FastAPI(
     title=settings.APP_NAME,
+    lifespan=lifespan,
 # The documentation is shown in production intentionally
 #   docs_url=None if settings.ENV == "prod" else "/docs",
 #   redoc_url=None if settings.ENV == "prod" else "/redoc",
 #   openapi_url=None if settings.ENV == "prod" else "/openapi.json",
 )
 
-# middleware
-app.add_middleware(RequestIdMiddleware)
+# middleware (the last one added is the outermost)
+# client address and scheme from trusted proxies' X-Forwarded-* headers
+app.add_middleware(ProxyHeadersMiddleware, trusted_hosts=settings.FORWARDED_ALLOW_IPS)
 app.add_middleware(CORSMiddleware,
     allow_origins=settings.CORS_ALLOW_ORIGINS,
     allow_credentials=settings.CORS_ALLOW_CREDENTIALS,
     allow_methods=settings.CORS_ALLOW_METHODS,
     allow_headers=settings.CORS_ALLOW_HEADERS,
 )
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+# outermost: CORS preflights and metrics scrapes get an id and an access line too
+app.add_middleware(RequestIdMiddleware)
 
 # Exception handlers
 @app.exception_handler(AppError)
@@ -44,6 +93,14 @@ async def app_error_handler(request: Request, exc: AppError):
         content={"error_code": exc.error_code, "detail": exc.message}
     )
 
+@app.exception_handler(RateLimitExceeded)
+async def rate_limit_handler(request: Request, exc: RateLimitExceeded):
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={"error_code": exc.error_code, "detail": exc.message},
+        headers={"Retry-After": str(max(1, math.ceil(exc.retry_after)))},
+    )
+
 @app.exception_handler(Exception)
 async def unhandled_exception_handler(request: Request, exc: Exception):
     logger.exception("Unhandled error on %s %s", request.method, request.url.path)
@@ -54,6 +111,8 @@ async def unhandled_exception_handler(request: Request, exc: Exception):
 
 # Routers
 app.include_router(health_router)
+if settings.METRICS_ENABLED:
+    app.include_router(metrics_router)
 app.include_router(users_router)
 app.include_router(auth_router)
 app.include_router(rbac_router)
@@ -0,0 +1,9 @@
+"""
+database housekeeping.
+
+tables that only ever get rows flagged (revoked refresh tokens, used reset
+tokens) or that key short-lived state (rate limit buckets) grow without
+bound, and so do the indexes probed on every refresh. the cleanup job
+deletes what no query can match any more, in small batches, and reports what
+it reclaimed.
+"""
@@ -0,0 +1,219 @@
+"""
+deletes dead rows in bounded batches.
+
+each batch is one statement in its own transaction:
+
+    DELETE FROM <table> WHERE ctid = ANY(ARRAY(
+        SELECT ctid FROM <table> WHERE <dead> LIMIT :n FOR UPDATE SKIP LOCKED))
+
+so a batch holds at most n row locks for one short transaction, visits the
+rows by physical address (a TID scan, no second index lookup), and never
+waits on a row a request is using. concurrent runs (every worker, or the CLI
+next to them) skip each other's rows. autovacuum then makes the space
+reusable; indexes stop growing with history and track live sessions.
+
+runs in the app lifespan (MAINTENANCE_ENABLED) or on its own:
+
+    python -m app.maintenance.cleanup
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Callable
+from contextlib import AbstractAsyncContextManager
+from dataclasses import dataclass
+from datetime import timedelta
+
+from sqlalchemy import (
+    Table,
+    and_,
+    any_,
+    cast,
+    delete,
+    exists,
+    func,
+    literal_column,
+    or_,
+    select,
+)
+from sqlalchemy.dialects.postgresql import REGCLASS
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.auth.model import PasswordResetToken, RefreshToken
+from app.core.config import settings
+from app.database.session import get_script_session, shutdown
+from app.observability.logging import setup_logging
+from app.ratelimit.model import RateLimitBucket
+
+logger = logging.getLogger(__name__)
+
+# far longer than any bucket takes to refill, after which a row is the same
+# as no row
+RATE_LIMIT_BUCKET_IDLE = timedelta(days=1)
+
+
+def _dead_refresh_tokens() -> ColumnElement[bool]:
+    # revoked tokens of a family that still has a live token are kept: they
+    # are what reuse detection recognises when a stolen token is replayed
+    live = aliased(RefreshToken)
+    family_alive = exists().where(
+        live.family_id == RefreshToken.family_id,
+        live.is_revoked.is_(False),
+        live.expires_at > func.now(),
+    )
+    return or_(
+        RefreshToken.expires_at <= func.now(),
+        and_(RefreshToken.is_revoked.is_(True), ~family_alive),
+    )
+
+
+def _dead_reset_tokens() -> ColumnElement[bool]:
+    return or_(
+        PasswordResetToken.used.is_(True),
+        PasswordResetToken.expires_at <= func.now(),
+    )
+
+
+def _idle_rate_limit_buckets() -> ColumnElement[bool]:
+    return RateLimitBucket.updated_at < func.now() - RATE_LIMIT_BUCKET_IDLE
+
+
+@dataclass(frozen=True)
+class CleanupTask:
+    table: Table
+    dead: Callable[[], ColumnElement[bool]]
+
+
+TASKS = (
+    CleanupTask(RefreshToken.__table__, _dead_refresh_tokens),
+    CleanupTask(PasswordResetToken.__table__, _dead_reset_tokens),
+    CleanupTask(RateLimitBucket.__table__, _idle_rate_limit_buckets),
+)
+
+
+@dataclass
+class CleanupResult:
+    table: str
+    deleted: int = 0
+    batches: int = 0
+    seconds: float = 0.0
+    index_bytes: int | None = None
+
+
+class CleanupJob:
+    def __init__(
+        self,
+        session_factory: Callable[
+            [], AbstractAsyncContextManager[AsyncSession]
+        ] = get_script_session,
+        batch_size: int | None = None,
+        max_batches: int | None = None,
+        interval: float | None = None,
+        tasks: tuple[CleanupTask, ...] = TASKS,
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size or settings.MAINTENANCE_BATCH_SIZE
+        # per table and run, so one huge backlog can't hold a worker for long
+        self.max_batches = max_batches or settings.MAINTENANCE_MAX_BATCHES
+        self.interval = interval or settings.MAINTENANCE_INTERVAL_SECONDS
+        self.tasks = tasks
+        self._task: asyncio.Task | None = None
+
+    async def run_once(self) -> list[CleanupResult]:
+        results = [await self._purge(task) for task in self.tasks]
+        logger.info(
+            "cleanup finished",
+            extra={"reclaimed": {r.table: r.deleted for r in results}},
+        )
+        return results
+
+    async def _purge(self, task: CleanupTask) -> CleanupResult:
+        result = CleanupResult(task.table.name)
+        started = time.monotonic()
+        while result.batches < self.max_batches:
+            async with self.session_factory() as session:
+                deleted = await self._delete_batch(session, task)
+            result.batches += 1
+            result.deleted += deleted
+            if deleted < self.batch_size:
+                break
+        result.seconds = round(time.monotonic() - started, 3)
+
+        async with self.session_factory() as session:
+            result.index_bytes = await session.scalar(
+                select(func.pg_indexes_size(cast(task.table.name, REGCLASS)))
+            )
+        logger.info(
+            "cleanup: table purged",
+            extra={
+                "table": result.table,
+                "deleted": result.deleted,
+                "batches": result.batches,
+                "seconds": result.seconds,
+                "index_bytes": result.index_bytes,
+            },
+        )
+        return result
+
+    async def _delete_batch(self, session: AsyncSession, task: CleanupTask) -> int:
+        ctid = literal_column("ctid")
+        batch = (
+            select(ctid)
+            .select_from(task.table)
+            .where(task.dead())
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+            # its own scan of the table, not correlated to the DELETE's row
+            .correlate(None)
+        )
+        stmt = delete(task.table).where(ctid == any_(func.array(batch.scalar_subquery())))
+        result = await session.execute(stmt)
+        return result.rowcount
+
+    async def _run_forever(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except Exception:
+                logger.exception("cleanup job: run failed")
+            await asyncio.sleep(self.interval)
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run_forever())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+
+cleanup_job = CleanupJob()
+
+
+async def main() -> None:
+    setup_logging()
+    try:
+        for result in await cleanup_job.run_once():
+            logger.info(
+                "%s: deleted %d rows in %d batch(es), %ss; indexes now %s bytes",
+                result.table,
+                result.deleted,
+                result.batches,
+                result.seconds,
+                result.index_bytes,
+            )
+    finally:
+        await shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
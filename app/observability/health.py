@@ -1,4 +1,6 @@
-from app.database.session import get_session
+from app.core.config import settings
+from app.core.security.passwords import password_hashing
+from app.database.session import engine, get_session, pool_metrics, pool_sizing
 from fastapi import APIRouter, Depends, status
 from fastapi.responses import JSONResponse
 from sqlalchemy import text
@@ -13,7 +15,7 @@ async def health() -> dict[str, str]:
 
 
 @router.get("/health/ready", include_in_schema=False)
-async def ready(session: AsyncSession = Depends(get_session)) -> JSONResponse:
+async def ready(session: AsyncSession = Depends(get_session, scope="function")) -> JSONResponse:
     """verifies the database connection is usable."""
     try:
         await session.execute(text("SELECT 1"))
@@ -23,3 +25,19 @@ async def ready(session: AsyncSession = Depends(get_session)) -> JSONResponse:
             content={"status": "unavailable", "database": "down"},
         )
     return JSONResponse(content={"status": "ok", "database": "up"})
+
+
+@router.get("/health/password-hashing", include_in_schema=False)
+async def password_hashing_stats() -> dict[str, float | int]:
+    """Argon2 pool load in this worker: queue depth and wait time."""
+    return password_hashing.stats()
+
+
+@router.get("/health/pool", include_in_schema=False)
+async def pool_stats() -> dict:
+    """database pool of this worker: sizes, usage and checkout latency."""
+    return {
+        **pool_metrics.snapshot(engine.sync_engine.pool),
+        "adaptive": settings.DB_POOL_ADAPTIVE,
+        "worker_limit": pool_sizing.worker_limit,
+    }
@@ -43,7 +43,9 @@ def setup_logging() -> None:
         },
         "loggers": {
             "uvicorn": {"propagate": True},
-            "uvicorn.access": {"propagate": True},
+            # app.access (RequestIdMiddleware) logs each request once, with
+            # its id, status and duration
+            "uvicorn.access": {"level": "WARNING", "propagate": True},
             "uvicorn.error": {"propagate": True},
             "sqlalchemy.engine": {
                 "level": "WARNING",
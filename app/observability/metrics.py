@@ -0,0 +1,181 @@
+"""
+Prometheus metrics, served in the text format at GET /metrics.
+
+- http_request_duration_seconds{method, route, status}: route is the path
+  template ("/orders/{order_id}"), so ids do not multiply the series
+- http_requests_in_progress{method}
+- http_request_db_queries / http_request_db_seconds{method, route}: statements
+  a request ran and their total time, from the `before/after_cursor_execute`
+  engine events
+- db_query_duration_seconds: every statement, background jobs included
+- password_hash_duration_seconds{operation}, password_hash_wait_seconds:
+  Argon2 work and the queue in front of its threads
+- mail_send_duration_seconds{template, outcome}
+
+gunicorn runs several worker processes, each counting on its own. when
+PROMETHEUS_MULTIPROC_DIR is set (the image sets it), prometheus_client keeps
+the values in mmap'd files in that directory, and /metrics, whichever worker
+answers, aggregates the files of all of them. the directory is emptied before
+the workers start (docker/entrypoint.sh), and the gunicorn child_exit hook
+(docker/gunicorn.conf.py) drops a dead worker's in-progress gauge.
+"""
+
+import os
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from fastapi import APIRouter, Response
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency, until the last body chunk is sent",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "HTTP requests being served",
+    ["method"],
+    # summed over the live workers only
+    multiprocess_mode="livesum",
+)
+REQUEST_DB_QUERIES = Histogram(
+    "http_request_db_queries",
+    "SQL statements run by one HTTP request",
+    ["method", "route"],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100),
+)
+REQUEST_DB_SECONDS = Histogram(
+    "http_request_db_seconds",
+    "Time one HTTP request spent running SQL statements",
+    ["method", "route"],
+    buckets=LATENCY_BUCKETS,
+)
+DB_QUERY_DURATION = Histogram(
+    "db_query_duration_seconds",
+    "SQL statement latency",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5),
+)
+PASSWORD_HASH_DURATION = Histogram(
+    "password_hash_duration_seconds",
+    "Argon2 work per call, on the hashing threads",
+    ["operation"],
+    buckets=(0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 1),
+)
+PASSWORD_HASH_WAIT = Histogram(
+    "password_hash_wait_seconds",
+    "Time a password hash waited for a free hashing thread",
+    buckets=LATENCY_BUCKETS,
+)
+MAIL_SEND_DURATION = Histogram(
+    "mail_send_duration_seconds",
+    "Mail backend send latency",
+    ["template", "outcome"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+
+# not found and method-not-allowed responses share one series
+UNMATCHED_ROUTE = "unmatched"
+
+
+@dataclass
+class RequestDbStats:
+    queries: int = 0
+    seconds: float = 0.0
+
+
+# set by MetricsMiddleware; SQLAlchemy runs the cursor events in a greenlet
+# that shares the calling task's context, so they see it
+_request_db: ContextVar[RequestDbStats | None] = ContextVar("request_db", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._metrics_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context._metrics_started
+    DB_QUERY_DURATION.observe(elapsed)
+    stats = _request_db.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.seconds += elapsed
+
+
+def instrument_engines() -> None:
+    """Time statements on every engine (the async engines' sync_engine too)."""
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _route_template(scope: Scope) -> str:
+    # the router stores the matched route in the (shared) scope
+    route = scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    """Pure ASGI: times the whole response, streamed bodies included."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        stats = RequestDbStats()
+        token = _request_db.set(stats)
+        in_progress = REQUESTS_IN_PROGRESS.labels(method)
+        in_progress.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            in_progress.dec()
+            _request_db.reset(token)
+            route = _route_template(scope)
+            REQUEST_DURATION.labels(method, route, str(status_code)).observe(elapsed)
+            REQUEST_DB_QUERIES.labels(method, route).observe(stats.queries)
+            REQUEST_DB_SECONDS.labels(method, route).observe(stats.seconds)
+
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", include_in_schema=False)
+def metrics() -> Response:
+    # a plain def: reading the workers' files is blocking IO
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
@@ -1,13 +1,19 @@
 import logging
+import re
+import time
 import uuid
 from contextvars import ContextVar
 
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 request_id_var: ContextVar[str] = ContextVar("request_id", default="no-request")
 
-logger = logging.getLogger(__name__)
+# one line per request, replacing the server's access log
+access_logger = logging.getLogger("app.access")
+
+REQUEST_ID_HEADER = b"x-request-id"
+# an incoming id is echoed into logs and headers: keep it short and printable
+_VALID_REQUEST_ID = re.compile(r"[A-Za-z0-9._:-]{1,128}")
 
 
 class RequestIdFilter(logging.Filter):
@@ -18,27 +24,61 @@ class RequestIdFilter(logging.Filter):
         return True
 
 
-class RequestIdMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        request_id = str(uuid.uuid4())
-        request_id_var.set(request_id)
+def _incoming_request_id(scope: Scope) -> str | None:
+    for name, value in scope["headers"]:
+        if name == REQUEST_ID_HEADER:
+            request_id = value.decode("latin-1")
+            if _VALID_REQUEST_ID.fullmatch(request_id):
+                return request_id
+            return None
+    return None
+
+
+class RequestIdMiddleware:
+    """
+    Pure ASGI: tags the request with an id (the caller's X-Request-ID when it
+    sent a valid one, else a new uuid4), returns it in X-Request-ID, and logs
+    one access line with the status and duration once the response is sent.
+    Unlike BaseHTTPMiddleware it adds no task or stream per request, so
+    streamed bodies and background tasks pass straight through.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
 
-        logger.info(
-            "Request started",
-            extra={
-                "method": request.method,
-                "path": request.url.path,
-            }
-        )
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-        response = await call_next(request)
-        response.headers["X-Request-ID"] = request_id
+        request_id = _incoming_request_id(scope) or str(uuid.uuid4())
+        header = (REQUEST_ID_HEADER, request_id.encode("latin-1"))
+        status_code = 500
 
-        logger.info(
-            "Request finished",
-            extra={
-                "status_code": response.status_code,
-            }
-        )
+        async def send_with_request_id(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message["headers"] = [*message.get("headers", ()), header]
+            await send(message)
 
-        return response
\ No newline at end of file
+        token = request_id_var.set(request_id)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            duration_ms = round((time.perf_counter() - started) * 1000, 2)
+            access_logger.info(
+                "%s %s %s %.2fms",
+                scope["method"],
+                scope["path"],
+                status_code,
+                duration_ms,
+                extra={
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "status_code": status_code,
+                    "duration_ms": duration_ms,
+                },
+            )
+            request_id_var.reset(token)
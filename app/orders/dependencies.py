@@ -1,15 +1,18 @@
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database.session import get_session
-from app.inventory.dependencies import provide_inventory_service
+from app.database.session import get_read_session, get_session
+from app.inventory.dependencies import (
+    provide_inventory_reader,
+    provide_inventory_service,
+)
 from app.inventory.service import InventoryService
 from app.orders.repository import OrderRepository
 from app.orders.service import OrderService
 
 
 def get_order_service(
-    db: AsyncSession = Depends(get_session),
+    db: AsyncSession = Depends(get_session, scope="function"),
     inventory_service: InventoryService = Depends(provide_inventory_service),
 ) -> OrderService:
     return OrderService(
@@ -17,3 +20,15 @@ def get_order_service(
         order_repo=OrderRepository(db),
         inventory_service=inventory_service,
     )
+
+
+def get_order_reader(
+    db: AsyncSession = Depends(get_read_session),
+    inventory_service: InventoryService = Depends(provide_inventory_reader),
+) -> OrderService:
+    """For list endpoints that may stream (see provide_inventory_reader)."""
+    return OrderService(
+        db=db,
+        order_repo=OrderRepository(db),
+        inventory_service=inventory_service,
+    )
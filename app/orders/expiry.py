@@ -0,0 +1,121 @@
+"""
+reservation expiry.
+
+a confirmed order holds stock (reserved_quantity) until it is completed or
+cancelled. holds not settled within RESERVATION_TTL_MINUTES are released by
+ReservationSweeper, and their orders move to EXPIRED.
+
+the sweeper follows the same locking protocol as cancel/complete
+(InventoryService._settle_locked): stock rows first, in id order, then the
+reservations are re-read, since their status only changes under the stock
+lock. stock rows are taken with SKIP LOCKED, so a row busy with a request,
+or with a sweeper in another worker, is simply left for the next run; every
+worker can run one.
+"""
+
+import asyncio
+import logging
+import uuid
+from collections import defaultdict
+from collections.abc import Callable
+from contextlib import AbstractAsyncContextManager
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.database.session import get_script_session
+from app.inventory.models.enums import ReservationStatus
+from app.inventory.repositories.stock_repo import StockRepository
+from app.orders.repository import OrderRepository
+
+logger = logging.getLogger(__name__)
+
+
+class ReservationSweeper:
+    def __init__(
+        self,
+        session_factory: Callable[
+            [], AbstractAsyncContextManager[AsyncSession]
+        ] = get_script_session,
+        interval: float | None = None,
+        batch_size: int | None = None,
+    ):
+        self.session_factory = session_factory
+        self.interval = interval or settings.RESERVATION_SWEEP_INTERVAL_SECONDS
+        self.batch_size = batch_size or settings.RESERVATION_SWEEP_BATCH_SIZE
+        self._task: asyncio.Task | None = None
+
+    async def run_once(self) -> int:
+        """Release one batch of expired holds; returns how many were released."""
+        async with self.session_factory() as session:
+            stock_repo = StockRepository(session)
+            candidates = await stock_repo.get_expired_reservations(self.batch_size)
+            if not candidates:
+                return 0
+
+            stocks = await stock_repo.get_stocks_by_ids_for_update(
+                {reservation.stock_id for reservation in candidates}, "skip_locked"
+            )
+            stock_by_id = {stock.id: stock for stock in stocks}
+            # settled (or released by another sweeper) while we waited?
+            reservations = [
+                reservation
+                for reservation in await stock_repo.get_reservations_by_ids(
+                    reservation.id for reservation in candidates
+                    if reservation.stock_id in stock_by_id
+                )
+                if reservation.status == ReservationStatus.RESERVED
+            ]
+            if not reservations:
+                return 0
+
+            released: dict[uuid.UUID, int] = defaultdict(int)
+            for reservation in reservations:
+                released[reservation.stock_id] += reservation.quantity
+                reservation.status = ReservationStatus.RELEASED
+            # one UPDATE per stock row, however many of its holds expired
+            for stock_id, quantity in released.items():
+                stock_by_id[stock_id].reserved_quantity -= quantity
+
+            order_ids = await OrderRepository(session).expire_orders_for_items(
+                reservation.order_item_id for reservation in reservations
+            )
+            await session.flush()
+            logger.info(
+                "expired reservations released",
+                extra={
+                    "reservations": len(reservations),
+                    "stocks": len(released),
+                    "orders": len(order_ids),
+                    "skipped": len(candidates) - len(reservations),
+                },
+            )
+            return len(reservations)
+
+    async def _run_forever(self) -> None:
+        while True:
+            try:
+                # drain the backlog, then wait for the next tick; a batch cut
+                # short by busy rows waits too
+                while await self.run_once() >= self.batch_size:
+                    pass
+            except Exception:
+                logger.exception("reservation sweeper: batch failed")
+            await asyncio.sleep(self.interval)
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run_forever())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+
+reservation_sweeper = ReservationSweeper()
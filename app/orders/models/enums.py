@@ -6,3 +6,5 @@ class OrderStatus(str, Enum):
     CONFIRMED = "confirmed"
     CANCELLED = "cancelled"
     COMPLETED = "completed"
+    # reservations outlived RESERVATION_TTL_MINUTES and were released
+    EXPIRED = "expired"
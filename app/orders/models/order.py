@@ -104,14 +104,21 @@ class Order(Base):
 
         self.status = OrderStatus.COMPLETED
 
+    def touch(self) -> None:
+        # items live in their own table: bump the order so its updated_at
+        # (the ETag validator) covers them too
+        self.updated_at = datetime.now(timezone.utc)
+
     def add_item(self, product_id: uuid.UUID, quantity: int) -> "OrderItem":
         if self.status != OrderStatus.CREATED:
             raise InvalidOrderStatus("Items can only be added to created orders")
         if quantity <= 0:
             raise InvalidQuantity("Quantity must be greater than zero")
 
-        item = OrderItem(product_id=product_id, quantity=quantity)
+        # a new line has no reservation: saying so keeps it loaded
+        item = OrderItem(product_id=product_id, quantity=quantity, reservation=None)
         item.order = self
+        self.touch()
         return item
 
     def remove_item(self, product_id: uuid.UUID) -> None:
@@ -121,6 +128,7 @@ class Order(Base):
         for item in self.items:
             if item.product_id == product_id:
                 self.items.remove(item)
+                self.touch()
                 return
 
         raise OrderItemNotFound("Item not found in order")
@@ -1,12 +1,16 @@
 import uuid
-from collections.abc import Sequence
+from collections.abc import AsyncIterator, Iterable, Sequence
+from datetime import datetime, timezone
 
-from sqlalchemy import select
+from sqlalchemy import func, select, update
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.database.loader import Loader
+from app.database.streaming import open_stream
 from app.orders.exceptions import OrderCodeGenerationError
+from app.orders.models.enums import OrderStatus
 from app.orders.models.order import Order, OrderItem
 
 _MAX_CODE_RETRIES = 5
@@ -18,13 +22,9 @@ class OrderRepository:
     # Order
 
     async def get_order(self, order_id: uuid.UUID) -> Order | None:
-        stmt = (
-            select(Order)
-            .where(Order.id == order_id)
-            .options(selectinload(Order.items).selectinload(OrderItem.reservation))
-        )
-        result = await self.db.execute(stmt)
-        return result.scalar_one_or_none()
+        # served from the session while the order and its item/reservation
+        # chain are loaded, e.g. append_item's reload after its flush
+        return await Loader.of(self.db).load(Order, order_id, eager=("items.reservation",))
 
     async def get_order_by_code(self, code: str) -> Order | None:
         stmt = (
@@ -45,14 +45,59 @@ class OrderRepository:
         result = await self.db.execute(stmt)
         return result.scalars().all()
 
+    # validators for conditional GETs: no item / reservation loads
+
+    async def get_order_version_by_code(self, code: str) -> tuple[uuid.UUID, datetime] | None:
+        stmt = select(Order.id, Order.updated_at).where(Order.code == code)
+        result = await self.db.execute(stmt)
+        row = result.one_or_none()
+        return None if row is None else (row.id, row.updated_at)
+
+    async def get_user_orders_version(self, user_id: uuid.UUID) -> tuple[int, datetime | None]:
+        stmt = select(func.count(), func.max(Order.updated_at)).where(Order.user_id == user_id)
+        result = await self.db.execute(stmt)
+        total, last_updated = result.one()
+        return total, last_updated
+
+    async def stream_orders_by_user(self, user_id: uuid.UUID) -> AsyncIterator[Sequence[Order]]:
+        # items only: OrderResponse doesn't carry reservations
+        stmt = (
+            select(Order)
+            .where(Order.user_id == user_id)
+            .options(selectinload(Order.items))
+            .order_by(Order.created_at.desc())
+        )
+        return await open_stream(self.db, stmt)
+
+    async def expire_orders_for_items(
+        self, item_ids: Iterable[uuid.UUID]
+    ) -> list[uuid.UUID]:
+        """CONFIRMED orders owning any of these items become EXPIRED, in one UPDATE."""
+        item_ids = list(item_ids)
+        if not item_ids:
+            return []
+        stmt = (
+            update(Order)
+            .where(
+                Order.status == OrderStatus.CONFIRMED,
+                Order.id.in_(select(OrderItem.order_id).where(OrderItem.id.in_(item_ids))),
+            )
+            .values(status=OrderStatus.EXPIRED, updated_at=datetime.now(timezone.utc))
+            .returning(Order.id)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.db.execute(stmt)
+        return list(result.scalars().all())
+
     async def create_order(self, user_id: uuid.UUID) -> Order:
         for _ in range(_MAX_CODE_RETRIES):
             order = Order.create(user_id=user_id)  # generate a new code 
-            self.db.add(order)
             try:
-                await self.db.commit()
+                # a savepoint, so a collision undoes only this attempt and
+                # not the rest of the request's unit of work
+                async with self.db.begin_nested():
+                    self.db.add(order)
             except IntegrityError:
-                await self.db.rollback()
                 continue  # rarely collision
             return await self.get_order(order.id)
 
@@ -69,7 +114,7 @@ class OrderRepository:
 
         item = order.add_item(product_id=product_id, quantity=quantity)
         self.db.add(item)
-        await self.db.commit()
+        await self.db.flush()
         return await self.get_order(order_id)
 
     async def remove_item(self, order_id: uuid.UUID, product_id: uuid.UUID) -> Order | None:
@@ -79,5 +124,5 @@ class OrderRepository:
 
         await self.db.refresh(order, attribute_names=["items"])
         order.remove_item(product_id)
-        await self.db.commit()
+        await self.db.flush()
         return order
@@ -2,19 +2,22 @@ import logging
 import uuid
 from collections.abc import Sequence
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Response, status
 
-from app.auth.dependencies import get_current_user
+from app.auth.dependencies import get_current_principal
+from app.auth.principal import Principal
+from app.core.conditional import ConditionalGet, conditional_get
+from app.core.streaming import stream_format, streaming_response
 from app.inventory.dependencies import get_current_location
 from app.inventory.models.location import Location
-from app.orders.dependencies import get_order_service
+from app.orders.dependencies import get_order_reader, get_order_service
 from app.orders.schemas import AddItemRequest, OrderResponse
 from app.orders.service import OrderService
 from app.rbac.dependencies import require_permission
-from app.users.model import User
 
 """
 GET  /orders/me                          - list current user's own orders
+                                           (streamed for ?stream=true / NDJSON)
 POST /orders                             - create order
 POST /orders/{id}/items                  - add item to order
 DELETE /orders/{id}/items/{item_id}      - remove item from order
@@ -29,6 +32,9 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/orders", tags=["ORDERS"])
 
+# order status moves on its own (confirmation, expiry): always revalidate
+ORDER_CACHE_CONTROL = "private, no-cache"
+
 # orders
 
 @router.get(
@@ -37,9 +43,13 @@ router = APIRouter(prefix="/orders", tags=["ORDERS"])
 )
 async def get_order_by_code(
     code: str,
+    conditional: ConditionalGet = Depends(conditional_get(ORDER_CACHE_CONTROL)),
     service: OrderService = Depends(get_order_service),
-) -> OrderResponse:
+) -> OrderResponse | Response:
     logger.info("get_order_by_code endpoint called")
+    version = await service.get_order_version_by_code(code)
+    if version is not None and (cached := conditional.check(*version)):
+        return cached
     order = await service.get_order_by_code(code)
     logger.info("get_order_by_code endpoint succeeded", extra={"order_id": order.id})
     return order
@@ -50,15 +60,24 @@ async def get_order_by_code(
     response_model=list[OrderResponse],
 )
 async def list_my_orders(
-    current_user: User = Depends(get_current_user),
-    service: OrderService = Depends(get_order_service),
-) -> Sequence[OrderResponse]:
-
-    logger.info("list_my_orders endpoint called", extra={"user_id": current_user.id})
-    orders = await service.list_user_orders(user_id=current_user.id)
+    principal: Principal = Depends(get_current_principal),
+    media_type: str | None = Depends(stream_format),
+    conditional: ConditionalGet = Depends(conditional_get(ORDER_CACHE_CONTROL)),
+    service: OrderService = Depends(get_order_reader),
+) -> Sequence[OrderResponse] | Response:
+
+    logger.info("list_my_orders endpoint called", extra={"user_id": principal.id})
+    if media_type is not None:
+        partitions = await service.stream_user_orders(user_id=principal.id)
+        return streaming_response(partitions, OrderResponse, media_type)
+
+    total, last_updated = await service.get_user_orders_version(principal.id)
+    if cached := conditional.check(principal.id, total, last_updated):
+        return cached
+    orders = await service.list_user_orders(user_id=principal.id)
     logger.info(
         "list_my_orders endpoint succeeded",
-        extra={"user_id": current_user.id, "count": len(orders)},
+        extra={"user_id": principal.id, "count": len(orders)},
     )
     return orders
 
@@ -70,11 +89,11 @@ async def list_my_orders(
     dependencies=[Depends(require_permission("order:create"))],
 )
 async def create_order(
-    current_user: User = Depends(get_current_user),
+    principal: Principal = Depends(get_current_principal),
     service: OrderService = Depends(get_order_service),
 ) -> OrderResponse:
-    logger.info("create_order endpoint called", extra={"user_id": current_user.id})
-    order = await service.create_order(user_id=current_user.id)
+    logger.info("create_order endpoint called", extra={"user_id": principal.id})
+    order = await service.create_order(user_id=principal.id)
     logger.info("create_order endpoint succeeded", extra={"order_id": order.id})
     return order
 
@@ -1,10 +1,11 @@
 import logging
 import uuid
-from collections.abc import Sequence
+from collections.abc import AsyncIterator, Sequence
+from datetime import datetime
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.inventory.service import InventoryService
+from app.inventory.service import InventoryService, ReservationLine
 from app.orders.exceptions import InvalidOrderStatus, OrderNotFound
 from app.orders.models.enums import OrderStatus
 from app.orders.models.order import Order
@@ -62,6 +63,20 @@ class OrderService:
         )
         return orders
 
+    async def stream_user_orders(self, user_id: uuid.UUID) -> AsyncIterator[Sequence[Order]]:
+        logger.info("stream_user_orders: streaming orders", extra={"user_id": user_id})
+        return await self.order_repo.stream_orders_by_user(user_id)
+
+    async def get_user_orders_version(self, user_id: uuid.UUID) -> tuple[int, datetime | None]:
+        return await self.order_repo.get_user_orders_version(user_id)
+
+    async def get_order_version_by_code(self, code: str) -> tuple[uuid.UUID, datetime] | None:
+        """None for a malformed or unknown code: get_order_by_code reports it."""
+        normalized = _normalize_code(code)
+        if normalized is None:
+            return None
+        return await self.order_repo.get_order_version_by_code(normalized)
+
     async def get_order_by_code(self, code: str) -> Order:
         normalized = _normalize_code(code)
         if normalized is None:
@@ -104,13 +119,18 @@ class OrderService:
         if order.status != OrderStatus.CREATED:
             logger.warning("confirm_order: wrong status order, should be CREATED", extra={"invalid_status": order.status})
             raise InvalidOrderStatus()
-        for item in order.items:
-            await self.inventory_service.reserve_for_item(
-                order_item_id=item.id,
-                product_id=item.product_id,
-                location_id=location_id,
-                quantity=item.quantity,
-            )
+        # one locking query for the whole order, however many lines it has
+        await self.inventory_service.reserve_for_items(
+            [
+                ReservationLine(
+                    order_item_id=item.id,
+                    product_id=item.product_id,
+                    quantity=item.quantity,
+                )
+                for item in order.items
+            ],
+            location_id=location_id,
+        )
 
         order.status = OrderStatus.CONFIRMED
         await self.db.commit()
@@ -128,11 +148,9 @@ class OrderService:
             logger.warning("cancel_order: wrong status order, should be CONFIRMED", extra={"order_id": order_id, "invalid_status": order.status})
             raise InvalidOrderStatus()
 
-        for item in order.items:
-            if item.reservation is not None:
-                await self.inventory_service.release_for_item(
-                    item.reservation.id
-                )
+        await self.inventory_service.release_for_items(
+            [item.reservation.id for item in order.items if item.reservation is not None]
+        )
         order.cancel()
         await self.db.commit()
         logger.info("cancel_order: order cancelled", extra={"order_id": order_id})
@@ -144,11 +162,9 @@ class OrderService:
             logger.warning("complete_order: order not found", extra={"order_id": order_id})
             raise OrderNotFound()
 
-        for item in order.items:
-            if item.reservation is not None:
-                await self.inventory_service.fulfill_for_item(
-                    item.reservation.id
-                )
+        await self.inventory_service.fulfill_for_items(
+            [item.reservation.id for item in order.items if item.reservation is not None]
+        )
 
         order.complete()
         await self.db.commit()
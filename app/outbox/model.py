@@ -0,0 +1,43 @@
+"""
+transactional outbox.
+
+a request that has a side effect to trigger (an alert, an email) writes an
+OutboxEvent in its own transaction instead of performing it: the event
+exists if and only if the request's writes were committed. background
+consumers claim pending events per topic and delete them once handled.
+"""
+
+import uuid
+from datetime import datetime
+
+from sqlalchemy import JSON, DateTime, Index, Integer, String, Text, Uuid, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database.base import Base
+
+
+class OutboxEvent(Base):
+    __tablename__ = "outbox_events"
+    __table_args__ = (
+        # consumers claim the oldest due events of one topic
+        Index("ix_outbox_events_topic_available_at", "topic", "available_at", "id"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        Uuid,
+        primary_key=True,
+        default=uuid.uuid7,
+    )
+    topic: Mapped[str] = mapped_column(String(100), nullable=False)
+    # what the event is about (e.g. a stock id); consumers dedupe on it
+    key: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    payload: Mapped[dict] = mapped_column(JSON, nullable=False)
+    attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    # not claimed before this time (retry backoff)
+    available_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
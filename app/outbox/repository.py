@@ -0,0 +1,127 @@
+import uuid
+from collections.abc import Iterable
+from datetime import timedelta
+
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.outbox.model import OutboxEvent
+
+
+class OutboxRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def enqueue(self, topic: str, payload: dict, key: str | None = None) -> None:
+        await self.enqueue_many(topic, [(key, payload)])
+
+    async def enqueue_many(
+        self, topic: str, events: Iterable[tuple[str | None, dict]]
+    ) -> None:
+        """One multi-row INSERT; part of the caller's transaction."""
+        rows = [
+            {"id": uuid.uuid7(), "topic": topic, "key": key, "payload": payload}
+            for key, payload in events
+        ]
+        if rows:
+            await self.db.execute(insert(OutboxEvent), rows)
+
+    async def claim(self, topic: str, limit: int) -> list[OutboxEvent]:
+        """
+        Lock up to `limit` due events, oldest first. SKIP LOCKED lets every
+        worker run a consumer: each claims a disjoint batch, and the locks
+        last until the consumer's transaction ends.
+        """
+        stmt = (
+            select(OutboxEvent)
+            .where(
+                OutboxEvent.topic == topic,
+                OutboxEvent.available_at <= func.now(),
+            )
+            .order_by(OutboxEvent.available_at, OutboxEvent.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await self.db.execute(stmt)
+        return list(result.scalars().all())
+
+    async def lease(
+        self, topic: str, limit: int, duration: timedelta
+    ) -> list[OutboxEvent]:
+        """
+        Claim up to `limit` due events for `duration`, oldest first, by moving
+        their available_at past the lease. Unlike claim() nothing stays
+        locked: the caller commits right away, handles the events outside any
+        transaction, then completes or reschedules them. Events whose holder
+        died become due again when the lease runs out.
+        """
+        due = (
+            select(OutboxEvent.id)
+            .where(
+                OutboxEvent.topic == topic,
+                OutboxEvent.available_at <= func.now(),
+            )
+            .order_by(OutboxEvent.available_at, OutboxEvent.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        stmt = (
+            update(OutboxEvent)
+            .where(OutboxEvent.id.in_(due.scalar_subquery()))
+            .values(available_at=func.now() + duration)
+            .returning(OutboxEvent)
+            .execution_options(populate_existing=True)
+        )
+        result = await self.db.execute(stmt)
+        # RETURNING has no order; uuid7 ids sort by creation time
+        return sorted(result.scalars().all(), key=lambda event: event.id)
+
+    async def complete(self, event_ids: Iterable[uuid.UUID]) -> None:
+        event_ids = list(event_ids)
+        if event_ids:
+            await self.db.execute(
+                delete(OutboxEvent).where(OutboxEvent.id.in_(event_ids))
+            )
+
+    async def dead_letter(
+        self, event_ids: Iterable[uuid.UUID], error: str, payload: dict | None = None
+    ) -> None:
+        """
+        Park events under "<topic>.dead": kept for inspection, never claimed.
+        `payload` replaces theirs, e.g. with secrets redacted.
+        """
+        event_ids = list(event_ids)
+        if not event_ids:
+            return
+        values = {
+            "topic": OutboxEvent.topic + ".dead",
+            "attempts": OutboxEvent.attempts + 1,
+            "last_error": error[:1000],
+        }
+        if payload is not None:
+            values["payload"] = payload
+        stmt = (
+            update(OutboxEvent)
+            .where(OutboxEvent.id.in_(event_ids))
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        await self.db.execute(stmt)
+
+    async def retry_later(
+        self, event_ids: Iterable[uuid.UUID], delay: timedelta, error: str
+    ) -> None:
+        event_ids = list(event_ids)
+        if not event_ids:
+            return
+        stmt = (
+            update(OutboxEvent)
+            .where(OutboxEvent.id.in_(event_ids))
+            .values(
+                attempts=OutboxEvent.attempts + 1,
+                available_at=func.now() + delay,
+                last_error=error[:1000],
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await self.db.execute(stmt)
@@ -0,0 +1,11 @@
+"""
+token-bucket rate limiting.
+
+a RateLimit is a bucket of `burst` tokens refilled at `per_minute`; every
+request takes one token from the bucket of its key (a client IP, an email)
+and is rejected with 429 + Retry-After while the bucket is empty. the check
+runs before the guarded work, so a hammering client costs a dict lookup (or
+one upsert), not a database round trip and an Argon2 verify.
+
+RATE_LIMIT_BACKEND picks where buckets live, see `build_store()`.
+"""
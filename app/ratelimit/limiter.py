@@ -0,0 +1,171 @@
+import logging
+import time
+from collections.abc import Callable
+from contextlib import AbstractAsyncContextManager
+from dataclasses import dataclass
+from typing import Protocol
+
+from sqlalchemy import Float, case, cast, delete, extract, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.global_errors import AppError
+from app.database.session import get_script_session
+from app.ratelimit.model import RateLimitBucket
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    name: str  # bucket key prefix, so limits never share a bucket
+    burst: int
+    per_minute: float
+
+    @property
+    def per_second(self) -> float:
+        return self.per_minute / 60
+
+
+class RateLimitExceeded(AppError):
+    def __init__(self, retry_after: float, message: str = "Too many requests"):
+        super().__init__(
+            message=message,
+            status_code=429,
+            error_code="RATE_LIMITED",
+        )
+        self.retry_after = retry_after
+
+
+class RateLimitStore(Protocol):
+    async def take(self, key: str, limit: RateLimit) -> float:
+        """Take a token: 0 when allowed, else seconds until one refills."""
+        ...
+
+    async def clear(self) -> None: ...
+
+
+class MemoryRateLimitStore:
+    """Buckets in a dict: no I/O, but every worker process counts on its own."""
+
+    def __init__(self, max_keys: int = 100_000, clock: Callable[[], float] = time.monotonic):
+        self.max_keys = max_keys
+        self.clock = clock
+        self._buckets: dict[str, tuple[float, float, RateLimit]] = {}
+
+    async def take(self, key: str, limit: RateLimit) -> float:
+        now = self.clock()
+        entry = self._buckets.get(key)
+        if entry is None:
+            if len(self._buckets) >= self.max_keys:
+                self._prune(now)
+            tokens = float(limit.burst)
+        else:
+            tokens = _refill(entry, now)
+
+        if tokens < 1:
+            self._buckets[key] = (tokens, now, limit)
+            return (1 - tokens) / limit.per_second
+        self._buckets[key] = (tokens - 1, now, limit)
+        return 0.0
+
+    def _prune(self, now: float) -> None:
+        # a full bucket is the same as no bucket; forget those first
+        self._buckets = {
+            key: entry for key, entry in self._buckets.items()
+            if _refill(entry, now) < entry[2].burst
+        }
+        if len(self._buckets) >= self.max_keys:
+            self._buckets.clear()
+
+    async def clear(self) -> None:
+        self._buckets.clear()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+def _refill(entry: tuple[float, float, RateLimit], now: float) -> float:
+    tokens, updated, limit = entry
+    return min(limit.burst, tokens + (now - updated) * limit.per_second)
+
+
+class PostgresRateLimitStore:
+    """
+    Buckets in the UNLOGGED rate_limit_buckets table, shared by every worker.
+    One upsert per take: the row lock serialises concurrent takes of a key,
+    and a rejected take leaves the row as it was.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[
+            [], AbstractAsyncContextManager[AsyncSession]
+        ] = get_script_session,
+    ):
+        self.session_factory = session_factory
+
+    async def take(self, key: str, limit: RateLimit) -> float:
+        bucket = RateLimitBucket.__table__
+        # fixed for the statement but not the transaction, unlike now()
+        now = func.statement_timestamp()
+        elapsed = cast(extract("epoch", now - bucket.c.updated_at), Float)
+        available = func.least(limit.burst, bucket.c.tokens + elapsed * limit.per_second)
+        allowed = available >= 1
+
+        stmt = insert(bucket).values(key=key, tokens=limit.burst - 1, updated_at=now)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[bucket.c.key],
+            set_={
+                "tokens": case((allowed, available - 1), else_=bucket.c.tokens),
+                "updated_at": case((allowed, now), else_=bucket.c.updated_at),
+            },
+        ).returning(
+            # RETURNING sees the row after the update: only a granted take
+            # stamps it with this statement's timestamp
+            (bucket.c.updated_at == now).label("allowed"),
+            available.label("available"),
+        )
+        async with self.session_factory() as session:
+            row = (await session.execute(stmt)).one()
+
+        if row.allowed:
+            return 0.0
+        return (1 - row.available) / limit.per_second
+
+    async def clear(self) -> None:
+        async with self.session_factory() as session:
+            await session.execute(delete(RateLimitBucket))
+
+
+def build_store() -> RateLimitStore:
+    if settings.RATE_LIMIT_BACKEND == "postgres":
+        return PostgresRateLimitStore()
+    return MemoryRateLimitStore()
+
+
+class RateLimiter:
+    def __init__(self, store: RateLimitStore, enabled: bool = True):
+        self.store = store
+        self.enabled = enabled
+        self.rejected = 0
+
+    async def hit(self, limit: RateLimit, key: str) -> None:
+        """Take a token for `key` under `limit`; raises RateLimitExceeded when empty."""
+        if not self.enabled:
+            return
+        retry_after = await self.store.take(f"{limit.name}:{key}", limit)
+        if retry_after > 0:
+            self.rejected += 1
+            logger.warning(
+                "rate limited",
+                extra={"limit": limit.name, "key": key, "retry_after": round(retry_after, 3)},
+            )
+            raise RateLimitExceeded(retry_after)
+
+    async def clear(self) -> None:
+        await self.store.clear()
+
+
+rate_limiter = RateLimiter(build_store(), enabled=settings.RATE_LIMIT_ENABLED)
@@ -0,0 +1,106 @@
+"""
+in-process caches for permission checks.
+
+require_permission runs on every guarded endpoint, so the user -> roles ->
+permissions lookup is kept in memory for a short TTL. RBACService drops the
+affected entries once a change to a user-role or role-permission link
+commits; other workers drop theirs when the matching invalidation event arrives over
+the LISTEN/NOTIFY bus (app/database/invalidation.py).
+"""
+
+import time
+import uuid
+
+from app.core.config import settings
+from app.database.invalidation import RBAC_ROLE, RBAC_USER, invalidation_bus
+
+
+class PermissionCache:
+    def __init__(self, ttl_seconds: float, max_entries: int = 10_000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: dict[uuid.UUID, tuple[float, frozenset[str]]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    def get(self, user_id: uuid.UUID) -> frozenset[str] | None:
+        entry = self._entries.get(user_id)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, codes = entry
+        if expires_at <= time.monotonic():
+            del self._entries[user_id]
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return codes
+
+    def set(self, user_id: uuid.UUID, codes: frozenset[str]) -> None:
+        if not self.enabled:
+            return
+        # crude bound: a full cache is cheaper to rebuild than to track LRU
+        if len(self._entries) >= self.max_entries:
+            self._entries.clear()
+        self._entries[user_id] = (time.monotonic() + self.ttl_seconds, codes)
+
+    def invalidate_user(self, user_id: uuid.UUID) -> None:
+        self._entries.pop(user_id, None)
+
+    def invalidate_all(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+class RolePermissionSnapshot:
+    """
+    role name -> permission codes for every role, used by the stateless auth
+    mode to authorize straight from the token's `roles` claim.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._roles: dict[str, frozenset[str]] | None = None
+        self._expires_at = 0.0
+
+    def get(self) -> dict[str, frozenset[str]] | None:
+        if self._roles is None or self._expires_at <= time.monotonic():
+            return None
+        return self._roles
+
+    def set(self, roles: dict[str, frozenset[str]]) -> None:
+        self._roles = roles
+        self._expires_at = time.monotonic() + self.ttl_seconds
+
+    def invalidate(self) -> None:
+        self._roles = None
+
+
+permission_cache = PermissionCache(ttl_seconds=settings.RBAC_CACHE_TTL_SECONDS)
+role_permission_snapshot = RolePermissionSnapshot(
+    ttl_seconds=settings.RBAC_CACHE_TTL_SECONDS
+)
+
+
+def _on_user_changed(key: str | None) -> None:
+    if key is None:
+        permission_cache.invalidate_all()
+    else:
+        permission_cache.invalidate_user(uuid.UUID(key))
+
+
+def _on_role_changed(key: str | None) -> None:
+    permission_cache.invalidate_all()
+    role_permission_snapshot.invalidate()
+
+
+invalidation_bus.subscribe(RBAC_USER, _on_user_changed)
+invalidation_bus.subscribe(RBAC_ROLE, _on_role_changed)
@@ -1,16 +1,17 @@
 from fastapi import Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.auth.dependencies import get_current_user
-from app.database.session import get_session
-from app.rbac.exceptions import PermissionDenied
+from app.auth.dependencies import get_current_principal
+from app.auth.principal import Principal
+from app.core.config import settings
+from app.database.session import RequestContext, get_request_context, get_session
 from app.rbac.repositories.permission_repo import PermissionRepository
 from app.rbac.repositories.role_repo import RoleRepository
 from app.rbac.service import RBACService
 
 
 def get_rbac_service(
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_session, scope="function"),
 ) -> RBACService:
     return RBACService(
         role_repo=RoleRepository(session),
@@ -18,18 +19,28 @@ def get_rbac_service(
     )
 
 
+async def get_principal_permissions(
+    principal: Principal, rbac_service: RBACService
+) -> frozenset[str]:
+    if settings.AUTH_STATELESS:
+        # trusts the roles claim of an already verified token
+        return await rbac_service.get_roles_permissions(principal.roles)
+    # an unknown user resolves to an empty set, so it is denied as well
+    return await rbac_service.get_user_permissions(principal.id)
+
+
 def require_permission(permission_code: str):
 
     async def dependency(
-        current_user=Depends(get_current_user),
+        principal: Principal = Depends(get_current_principal),
+        context: RequestContext = Depends(get_request_context, scope="request"),
         rbac_service: RBACService = Depends(get_rbac_service),
     ):
-        try:
-            await rbac_service.ensure_permission(
-                user_id=current_user.id,
-                permission_code=permission_code,
-            )
-        except PermissionDenied:
+        # resolved once per request, however many guards the route stacks
+        if context.permissions is None:
+            context.permissions = await get_principal_permissions(principal, rbac_service)
+
+        if permission_code not in context.permissions:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Not enough permissions",
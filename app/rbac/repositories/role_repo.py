@@ -1,9 +1,14 @@
 import uuid
+from collections.abc import Callable
 
 from sqlalchemy import delete, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 
+from app.database.invalidation import RBAC_ROLE, RBAC_USER, publish_invalidation
+from app.database.session import after_commit
+from app.rbac.models.permission import Permission
 from app.rbac.models.role import Role
 from app.rbac.models.role_permission import role_permissions
 from app.rbac.models.user_role import user_roles
@@ -15,7 +20,8 @@ class RoleRepository:
         self.db = db
 
     async def get_all(self) -> list[Role]:
-        stmt = select(Role)
+        # RoleResponse serializes permissions, load them up front
+        stmt = select(Role).options(selectinload(Role.permissions))
         result = await self.db.scalars(stmt)
         return list(result.all())
 
@@ -41,9 +47,10 @@ class RoleRepository:
     async def create(self, role: Role) -> Role:
         self.db.add(role)
         await self.db.flush()
-        # load the (empty) permissions collection so response serialization
-        # doesn't trigger a lazy load outside the async greenlet context
-        await self.db.refresh(role, ["permissions"])
+        # a new role has no permissions: mark the collection loaded (empty)
+        # instead of a refresh() SELECT, so response serialization doesn't
+        # lazy load it outside the async greenlet context
+        set_committed_value(role, "permissions", [])
         return role
 
     async def get_or_create(self, name: str, **kwargs) -> Role:
@@ -55,6 +62,15 @@ class RoleRepository:
 
     async def delete(self, role: Role) -> None:
         await self.db.delete(role)
+        await publish_invalidation(self.db, RBAC_ROLE, role.id)
+
+    async def publish_role_changed(self, role_id: uuid.UUID) -> None:
+        # for ORM-side edits (e.g. a rename) flushed with the request
+        await publish_invalidation(self.db, RBAC_ROLE, role_id)
+
+    def after_commit(self, callback: Callable[[], None]) -> None:
+        """Run `callback` (a local cache drop) once the request commits."""
+        after_commit(self.db, callback)
 
     # associations
 
@@ -77,6 +93,7 @@ class RoleRepository:
             role_id=role_id,
         )
         await self.db.execute(stmt)
+        await publish_invalidation(self.db, RBAC_USER, user_id)
 
     async def remove_role_from_user(self, user_id: uuid.UUID, role_id: uuid.UUID) -> None:
         stmt = delete(user_roles).where(
@@ -84,6 +101,7 @@ class RoleRepository:
             user_roles.c.role_id == role_id,
         )
         await self.db.execute(stmt)
+        await publish_invalidation(self.db, RBAC_USER, user_id)
 
     async def role_has_permission(self, role_id: uuid.UUID, permission_id: uuid.UUID) -> bool:
         stmt = (
@@ -104,6 +122,7 @@ class RoleRepository:
             permission_id=permission_id,
         )
         await self.db.execute(stmt)
+        await publish_invalidation(self.db, RBAC_ROLE, role_id)
 
     async def remove_permission_from_role(
         self, role_id: uuid.UUID, permission_id: uuid.UUID
@@ -113,8 +132,43 @@ class RoleRepository:
             role_permissions.c.permission_id == permission_id,
         )
         await self.db.execute(stmt)
+        await publish_invalidation(self.db, RBAC_ROLE, role_id)
+
+    # used by ensure_permission() on a cache miss: one round trip, no ORM loading
+    async def get_user_permission_codes(self, user_id: uuid.UUID) -> set[str]:
+        stmt = (
+            select(Permission.code)
+            .join(
+                role_permissions,
+                role_permissions.c.permission_id == Permission.id,
+            )
+            .join(
+                user_roles,
+                user_roles.c.role_id == role_permissions.c.role_id,
+            )
+            .where(user_roles.c.user_id == user_id)
+            .distinct()
+        )
+        result = await self.db.scalars(stmt)
+        return set(result.all())
+
+    # used by the stateless auth mode: every role with its permission codes
+    async def get_role_permission_map(self) -> dict[str, frozenset[str]]:
+        stmt = (
+            select(Role.name, Permission.code)
+            .outerjoin(role_permissions, role_permissions.c.role_id == Role.id)
+            .outerjoin(Permission, Permission.id == role_permissions.c.permission_id)
+        )
+        result = await self.db.execute(stmt)
+
+        roles: dict[str, set[str]] = {}
+        for role_name, code in result.all():
+            codes = roles.setdefault(role_name, set())
+            if code is not None:
+                codes.add(code)
+        return {name: frozenset(codes) for name, codes in roles.items()}
 
-    # used by ensure_permission() avoiding N+1 queries
+    # avoiding N+1 queries
     async def get_user_with_roles_and_permissions(
         self,
         user_id: uuid.UUID,
@@ -1,5 +1,11 @@
 import uuid
 
+from app.rbac.cache import (
+    PermissionCache,
+    RolePermissionSnapshot,
+    permission_cache,
+    role_permission_snapshot,
+)
 from app.rbac.exceptions import (
     PermissionAlreadyAssigned,
     PermissionDenied,
@@ -20,9 +26,13 @@ class RBACService:
         self,
         role_repo: RoleRepository,
         permission_repo: PermissionRepository,
+        cache: PermissionCache = permission_cache,
+        snapshot: RolePermissionSnapshot = role_permission_snapshot,
     ):
         self.role_repo = role_repo
         self.permission_repo = permission_repo
+        self.cache = cache
+        self.snapshot = snapshot
 
     # Roles
     async def create_role(self, name: str, description: str | None = None) -> Role:
@@ -48,6 +58,9 @@ class RBACService:
             if existing and existing.id != role_id:
                 raise RoleAlreadyExists()
             role.name = name
+            # the snapshot is keyed by role name
+            self.role_repo.after_commit(self.snapshot.invalidate)
+            await self.role_repo.publish_role_changed(role_id)
 
         if description is not None:
             role.description = description
@@ -68,12 +81,16 @@ class RBACService:
             raise RoleAlreadyAssignedToUser()
 
         await self.role_repo.add_role_to_user(user_id, role_id)
+        # after the commit: a concurrent request that read the old rows
+        # before it could otherwise cache them again
+        self.role_repo.after_commit(lambda: self.cache.invalidate_user(user_id))
 
     async def remove_role_from_user(self, user_id, role_id) -> None:
         if not await self.role_repo.user_has_role(user_id, role_id):
             raise UserRoleNotFound()
 
         await self.role_repo.remove_role_from_user(user_id, role_id)
+        self.role_repo.after_commit(lambda: self.cache.invalidate_user(user_id))
 
     # Role-Permission
     async def add_permission_to_role(self, role_id: uuid.UUID, permission_id: uuid.UUID):
@@ -89,6 +106,9 @@ class RBACService:
             raise PermissionAlreadyAssigned()
 
         await self.role_repo.add_permission_to_role(role_id, permission_id)
+        # every holder of the role is affected; role edits are rare enough
+        # that dropping the whole cache beats tracking role membership here
+        self.role_repo.after_commit(self._invalidate_roles)
 
     async def remove_permission_from_role(
         self, role_id: uuid.UUID, permission_id: uuid.UUID) -> None:
@@ -97,18 +117,43 @@ class RBACService:
             raise RolePermissionNotFound()
 
         await self.role_repo.remove_permission_from_role(role_id, permission_id)
+        self.role_repo.after_commit(self._invalidate_roles)
+
+    def _invalidate_roles(self) -> None:
+        self.cache.invalidate_all()
+        self.snapshot.invalidate()
 
     # permission checks
+    async def get_user_permissions(self, user_id: uuid.UUID) -> frozenset[str]:
+        codes = self.cache.get(user_id)
+        if codes is None:
+            codes = frozenset(await self.role_repo.get_user_permission_codes(user_id))
+            self.cache.set(user_id, codes)
+        return codes
+
     async def ensure_permission(self, user_id: uuid.UUID, permission_code: str) -> None:
-        user = await self.role_repo.get_user_with_roles_and_permissions(user_id)
-        if not user:
+        # an unknown user resolves to an empty set, so it is denied as well
+        codes = await self.get_user_permissions(user_id)
+
+        if permission_code not in codes:
             raise PermissionDenied()
 
-        has_permission = any(
-            permission.code == permission_code
-            for role in user.roles
-            for permission in role.permissions
-        )
+    async def get_role_permission_map(self) -> dict[str, frozenset[str]]:
+        roles = self.snapshot.get()
+        if roles is None:
+            roles = await self.role_repo.get_role_permission_map()
+            self.snapshot.set(roles)
+        return roles
+
+    async def get_roles_permissions(self, role_names: tuple[str, ...]) -> frozenset[str]:
+        roles = await self.get_role_permission_map()
+        return frozenset().union(*(roles.get(name, ()) for name in role_names))
 
-        if not has_permission:
-            raise PermissionDenied()
\ No newline at end of file
+    async def ensure_role_permission(
+        self, role_names: tuple[str, ...], permission_code: str
+    ) -> None:
+        # stateless mode: trusts the roles claim of an already verified token
+        roles = await self.get_role_permission_map()
+
+        if not any(permission_code in roles.get(name, ()) for name in role_names):
+            raise PermissionDenied()
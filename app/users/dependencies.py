@@ -1,11 +1,18 @@
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database.session import get_session
+from app.database.session import get_read_session, get_session
 from app.users.service import UserService
 
 
 async def provide_user_service(
-    db: AsyncSession = Depends(get_session),
+    db: AsyncSession = Depends(get_session, scope="function"),
 ) -> UserService:
     return UserService(session=db)
+
+
+async def provide_user_reader(
+    db: AsyncSession = Depends(get_read_session),
+) -> UserService:
+    """For list endpoints that may stream (see provide_inventory_reader)."""
+    return UserService(session=db)
@@ -1,9 +1,14 @@
 import uuid
+from collections.abc import AsyncIterator
 from typing import Sequence
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.database.loader import Loader
+from app.database.streaming import open_stream
+from app.rbac.models.role import Role
+from app.rbac.models.user_role import user_roles
 from app.users.model import User
 
 
@@ -12,46 +17,55 @@ class UserRepository:
         self.session = session
 
     async def get_by_id(self, user_id: uuid.UUID) -> User | None:
-        return await self.session.get(User, user_id)
+        # roles: the principal is built from them
+        return await Loader.of(self.session).load(User, user_id, eager=("roles",))
 
     async def get_by_email(self, email: str) -> User | None:
         stmt = select(User).where(User.email == email)
         result = await self.session.execute(stmt)
         return result.scalar_one_or_none()
 
+    async def get_role_names(self, user_id: uuid.UUID) -> list[str]:
+        """Just the role names, for token claims; skips loading the user."""
+        stmt = (
+            select(Role.name)
+            .join(user_roles, user_roles.c.role_id == Role.id)
+            .where(user_roles.c.user_id == user_id)
+        )
+        result = await self.session.execute(stmt)
+        return list(result.scalars().all())
+
     async def list_users(self, skip: int = 0, limit: int = 100) -> Sequence[User]:
         stmt = select(User).offset(skip).limit(limit)
         result = await self.session.execute(stmt)
         return result.scalars().all()
 
+    async def stream_users(self) -> AsyncIterator[Sequence[User]]:
+        return await open_stream(self.session, select(User).order_by(User.id))
+
     async def enable_account(self, user: User) -> User:
         user.is_active = True
-        await self.session.commit()
-        await self.session.refresh(user)
+        await self.session.flush()
         return user
 
     async def disable_account(self, user: User) -> User:
         user.is_active = False
-        await self.session.commit()
-        await self.session.refresh(user)
+        await self.session.flush()
         return user
 
     async def create_user(self, user: User) -> User:
         self.session.add(user)
-        await self.session.commit()
-        await self.session.refresh(user)
+        await self.session.flush()
         return user
 
     async def save_user(self, user: User) -> User:
         self.session.add(user)
-        await self.session.commit()
-        await self.session.refresh(user)
+        await self.session.flush()
         return user
 
     async def update_profile(self, user: User, data: dict) -> User:
         for field, value in data.items():
             if hasattr(user, field):
                 setattr(user, field, value)
-        await self.session.commit()
-        await self.session.refresh(user)
+        await self.session.flush()
         return user
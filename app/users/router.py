@@ -3,9 +3,11 @@ import uuid
 
 from fastapi import APIRouter, Depends, status
 
-from app.auth.dependencies import get_current_user
+from app.auth.dependencies import get_current_principal, get_current_user
+from app.auth.principal import Principal
+from app.core.streaming import stream_format, streaming_response
 from app.rbac.dependencies import require_permission
-from app.users.dependencies import provide_user_service
+from app.users.dependencies import provide_user_reader, provide_user_service
 from app.users.model import User
 from app.users.schemas import (
     DisableUserRequest,
@@ -64,8 +66,12 @@ async def update_profile(
     dependencies=[Depends(require_permission("users:view"))],
 )
 async def list_users(
-    service: UserService = Depends(provide_user_service),
+    media_type: str | None = Depends(stream_format),
+    service: UserService = Depends(provide_user_reader),
 ):
+    if media_type is not None:
+        partitions = await service.stream_users()
+        return streaming_response(partitions, UserListItemResponse, media_type)
     return await service.list_users()
 
 
@@ -102,15 +108,15 @@ async def disable_user(
     user_id: uuid.UUID,
     data: DisableUserRequest,
     service: UserService = Depends(provide_user_service),
-    current_user: User = Depends(get_current_user),
+    principal: Principal = Depends(get_current_principal),
 ):
-    logger.info("disable_user endpoint called", extra={"user_id": current_user.id})
+    logger.info("disable_user endpoint called", extra={"user_id": principal.id})
     disable_user = await service.disable_account(
         user_id=user_id,
-        disabled_by_user_id=current_user.id,
+        disabled_by_user_id=principal.id,
         reason=data.reason,
     )
-    logger.info("disable_user endpoint succeeded", extra={"user_id": current_user.id})
+    logger.info("disable_user endpoint succeeded", extra={"user_id": principal.id})
     return disable_user
 
 
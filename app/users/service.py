@@ -1,10 +1,11 @@
 import logging
 import uuid
+from collections.abc import AsyncIterator, Sequence
 from datetime import datetime, timezone
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.security.passwords import hash_password
+from app.core.security.passwords import password_hashing
 from app.users.exceptions import UserAlreadyExists, UserNotFound
 from app.users.model import User
 from app.users.repository import UserRepository
@@ -24,7 +25,7 @@ class UserService:
         user = User(
             email=email,
             username=username,
-            hashed_password=hash_password(password),
+            hashed_password=await password_hashing.hash(password),
             is_active=True,
         )
         await self.repo.create_user(user)
@@ -59,6 +60,10 @@ class UserService:
 
         return list(users)
 
+    async def stream_users(self) -> AsyncIterator[Sequence[User]]:
+        """Every user, in batches; the streamed export is not capped like list_users."""
+        return await self.repo.stream_users()
+
     async def get_user_by_id(
         self,
         user_id: uuid.UUID,
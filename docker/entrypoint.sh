@@ -9,12 +9,20 @@ fi
 # number of Gunicorn workers.
 WORKERS="${GUNICORN_WORKERS:-${WEB_CONCURRENCY:-4}}"
 
+# prometheus_client multi-process mode: every worker writes its metrics to
+# files here and /metrics aggregates them; stale files from a previous run
+# would be counted again, so start from an empty directory.
+if [ -n "${PROMETHEUS_MULTIPROC_DIR:-}" ]; then
+    rm -rf "${PROMETHEUS_MULTIPROC_DIR}"
+    mkdir -p "${PROMETHEUS_MULTIPROC_DIR}"
+fi
+
 echo "[entrypoint] starting gunicorn with ${WORKERS} worker(s)..."
 exec gunicorn app.main:app \
+    --config gunicorn.conf.py \
     --worker-class uvicorn.workers.UvicornWorker \
     --workers "${WORKERS}" \
     --bind 0.0.0.0:8000 \
-    --access-logfile - \
     --error-logfile - \
     --timeout 60 \
     --graceful-timeout 30 \
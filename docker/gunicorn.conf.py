@@ -0,0 +1,14 @@
+"""
+gunicorn hooks; the command-line flags in entrypoint.sh hold the settings.
+"""
+
+import os
+
+
+def child_exit(server, worker):
+    # drop the dead worker's live gauges (http_requests_in_progress) from
+    # the multi-process metrics; its counters and histograms are kept
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
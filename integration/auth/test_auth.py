@@ -14,7 +14,18 @@ Fixtures and helpers come from integration/conftest.py:
 
 from datetime import datetime, timedelta, timezone
 
+from app.auth import dependencies as auth_dependencies
 from app.auth.model import PasswordResetToken
+from app.core.config import settings
+from app.core.security.passwords import password_hashing, ph, verify_password
+from app.core.security.tokens import create_access_token, verify_access_token
+from app.mail.queue import MAIL
+from app.main import app
+from app.outbox.model import OutboxEvent
+from app.ratelimit.limiter import RateLimit
+from argon2 import PasswordHasher
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import select
 
 # POST /auth/login
 
@@ -38,6 +49,22 @@ async def test_login_wrong_password(client, plain_user):
     assert response.status_code == 401
 
 
+async def test_login_rehashes_outdated_hash(client, db_session, plain_user):
+    # stored with weaker parameters than the current PasswordHasher
+    plain_user.hashed_password = PasswordHasher(time_cost=1, memory_cost=8192).hash("password123")
+    await db_session.commit()
+
+    response = await client.post(
+        "/auth/login",
+        json={"email": plain_user.email, "password": "password123"},
+    )
+    assert response.status_code == 200
+
+    await db_session.refresh(plain_user)
+    assert not ph.check_needs_rehash(plain_user.hashed_password)
+    assert verify_password("password123", plain_user.hashed_password)
+
+
 async def test_login_unknown_email(client):
     response = await client.post(
         "/auth/login",
@@ -62,6 +89,63 @@ async def test_login_short_password(client):
     assert response.status_code == 422
 
 
+# POST /auth/refresh
+
+async def _login(client, user) -> dict:
+    response = await client.post(
+        "/auth/login",
+        json={"email": user.email, "password": "password123"},
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+async def test_refresh_rotates_token(client, employee_user):
+    tokens = await _login(client, employee_user)
+
+    response = await client.post(
+        "/auth/refresh", json={"refresh_token": tokens["refresh_token"]}
+    )
+    assert response.status_code == 200
+    rotated = response.json()
+    assert rotated["refresh_token"] != tokens["refresh_token"]
+    assert verify_access_token(rotated["access_token"])["roles"] == ["employee"]
+
+    response = await client.post(
+        "/auth/refresh", json={"refresh_token": rotated["refresh_token"]}
+    )
+    assert response.status_code == 200
+
+
+async def test_refresh_reuse_revokes_the_family(client, plain_user):
+    tokens = await _login(client, plain_user)
+    other_session = await _login(client, plain_user)
+    response = await client.post(
+        "/auth/refresh", json={"refresh_token": tokens["refresh_token"]}
+    )
+    rotated = response.json()["refresh_token"]
+
+    # the rotated-out token is replayed
+    response = await client.post(
+        "/auth/refresh", json={"refresh_token": tokens["refresh_token"]}
+    )
+    assert response.status_code == 401
+
+    response = await client.post("/auth/refresh", json={"refresh_token": rotated})
+    assert response.status_code == 401
+    # a separate login is a separate family
+    response = await client.post(
+        "/auth/refresh", json={"refresh_token": other_session["refresh_token"]}
+    )
+    assert response.status_code == 200
+
+
+async def test_refresh_unknown_token(client):
+    response = await client.post("/auth/refresh", json={"refresh_token": "nope"})
+    assert response.status_code == 401
+    assert response.json()["error_code"] == "TOKEN_EXPIRED"
+
+
 # POST /auth/change-password
 
 async def test_change_password_success(client, plain_user, auth_headers):
@@ -104,6 +188,33 @@ async def test_change_password_unauthenticated(client):
     assert response.status_code == 401
 
 
+# POST /auth/forgot
+
+
+async def test_forgot_password_queues_reset_email(client, db_session, plain_user):
+    # the request only writes the mail to the outbox; the dispatcher sends it
+    response = await client.post("/auth/forgot", json={"email": plain_user.email})
+    assert response.status_code == 204
+
+    result = await db_session.execute(select(OutboxEvent).where(OutboxEvent.topic == MAIL))
+    (event,) = result.scalars().all()
+    assert event.payload["method"] == "send_reset_email"
+    assert event.payload["kwargs"]["email"] == plain_user.email
+
+    reset = await db_session.execute(
+        select(PasswordResetToken).where(PasswordResetToken.user_id == plain_user.id)
+    )
+    assert reset.scalar_one().token == event.payload["kwargs"]["token"]
+
+
+async def test_forgot_password_unknown_email_queues_nothing(client, db_session):
+    response = await client.post("/auth/forgot", json={"email": "nobody@test.com"})
+    assert response.status_code == 204
+
+    result = await db_session.execute(select(OutboxEvent).where(OutboxEvent.topic == MAIL))
+    assert result.scalars().all() == []
+
+
 # POST /auth/reset
 
 async def _make_reset_token(db_session, user_id, *, token, minutes=10):
@@ -154,3 +265,113 @@ async def test_reset_password_expired_token(client, db_session, plain_user):
         json={"token": "expired-reset-token", "new_password": "resetpassword123"},
     )
     assert response.status_code == 401
+
+
+# stateless auth mode (AUTH_STATELESS) - principal built from the token claims
+
+async def test_stateless_auth_authorizes_from_roles_claim(
+    client, employee_user, monkeypatch
+):
+    monkeypatch.setattr(settings, "AUTH_STATELESS", True)
+    token = create_access_token(employee_user.id, roles=["employee"])
+
+    response = await client.post(
+        "/orders/",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 201
+    assert response.json()["user_id"] == str(employee_user.id)
+
+
+async def test_stateless_auth_denies_without_role_claim(
+    client, employee_user, monkeypatch
+):
+    # the user holds the employee role in the DB, but stateless mode only
+    # trusts what the token says
+    monkeypatch.setattr(settings, "AUTH_STATELESS", True)
+    token = create_access_token(employee_user.id, roles=[])
+
+    response = await client.post(
+        "/orders/",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 403
+
+
+# rate limiting (in-memory buckets, cleared by the client fixture)
+
+async def test_login_rate_limited_per_email_before_hashing(client, plain_user):
+    for _ in range(settings.AUTH_RATE_LIMIT_EMAIL_BURST):
+        response = await client.post(
+            "/auth/login",
+            json={"email": plain_user.email, "password": "wrongpassword"},
+        )
+        assert response.status_code == 401
+
+    hashed_before = password_hashing.stats()["completed"]
+    response = await client.post(
+        "/auth/login",
+        json={"email": plain_user.email.upper(), "password": "password123"},
+    )
+    assert response.status_code == 429
+    assert response.json()["error_code"] == "RATE_LIMITED"
+    assert int(response.headers["Retry-After"]) >= 1
+    assert password_hashing.stats()["completed"] == hashed_before
+
+    # other accounts are unaffected
+    response = await client.post(
+        "/auth/login",
+        json={"email": "someone@test.com", "password": "password123"},
+    )
+    assert response.status_code == 401
+
+
+async def test_auth_routes_rate_limited_per_ip(client, monkeypatch):
+    monkeypatch.setattr(auth_dependencies, "AUTH_BY_IP", RateLimit("auth.ip", 2, 1))
+    for _ in range(2):
+        response = await client.post("/auth/refresh", json={"refresh_token": "nope"})
+        assert response.status_code == 401
+
+    response = await client.post(
+        "/auth/login",
+        json={"email": "someone@test.com", "password": "password123"},
+    )
+    assert response.status_code == 429
+
+
+async def test_ip_limit_uses_forwarded_address_from_trusted_proxy(client, monkeypatch):
+    # the test client connects from 127.0.0.1, a trusted proxy
+    monkeypatch.setattr(auth_dependencies, "AUTH_BY_IP", RateLimit("auth.ip", 1, 1))
+
+    # the leftmost hop is client-supplied; the balancer appended the real one
+    headers = {"X-Forwarded-For": "198.51.100.9, 203.0.113.7"}
+    response = await client.post("/auth/refresh", json={"refresh_token": "nope"}, headers=headers)
+    assert response.status_code == 401
+    response = await client.post(
+        "/auth/refresh",
+        json={"refresh_token": "nope"},
+        headers={"X-Forwarded-For": "198.51.100.10, 203.0.113.7"},
+    )
+    assert response.status_code == 429
+
+    # another client behind the same balancer has its own bucket
+    response = await client.post(
+        "/auth/refresh",
+        json={"refresh_token": "nope"},
+        headers={"X-Forwarded-For": "203.0.113.8"},
+    )
+    assert response.status_code == 401
+
+
+async def test_forwarded_address_from_untrusted_peer_is_ignored(client, monkeypatch):
+    monkeypatch.setattr(auth_dependencies, "AUTH_BY_IP", RateLimit("auth.ip", 1, 1))
+    transport = ASGITransport(app=app, client=("198.51.100.1", 40000))
+
+    async with AsyncClient(transport=transport, base_url="http://test") as direct:
+        for forwarded, expected in (("203.0.113.7", 401), ("203.0.113.8", 429)):
+            response = await direct.post(
+                "/auth/refresh",
+                json={"refresh_token": "nope"},
+                headers={"X-Forwarded-For": forwarded},
+            )
+            assert response.status_code == expected
@@ -6,6 +6,7 @@ docker compose -f docker-compose-test.yml down test-db
 
 import os
 import uuid
+from contextlib import asynccontextmanager
 
 # environment variables — must be set before any app import
 os.environ["ENV"] = "test"
@@ -19,6 +20,7 @@ os.environ["CORS_ALLOW_ORIGINS"] = '["http://test"]'
 os.environ["AWS_REGION"] = "us-east-1"
 os.environ["SENDER_EMAIL"] = "no-reply@test"
 os.environ["APP_BASE_URL"] = "http://test"
+os.environ["MAIL_BACKEND"] = "memory"
 
 # clear settings cache so test env vars take effect
 from app.core.config import get_settings
@@ -27,12 +29,16 @@ get_settings.cache_clear()
 
 # model imports — so Base.metadata knows about every table
 import app.auth.model
+import app.auth.repositories.refresh_token as refresh_token_repo  # noqa: E402
 import app.inventory.models.category
 import app.inventory.models.location
 import app.inventory.models.product
 import app.inventory.models.reservation
 import app.inventory.models.stock
+import app.inventory.models.stock_summary  # noqa: E402
 import app.orders.models.order
+import app.outbox.model  # noqa: E402
+import app.ratelimit.model  # noqa: E402
 import app.rbac.models.permission
 import app.rbac.models.role
 import app.rbac.models.role_permission
@@ -48,8 +54,10 @@ from app.core.constants.user_permissions import USER_PERMISSIONS
 from app.core.security.passwords import hash_password
 from app.core.security.tokens import create_access_token
 from app.database.base import Base
-from app.database.session import get_session
+from app.database.session import RequestContext, get_request_context, get_session
 from app.main import app
+from app.ratelimit.limiter import rate_limiter  # noqa: E402
+from app.rbac.cache import permission_cache, role_permission_snapshot  # noqa: E402
 from app.rbac.models.permission import Permission
 from app.rbac.models.role import Role
 from app.rbac.models.role_permission import role_permissions
@@ -147,10 +155,30 @@ async def seeded(db_session):
 # client — HTTP client wired to the test DB session
 
 @pytest_asyncio.fixture
-async def client(db_session):
+async def client(db_session, monkeypatch):
+    async def override_get_context():
+        yield RequestContext(session=db_session)
+
     async def override_get_db():
         yield db_session
+        # like get_session: commit when the endpoint returns, which also runs
+        # the session's after-commit callbacks (RBAC cache drops)
+        await db_session.commit()
+
+    @asynccontextmanager
+    async def override_script_session():
+        yield db_session
+
+    # writes committed outside the request (refresh family revocation) land
+    # in the test transaction too
+    monkeypatch.setattr(refresh_token_repo, "get_script_session", override_script_session)
+
+    # in-process caches outlive a test; start every test from a cold cache
+    permission_cache.invalidate_all()
+    role_permission_snapshot.invalidate()
+    await rate_limiter.clear()
 
+    app.dependency_overrides[get_request_context] = override_get_context
     app.dependency_overrides[get_session] = override_get_db
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://test") as ac:
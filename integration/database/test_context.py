@@ -0,0 +1,53 @@
+"""
+request context: one session per request, and what the guards resolve is
+kept on it for the rest of the request.
+"""
+
+import uuid
+
+import pytest
+from app.auth.dependencies import get_current_principal
+from app.core.security.tokens import create_access_token
+from app.database.session import RequestContext
+from app.inventory.dependencies import get_current_location
+from app.rbac.dependencies import get_rbac_service, require_permission
+from fastapi import HTTPException
+
+
+async def test_principal_is_resolved_once(db_session, admin_user):
+    context = RequestContext(session=db_session)
+    token = create_access_token(admin_user.id)
+
+    principal = await get_current_principal(token=token, context=context)
+
+    assert principal.id == admin_user.id
+    assert context.principal is principal
+    assert await get_current_principal(token=token, context=context) is principal
+
+
+async def test_permissions_are_resolved_once(db_session, admin_user):
+    context = RequestContext(session=db_session)
+    principal = await get_current_principal(
+        token=create_access_token(admin_user.id), context=context
+    )
+    rbac_service = get_rbac_service(db_session)
+
+    await require_permission("users:view")(principal, context, rbac_service)
+    assert "users:view" in context.permissions
+
+    # later guards read the memoized set: a code outside it is denied
+    context.permissions = frozenset({"users:view"})
+    await require_permission("users:view")(principal, context, rbac_service)
+    with pytest.raises(HTTPException) as exc:
+        await require_permission("users:enable")(principal, context, rbac_service)
+    assert exc.value.status_code == 403
+
+
+async def test_location_is_resolved_once(db_session, admin_user, make_location):
+    location_id = uuid.UUID(await make_location(admin_user))
+    context = RequestContext(session=db_session)
+
+    location = await get_current_location(x_location_id=location_id, context=context)
+
+    assert context.location is location
+    assert await get_current_location(x_location_id=None, context=context) is location
@@ -0,0 +1,36 @@
+"""
+invalidation bus: every delivered event reaches its handlers, whatever order
+the publishing transactions committed in.
+"""
+
+import json
+
+from app.database.invalidation import InvalidationBus
+
+
+def _notify(bus: InvalidationBus, topic: str, key: str | None) -> None:
+    bus._on_notification(None, 1, "cache_invalidation", json.dumps({"topic": topic, "key": key}))
+
+
+def test_events_delivered_out_of_publish_order_are_applied():
+    bus = InvalidationBus("postgresql://unused")
+    dropped = []
+    bus.subscribe("rbac.user", dropped.append)
+
+    # B commits before A: Postgres delivers B's event first
+    _notify(bus, "rbac.user", "b")
+    _notify(bus, "rbac.user", "a")
+    _notify(bus, "rbac.user", "a")
+
+    assert dropped == ["b", "a", "a"]
+
+
+def test_malformed_payload_is_skipped():
+    bus = InvalidationBus("postgresql://unused")
+    dropped = []
+    bus.subscribe("rbac.user", dropped.append)
+
+    bus._on_notification(None, 1, "cache_invalidation", "not json")
+    _notify(bus, "rbac.user", None)
+
+    assert dropped == [None]
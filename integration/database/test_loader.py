@@ -0,0 +1,94 @@
+"""
+request-scoped loader: lookups answered from the session, coalesced while in
+flight, and batched per tick. `Loader.queries` counts the SELECTs it sent.
+"""
+
+import asyncio
+import uuid
+
+from app.database.loader import Loader
+from app.inventory.models.location import Location
+from app.orders.models.order import Order
+
+
+def _location(name: str) -> Location:
+    return Location(name=name, city="metropolis", address="123 st")
+
+
+async def test_loaded_rows_cost_no_query(db_session):
+    location = _location("warehouse")
+    db_session.add(location)
+    await db_session.flush()
+    loader = Loader.of(db_session)
+
+    assert await loader.load(Location, location.id) is location
+    assert loader.queries == 0
+    assert Loader.of(db_session) is loader
+
+
+async def test_concurrent_lookups_share_one_query(db_session):
+    first, second = _location("warehouse"), _location("store")
+    db_session.add_all([first, second])
+    await db_session.commit()
+    ids = [first.id, second.id]
+    db_session.expunge_all()
+    loader = Loader.of(db_session)
+
+    rows = await asyncio.gather(
+        loader.load(Location, ids[0]),
+        loader.load(Location, ids[0]),
+        loader.load(Location, ids[1]),
+        loader.load(Location, uuid.uuid4()),
+    )
+
+    assert loader.queries == 1
+    assert rows[0] is rows[1]
+    assert [row.id for row in rows[:3]] == [ids[0], ids[0], ids[1]]
+    assert rows[3] is None
+
+
+async def test_load_many_skips_missing_keys(db_session):
+    location = _location("warehouse")
+    db_session.add(location)
+    await db_session.commit()
+    db_session.expunge_all()
+    missing = uuid.uuid4()
+
+    found = await Loader.of(db_session).load_many(Location, [location.id, missing, location.id])
+
+    assert list(found) == [location.id]
+
+
+async def test_cancelled_first_caller_does_not_strand_the_batch(db_session):
+    location = _location("warehouse")
+    db_session.add(location)
+    await db_session.commit()
+    db_session.expunge_all()
+    loader = Loader.of(db_session)
+
+    first = asyncio.create_task(loader.load(Location, location.id))
+    second = asyncio.create_task(loader.load(Location, uuid.uuid4()))
+    await asyncio.sleep(0)  # both joined; the first is about to send
+    first.cancel()
+
+    results = await asyncio.gather(first, second, return_exceptions=True)
+    assert all(isinstance(result, asyncio.CancelledError) for result in results)
+    assert loader.queries == 0
+    # the batch is closed: the next lookup sends its own
+    assert (await loader.load(Location, location.id)).id == location.id
+    assert loader.queries == 1
+
+
+async def test_eager_paths_are_loaded(db_session, plain_user):
+    order = Order.create(user_id=plain_user.id)
+    db_session.add(order)
+    await db_session.commit()
+    db_session.expunge_all()
+    loader = Loader.of(db_session)
+
+    loaded = await loader.load(Order, order.id, eager=("items.reservation",))
+    assert loaded.items == []
+    # loaded with its chain: the second lookup is served from the session
+    assert await loader.load(Order, order.id, eager=("items.reservation",)) is loaded
+    assert loader.queries == 1
+
@@ -0,0 +1,138 @@
+"""
+pool telemetry (InstrumentedPool + PoolMetrics) and budget-based sizing.
+"""
+
+import logging
+import os
+
+import pytest
+from app.database.pool import (
+    InstrumentedPool,
+    LatencyHistogram,
+    budget_pool_sizing,
+    instrument_pool,
+)
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+
+def _engine(**kwargs):
+    return create_async_engine(
+        os.environ["DATABASE_URL"], poolclass=InstrumentedPool, **kwargs
+    )
+
+
+async def test_checkouts_are_timed_and_counted():
+    engine = _engine(pool_size=2, max_overflow=1, pool_pre_ping=True)
+    metrics = instrument_pool(engine.sync_engine.pool)
+    try:
+        async with engine.connect() as first, engine.connect() as second:
+            await first.execute(text("SELECT 1"))
+            await second.execute(text("SELECT 1"))
+            async with engine.connect() as third:
+                await third.execute(text("SELECT 1"))
+                snapshot = metrics.snapshot(engine.sync_engine.pool)
+                assert snapshot["checked_out"] == 3
+                assert snapshot["overflow"] == 1
+
+        async with engine.connect() as again:
+            await again.execute(text("SELECT 1"))
+
+        snapshot = metrics.snapshot(engine.sync_engine.pool)
+        assert snapshot["checked_out"] == 0
+        assert snapshot["peak_checked_out"] == 3
+        assert snapshot["connects"] == 3
+        # the connection beyond pool_size is closed on checkin
+        assert snapshot["idle"] == 2
+        assert snapshot["checkout"]["count"] == 4
+        assert snapshot["checkout"]["buckets_ms"]["+Inf"] == 4
+        assert snapshot["pre_ping"]["count"] == 4
+    finally:
+        await engine.dispose()
+
+
+async def test_invalidated_connections_are_counted():
+    engine = _engine(pool_size=1, max_overflow=0)
+    metrics = instrument_pool(engine.sync_engine.pool)
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            await conn.invalidate()
+
+        assert metrics.invalidations == 1
+        assert metrics.checked_out == 0
+    finally:
+        await engine.dispose()
+
+
+async def test_exhausted_pool_counts_a_timeout():
+    engine = _engine(pool_size=1, max_overflow=0, pool_timeout=0.05)
+    metrics = instrument_pool(engine.sync_engine.pool)
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            with pytest.raises(exc.TimeoutError):
+                async with engine.connect():
+                    pass
+
+        assert metrics.timeouts == 1
+    finally:
+        await engine.dispose()
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = LatencyHistogram(buckets_ms=(1, 10))
+    for seconds in (0.0005, 0.005, 0.5):
+        histogram.observe(seconds)
+
+    snapshot = histogram.snapshot()
+
+    assert snapshot["buckets_ms"] == {"1": 1, "10": 2, "+Inf": 3}
+    assert snapshot["count"] == 3
+    assert snapshot["max_ms"] == 500.0
+
+
+def test_budget_is_shared_by_workers_and_tasks():
+    sizing = budget_pool_sizing(
+        budget=200, workers=4, tasks=10, pool_size=20, max_overflow=10
+    )
+
+    assert sizing.worker_limit == 5
+    assert (sizing.pool_size, sizing.max_overflow) == (5, 0)
+
+
+def test_budget_keeps_configured_sizes_as_ceilings():
+    sizing = budget_pool_sizing(
+        budget=400, workers=2, tasks=4, pool_size=20, max_overflow=10
+    )
+
+    assert sizing.worker_limit == 50
+    assert (sizing.pool_size, sizing.max_overflow) == (20, 10)
+
+    tight = budget_pool_sizing(
+        budget=100, workers=4, tasks=1, pool_size=20, max_overflow=10
+    )
+    assert (tight.pool_size, tight.max_overflow) == (20, 5)
+
+
+def test_budget_leaves_room_for_the_listener():
+    # 4 workers x (24 pooled + 1 listener) = 100
+    sizing = budget_pool_sizing(
+        budget=100, workers=4, tasks=1, pool_size=20, max_overflow=10,
+        reserved_per_worker=1,
+    )
+
+    assert sizing.worker_limit == 24
+    assert (sizing.pool_size, sizing.max_overflow) == (20, 4)
+
+
+def test_budget_never_starves_a_worker(caplog):
+    with caplog.at_level(logging.WARNING, logger="app.database.pool"):
+        sizing = budget_pool_sizing(
+            budget=10, workers=4, tasks=10, pool_size=20, max_overflow=10,
+            reserved_per_worker=1,
+        )
+
+    assert (sizing.pool_size, sizing.max_overflow) == (1, 0)
+    (record,) = caplog.records
+    assert record.connections == 80
@@ -0,0 +1,23 @@
+"""
+after_commit: callbacks run once the session's transaction commits (not when a
+savepoint is released) and are dropped when it rolls back.
+"""
+
+from app.database.session import after_commit
+from sqlalchemy import text
+
+
+async def test_callbacks_run_after_commit_only(db_session):
+    calls = []
+
+    await db_session.execute(text("SELECT 1"))
+    after_commit(db_session, lambda: calls.append("rolled back"))
+    await db_session.rollback()
+    await db_session.commit()
+    assert calls == []
+
+    async with db_session.begin_nested():  # a savepoint is not the commit
+        after_commit(db_session, lambda: calls.append("committed"))
+    assert calls == []
+    await db_session.commit()
+    assert calls == ["committed"]
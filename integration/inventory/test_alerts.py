@@ -0,0 +1,180 @@
+"""
+low-stock alerts: detection on the request path (outbox events written in the
+request's transaction) and the background worker that turns them into digest
+mails on the mail outbox.
+
+Fixtures come from integration/conftest.py (`make_stock`, `make_order`,
+`auth_headers`, ...). The worker is driven with `run_once()` against the
+test session; nothing talks to SES.
+"""
+
+from contextlib import asynccontextmanager
+
+from app.inventory.alerts import LOW_STOCK, LowStockAlertWorker
+from app.mail.queue import MAIL
+from app.outbox.model import OutboxEvent
+from sqlalchemy import select
+
+
+async def _events(db_session, topic: str = LOW_STOCK) -> list[OutboxEvent]:
+    result = await db_session.execute(
+        select(OutboxEvent)
+        .where(OutboxEvent.topic == topic)
+        .execution_options(populate_existing=True)
+    )
+    return list(result.scalars().all())
+
+
+async def _remove(client, user, stock, quantity, auth_headers):
+    response = await client.post(
+        "/inventory/out",
+        headers=auth_headers(user, location_id=stock["location_id"]),
+        json={"product_id": stock["product_id"], "quantity": quantity},
+    )
+    assert response.status_code == 200
+
+
+def _worker(db_session) -> LowStockAlertWorker:
+    @asynccontextmanager
+    async def session_factory():
+        yield db_session
+
+    return LowStockAlertWorker(
+        recipients=["ops@test"],
+        session_factory=session_factory,
+        interval=1,
+    )
+
+
+# detection
+
+
+async def test_remove_stock_crossing_reorder_point_enqueues_event(
+    client, employee_user, admin_user, make_stock, auth_headers, db_session
+):
+    stock = await make_stock(admin_user, quantity=10, reorder_point=5)
+
+    await _remove(client, employee_user, stock, 3, auth_headers)  # 7, still above
+    assert await _events(db_session) == []
+
+    await _remove(client, employee_user, stock, 2, auth_headers)  # 5, crosses
+    events = await _events(db_session)
+    assert len(events) == 1
+    assert events[0].key == stock["stock_id"]
+    assert events[0].payload["available"] == 5
+
+    await _remove(client, employee_user, stock, 1, auth_headers)  # already below
+    assert len(await _events(db_session)) == 1
+
+
+async def test_adjust_stock_crossing_reorder_point_enqueues_event(
+    client, employee_user, admin_user, make_stock, auth_headers, db_session
+):
+    stock = await make_stock(admin_user, quantity=10, reorder_point=5)
+
+    response = await client.post(
+        "/inventory/adjust",
+        headers=auth_headers(employee_user, location_id=stock["location_id"]),
+        json={"product_id": stock["product_id"], "quantity": 2},
+    )
+    assert response.status_code == 200
+    assert [event.key for event in await _events(db_session)] == [stock["stock_id"]]
+
+
+async def test_reservation_crossing_reorder_point_enqueues_event(
+    client, employee_user, admin_user, make_stock, make_order, auth_headers, db_session
+):
+    stock = await make_stock(admin_user, quantity=10, reorder_point=5)
+    order_id = await make_order(employee_user)
+    await client.post(
+        f"/orders/{order_id}/items",
+        headers=auth_headers(employee_user),
+        json={"product_id": stock["product_id"], "quantity": 6},
+    )
+
+    response = await client.patch(
+        f"/orders/{order_id}/confirm",
+        headers=auth_headers(employee_user, location_id=stock["location_id"]),
+    )
+    assert response.status_code == 200
+
+    events = await _events(db_session)
+    assert len(events) == 1
+    assert events[0].payload["available"] == 4
+
+
+async def test_remove_stock_counts_reserved_units(
+    client, employee_user, admin_user, make_stock, make_order, auth_headers, db_session
+):
+    stock = await make_stock(admin_user, quantity=10, reorder_point=5)
+    order_id = await make_order(employee_user)
+    await client.post(
+        f"/orders/{order_id}/items",
+        headers=auth_headers(employee_user),
+        json={"product_id": stock["product_id"], "quantity": 3},
+    )
+    response = await client.patch(
+        f"/orders/{order_id}/confirm",
+        headers=auth_headers(employee_user, location_id=stock["location_id"]),
+    )
+    assert response.status_code == 200
+    assert await _events(db_session) == []  # 7 available
+
+    # 8 on hand, 3 reserved: the counters come back with the movement
+    await _remove(client, employee_user, stock, 2, auth_headers)
+
+    (event,) = await _events(db_session)
+    assert event.payload["available"] == 5
+    assert event.payload["reorder_point"] == 5
+    assert event.payload["location_id"] == str(stock["location_id"])
+
+
+# digests
+
+
+async def test_worker_queues_one_digest_per_location(
+    client, employee_user, admin_user, make_stock, make_product, make_category,
+    auth_headers, db_session,
+):
+    first = await make_stock(admin_user, quantity=10, reorder_point=5)
+    category_id = await make_category(admin_user, name="hardware")
+    product_id = await make_product(admin_user, name="bolt", sku="SKU-2", category_id=category_id)
+    second = await make_stock(
+        admin_user, product_id=product_id, location_id=first["location_id"],
+        quantity=10, reorder_point=5,
+    )
+    await _remove(client, employee_user, first, 6, auth_headers)
+    await _remove(client, employee_user, second, 8, auth_headers)
+
+    consumed = await _worker(db_session).run_once()
+
+    assert consumed == 2
+    assert await _events(db_session) == []
+    mails = await _events(db_session, MAIL)
+    assert len(mails) == 1
+    assert mails[0].payload["method"] == "send_low_stock_digest"
+    digest = mails[0].payload["kwargs"]
+    assert digest["to"] == ["ops@test"]
+    assert {item["sku"] for item in digest["items"]} == {"SKU-1", "SKU-2"}
+
+
+async def test_worker_drops_replenished_stock(
+    client, employee_user, admin_user, make_stock, auth_headers, db_session
+):
+    stock = await make_stock(admin_user, quantity=10, reorder_point=5)
+    await _remove(client, employee_user, stock, 6, auth_headers)
+    response = await client.post(
+        "/inventory/in",
+        headers=auth_headers(employee_user, location_id=stock["location_id"]),
+        json={"product_id": stock["product_id"], "quantity": 20},
+    )
+    assert response.status_code == 200
+
+    assert await _worker(db_session).run_once() == 1
+    assert await _events(db_session) == []
+    assert await _events(db_session, MAIL) == []
+
+
+async def test_worker_ignores_empty_outbox(db_session):
+    assert await _worker(db_session).run_once() == 0
+    assert await _events(db_session, MAIL) == []
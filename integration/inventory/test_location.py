@@ -47,6 +47,22 @@ async def test_list_locations(client, admin_user, auth_headers):
     assert body["total"] == len(body["items"])
 
 
+async def test_list_locations_stream(client, admin_user, auth_headers):
+    # streamed: a bare array, no items/total envelope
+    first = await _create_location(client, admin_user, auth_headers, "warehouse")
+    second = await _create_location(client, admin_user, auth_headers, "store")
+
+    response = await client.get(
+        "/inventory/locations",
+        headers=auth_headers(admin_user),
+        params={"stream": "true"},
+    )
+    assert response.status_code == 200
+    assert [location["id"] for location in response.json()] == sorted(
+        [first, second], key=uuid.UUID
+    )
+
+
 async def test_list_locations_employee_allowed(client, admin_user, employee_user, auth_headers):
     # employees can see locations even though they cannot create them
     location_id = await _create_location(client, admin_user, auth_headers, "warehouse")
@@ -60,6 +76,26 @@ async def test_list_locations_employee_allowed(client, admin_user, employee_user
     assert location_id in ids
 
 
+async def test_list_locations_not_modified(client, admin_user, auth_headers):
+    await _create_location(client, admin_user, auth_headers, "warehouse")
+    headers = auth_headers(admin_user)
+    etag = (await client.get("/inventory/locations", headers=headers)).headers["ETag"]
+
+    response = await client.get(
+        "/inventory/locations", headers={**headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 304
+
+    # a new location changes the tag
+    await _create_location(client, admin_user, auth_headers, "store")
+    response = await client.get(
+        "/inventory/locations", headers={**headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.json()["total"] == 2
+    assert response.headers["ETag"] != etag
+
+
 async def test_list_locations_empty(client, admin_user, auth_headers):
     response = await client.get(
         "/inventory/locations",
@@ -12,6 +12,7 @@ Fixtures and helpers come from integration/conftest.py:
 - `auth_headers`: builds the Authorization header for a user
 """
 
+import json
 import uuid
 
 
@@ -71,6 +72,26 @@ async def test_get_product_not_found(client, admin_user, auth_headers):
     )
     assert response.status_code == 404
 
+
+async def test_get_product_not_modified(client, admin_user, auth_headers):
+    category_id = await _create_category(client, admin_user, auth_headers, "tools")
+    product_id = await _create_product(
+        client, admin_user, auth_headers, "widget", "SKU-1", category_id
+    )
+    headers = auth_headers(admin_user)
+
+    first = await client.get(f"/inventory/products/{product_id}", headers=headers)
+    etag = first.headers["ETag"]
+    assert first.headers["Cache-Control"] == "private, max-age=60"
+
+    response = await client.get(
+        f"/inventory/products/{product_id}",
+        headers={**headers, "If-None-Match": etag},
+    )
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert response.content == b""
+
 # GET inventory/products
 
 
@@ -85,10 +106,135 @@ async def test_list_products(client, admin_user, auth_headers):
         headers=auth_headers(admin_user),
     )
     assert response.status_code == 200
-    ids = [product["id"] for product in response.json()]
+    ids = [product["id"] for product in response.json()["items"]]
     assert product_id in ids
 
 
+async def test_list_products_pages(client, admin_user, auth_headers):
+    category_id = await _create_category(client, admin_user, auth_headers, "tools")
+    created = {
+        await _create_product(
+            client, admin_user, auth_headers, f"widget {n}", f"SKU-{n}", category_id
+        )
+        for n in range(5)
+    }
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        response = await client.get(
+            "/inventory/products",
+            headers=auth_headers(admin_user),
+            params=params,
+        )
+        assert response.status_code == 200
+        body = response.json()
+        assert len(body["items"]) <= 2
+        seen.extend(body["items"])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            break
+
+    ids = [product["id"] for product in seen]
+    assert len(ids) == len(set(ids))
+    assert created <= set(ids)
+    # newest first, ties broken by id
+    keys = [(product["created_at"], uuid.UUID(product["id"])) for product in seen]
+    assert keys == sorted(keys, reverse=True)
+
+
+async def test_list_products_filters(client, admin_user, auth_headers):
+    tools = await _create_category(client, admin_user, auth_headers, "tools")
+    parts = await _create_category(client, admin_user, auth_headers, "parts")
+    hammer = await _create_product(
+        client, admin_user, auth_headers, "Claw Hammer", "TL-100", tools
+    )
+    wrench = await _create_product(
+        client, admin_user, auth_headers, "Wrench", "TL-200", tools
+    )
+    bolt = await _create_product(
+        client, admin_user, auth_headers, "Hex bolt", "PT-100", parts
+    )
+    await client.delete(f"/inventory/products/{wrench}", headers=auth_headers(admin_user))
+
+    async def listed(**params):
+        response = await client.get(
+            "/inventory/products",
+            headers=auth_headers(admin_user),
+            params=params,
+        )
+        assert response.status_code == 200
+        return {product["id"] for product in response.json()["items"]}
+
+    assert await listed(category_id=tools) == {hammer, wrench}
+    assert await listed(sku_prefix="tl-") == {hammer, wrench}
+    assert await listed(sku_prefix="TL-1") == {hammer}
+    assert await listed(q="hammer") == {hammer}
+    assert await listed(is_active="false", category_id=tools) == {wrench}
+    assert bolt in await listed(is_active="true")
+    assert wrench not in await listed(is_active="true")
+    # LIKE wildcards are matched literally
+    assert await listed(sku_prefix="%") == set()
+
+
+async def test_list_products_stream_ndjson(client, admin_user, auth_headers):
+    category_id = await _create_category(client, admin_user, auth_headers, "tools")
+    created = {
+        await _create_product(
+            client, admin_user, auth_headers, f"widget {n}", f"SKU-{n}", category_id
+        )
+        for n in range(3)
+    }
+
+    # streams every match: limit only applies to pages
+    response = await client.get(
+        "/inventory/products",
+        headers={**auth_headers(admin_user), "Accept": "application/x-ndjson"},
+        params={"limit": 1, "sku_prefix": "sku-"},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = response.text.splitlines()
+    assert {json.loads(line)["id"] for line in lines} == created
+
+
+async def test_list_products_stream_json_array(client, admin_user, auth_headers):
+    category_id = await _create_category(client, admin_user, auth_headers, "tools")
+    product_id = await _create_product(
+        client, admin_user, auth_headers, "widget", "SKU-1", category_id
+    )
+
+    response = await client.get(
+        "/inventory/products",
+        headers=auth_headers(admin_user),
+        params={"stream": "true"},
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert isinstance(body, list)
+    assert product_id in [product["id"] for product in body]
+
+
+async def test_list_products_stream_empty(client, admin_user, auth_headers):
+    response = await client.get(
+        "/inventory/products",
+        headers=auth_headers(admin_user),
+        params={"stream": "true", "sku_prefix": "NO-SUCH-"},
+    )
+    assert response.status_code == 200
+    assert response.json() == []
+
+
+async def test_list_products_invalid_cursor(client, admin_user, auth_headers):
+    response = await client.get(
+        "/inventory/products",
+        headers=auth_headers(admin_user),
+        params={"cursor": "not-a-cursor"},
+    )
+    assert response.status_code == 400
+    assert response.json()["error_code"] == "INVALID_CURSOR"
+
+
 async def test_list_products_forbidden(client, client_user, auth_headers):
     response = await client.get(
         "/inventory/products",
@@ -20,8 +20,11 @@ Other fixtures from integration/conftest.py:
                     `location_id=` to also attach the X-Location-Id header
 """
 
+import json
 import uuid
 
+from app.core.config import settings
+
 # POST /inventory/new  (initialize stock)
 
 
@@ -256,6 +259,47 @@ async def test_remove_stock_invalid_quantity(client, employee_user, admin_user,
     assert response.status_code == 400
 
 
+async def test_remove_stock_exceeds_available(client, employee_user, admin_user, make_stock, auth_headers):
+    stock = await make_stock(admin_user, quantity=10)
+    headers = auth_headers(employee_user, location_id=stock["location_id"])
+
+    response = await client.post(
+        "/inventory/out",
+        headers=headers,
+        json={
+            "product_id": stock["product_id"],
+            "quantity": 11,
+        },
+    )
+
+    assert response.status_code == 400
+    assert response.json()["error_code"] == "STOCK_NEGATIVE"
+
+    # the refused update must not leave a movement behind
+    response = await client.get(
+        "/inventory/movements",
+        headers=headers,
+        params={"stock_id": stock["stock_id"]},
+    )
+    assert response.json()["total"] == 0
+
+
+async def test_remove_stock_unknown_product(client, employee_user, admin_user, make_stock, auth_headers):
+    stock = await make_stock(admin_user, quantity=10)
+
+    response = await client.post(
+        "/inventory/out",
+        headers=auth_headers(employee_user, location_id=stock["location_id"]),
+        json={
+            "product_id": str(uuid.uuid4()),
+            "quantity": 1,
+        },
+    )
+
+    assert response.status_code == 400
+    assert response.json()["error_code"] == "INVALID_PRODUCT_OR_LOCATION"
+
+
 async def test_adjust_stock(client, employee_user, admin_user, make_stock, auth_headers):
     stock = await make_stock(admin_user, quantity=10)
 
@@ -270,6 +314,8 @@ async def test_adjust_stock(client, employee_user, admin_user, make_stock, auth_
 
     assert response.status_code == 200
     assert response.json()["new_quantity"] == 50
+    assert response.json()["previous_quantity"] == 10
+    assert response.json()["quantity"] == 40
 
 
 async def test_adjust_stock_forbidden(client, client_user, admin_user, make_stock, auth_headers):
@@ -301,6 +347,138 @@ async def test_adjust_stock_invalid_quantity(client, employee_user, admin_user,
 
     assert response.status_code == 400
 
+# POST /inventory/import  (bulk NDJSON / CSV)
+
+def _ndjson(*rows: dict) -> bytes:
+    return "\n".join(json.dumps(row) for row in rows).encode()
+
+
+async def test_import_stock_ndjson(client, employee_user, admin_user, make_stock, auth_headers):
+    stock = await make_stock(admin_user, quantity=10)
+
+    response = await client.post(
+        "/inventory/import",
+        headers={
+            **auth_headers(employee_user, location_id=stock["location_id"]),
+            "Content-Type": "application/x-ndjson",
+        },
+        content=_ndjson(
+            {"sku": "sku-1", "quantity": 5, "type": "in"},
+            {"product_id": stock["product_id"], "quantity": 3, "type": "out"},
+            {"sku": "SKU-1", "quantity": 20, "type": "adjust"},
+        ),
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["applied"] == 3
+    assert body["failed"] == 0
+    # lines apply in order: 10 + 5 - 3, then set to 20
+    assert [r["new_quantity"] for r in body["results"]] == [15, 12, 20]
+
+
+async def test_import_stock_reports_bad_lines(client, employee_user, admin_user, make_stock, auth_headers):
+    stock = await make_stock(admin_user, quantity=10)
+    headers = {
+        **auth_headers(employee_user, location_id=stock["location_id"]),
+        "Content-Type": "application/x-ndjson",
+    }
+
+    response = await client.post(
+        "/inventory/import",
+        headers=headers,
+        content=b"\n".join([
+            _ndjson({"sku": "SKU-1", "quantity": 4, "type": "in"}),
+            b"{not json",
+            _ndjson({"sku": "NOPE", "quantity": 1, "type": "in"}),
+            _ndjson({"sku": "SKU-1", "quantity": 100, "type": "out"}),
+            _ndjson({"sku": "SKU-1", "quantity": 1, "type": "move"}),
+        ]),
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["applied"] == 1
+    assert [(r["line"], r["error_code"]) for r in body["results"] if not r["ok"]] == [
+        (2, "INVALID_IMPORT_LINE"),
+        (3, "PRODUCT_NOT_FOUND"),
+        (4, "STOCK_NEGATIVE"),
+        (5, "INVALID_IMPORT_LINE"),
+    ]
+
+    # only the good line left a movement
+    response = await client.get(
+        "/inventory/movements",
+        headers=headers,
+        params={"stock_id": stock["stock_id"]},
+    )
+    assert response.json()["total"] == 1
+    assert response.json()["items"][0]["new_quantity"] == 14
+
+
+async def test_import_stock_csv_in_chunks(
+    client, employee_user, admin_user, make_stock, auth_headers, monkeypatch
+):
+    # 5 lines over chunks of 2 -> three transactions, still applied in order
+    monkeypatch.setattr(settings, "STOCK_IMPORT_CHUNK_SIZE", 2)
+    stock = await make_stock(admin_user, quantity=10)
+
+    response = await client.post(
+        "/inventory/import",
+        headers={
+            **auth_headers(employee_user, location_id=stock["location_id"]),
+            "Content-Type": "text/csv",
+        },
+        content=b"sku,quantity,type\r\n" + b"SKU-1,1,in\r\n" * 5,
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["applied"] == 5
+    assert body["results"][-1]["new_quantity"] == 15
+
+
+async def test_import_stock_csv_bad_header(client, employee_user, admin_user, make_stock, auth_headers):
+    stock = await make_stock(admin_user, quantity=10)
+
+    response = await client.post(
+        "/inventory/import",
+        headers={
+            **auth_headers(employee_user, location_id=stock["location_id"]),
+            "Content-Type": "text/csv",
+        },
+        content=b"sku,amount\nSKU-1,1\n",
+    )
+
+    assert response.status_code == 400
+
+
+async def test_import_stock_unsupported_format(client, employee_user, admin_user, make_stock, auth_headers):
+    stock = await make_stock(admin_user, quantity=10)
+
+    response = await client.post(
+        "/inventory/import",
+        headers=auth_headers(employee_user, location_id=stock["location_id"]),
+        json=[{"sku": "SKU-1", "quantity": 1, "type": "in"}],
+    )
+
+    assert response.status_code == 415
+
+
+async def test_import_stock_forbidden(client, client_user, admin_user, make_stock, auth_headers):
+    stock = await make_stock(admin_user, quantity=10)
+
+    response = await client.post(
+        "/inventory/import",
+        headers={
+            **auth_headers(client_user, location_id=stock["location_id"]),
+            "Content-Type": "application/x-ndjson",
+        },
+        content=_ndjson({"sku": "SKU-1", "quantity": 1, "type": "in"}),
+    )
+
+    assert response.status_code == 403
+
 # GET /inventory/movements
 
 
@@ -496,3 +674,93 @@ async def test_get_stock_level_reorder_point(client, admin_user, make_stock, aut
     assert item["id"] == stock["stock_id"]
     assert item["quantity"] == 4  # current quantity after removal
     assert item["reorder_point"] == 5  # unchanged from creation
+
+
+# GET inventory/stock/summary (trigger-maintained, ETag / If-None-Match)
+
+
+async def test_stock_summary(client, admin_user, employee_user, make_stock, auth_headers):
+    stock = await make_stock(admin_user, quantity=10, reorder_point=5)
+    headers = auth_headers(employee_user, location_id=stock["location_id"])
+
+    response = await client.get("/inventory/stock/summary", headers=headers)
+
+    assert response.status_code == 200
+    assert response.headers["ETag"].startswith('W/"')
+    body = response.json()
+    assert body["total"] == 1
+    item = body["items"][0]
+    assert item["stock_id"] == stock["stock_id"]
+    assert item["sku"] == "SKU-1"
+    assert item["name"] == "widget"
+    assert item["available"] == 10
+    assert item["low_stock"] is False
+
+
+async def test_stock_summary_not_modified(client, admin_user, make_stock, auth_headers):
+    stock = await make_stock(admin_user, quantity=10)
+    headers = auth_headers(admin_user, location_id=stock["location_id"])
+
+    first = await client.get("/inventory/stock/summary", headers=headers)
+    etag = first.headers["ETag"]
+
+    response = await client.get(
+        "/inventory/stock/summary", headers={**headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert response.content == b""
+
+
+async def test_stock_summary_follows_stock_writes(client, admin_user, make_stock, auth_headers):
+    stock = await make_stock(admin_user, quantity=10, reorder_point=5)
+    headers = auth_headers(admin_user, location_id=stock["location_id"])
+    etag = (await client.get("/inventory/stock/summary", headers=headers)).headers["ETag"]
+
+    response = await client.post(
+        "/inventory/out",
+        headers=headers,
+        json={"product_id": stock["product_id"], "quantity": 6},
+    )
+    assert response.status_code == 200
+
+    response = await client.get(
+        "/inventory/stock/summary", headers={**headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    (item,) = response.json()["items"]
+    assert item["quantity"] == 4
+    assert item["available"] == 4
+    assert item["low_stock"] is True
+
+    response = await client.get(
+        "/inventory/stock/summary", headers=headers, params={"low_stock": True}
+    )
+    assert response.json()["total"] == 1
+
+
+async def test_stock_summary_follows_product_rename(client, admin_user, make_stock, auth_headers):
+    stock = await make_stock(admin_user)
+    headers = auth_headers(admin_user, location_id=stock["location_id"])
+
+    response = await client.patch(
+        f"/inventory/products/{stock['product_id']}",
+        headers=headers,
+        json={"name": "gadget"},
+    )
+    assert response.status_code == 200
+
+    response = await client.get("/inventory/stock/summary", headers=headers)
+    assert response.json()["items"][0]["name"] == "gadget"
+
+
+async def test_stock_summary_forbidden(client, admin_user, client_user, make_stock, auth_headers):
+    stock = await make_stock(admin_user)
+
+    response = await client.get(
+        "/inventory/stock/summary",
+        headers=auth_headers(client_user, location_id=stock["location_id"]),
+    )
+
+    assert response.status_code == 403
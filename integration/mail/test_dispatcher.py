@@ -0,0 +1,162 @@
+"""
+mail outbox + MailDispatcher, and the Mailer backends.
+
+Messages are queued with MailQueue on the test session and drained with
+`run_once()` through a fake mailer or a Mailer on the in-memory backend
+(conftest sets MAIL_BACKEND=memory), so nothing talks to SES.
+"""
+
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from datetime import timedelta
+
+import pytest
+from app.mail.backends import FileBackend, MailMessage, MemoryBackend
+from app.mail.dispatcher import MailDispatcher, _Pacer
+from app.mail.mailer import Mailer, get_mailer
+from app.mail.queue import MAIL, MailQueue
+from app.outbox.model import OutboxEvent
+from app.outbox.repository import OutboxRepository
+from app.ratelimit.limiter import MemoryRateLimitStore
+from sqlalchemy import select
+
+
+class FakeMailer:
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.sent: list[tuple[str, dict]] = []
+
+    async def send_reset_email(self, email, token):
+        if self.fail:
+            raise RuntimeError("ses down")
+        self.sent.append(("send_reset_email", {"email": email, "token": token}))
+
+
+def _dispatcher(db_session, mailer, **kwargs) -> MailDispatcher:
+    @asynccontextmanager
+    async def session_factory():
+        yield db_session
+
+    return MailDispatcher(
+        mailer_factory=lambda: mailer,
+        session_factory=session_factory,
+        rate=0,
+        **kwargs,
+    )
+
+
+async def _events(db_session, topic: str = MAIL) -> list[OutboxEvent]:
+    result = await db_session.execute(
+        select(OutboxEvent)
+        .where(OutboxEvent.topic == topic)
+        .execution_options(populate_existing=True)
+    )
+    return list(result.scalars().all())
+
+
+async def test_dispatch_sends_and_deletes(db_session):
+    queue = MailQueue(OutboxRepository(db_session))
+    await queue.send_reset_email("a@test.com", "token-a")
+    await queue.send_reset_email("b@test.com", "token-b")
+
+    mailer = FakeMailer()
+    assert await _dispatcher(db_session, mailer).run_once() == 2
+
+    assert sorted(kwargs["email"] for _, kwargs in mailer.sent) == ["a@test.com", "b@test.com"]
+    assert await _events(db_session) == []
+
+
+async def test_dispatch_failure_backs_off(db_session):
+    await MailQueue(OutboxRepository(db_session)).send_reset_email("a@test.com", "token-a")
+
+    dispatcher = _dispatcher(db_session, FakeMailer(fail=True))
+    assert await dispatcher.run_once() == 1
+
+    events = await _events(db_session)
+    assert len(events) == 1
+    assert events[0].attempts == 1
+    assert "ses down" in events[0].last_error
+    # not due yet
+    assert await dispatcher.run_once() == 0
+
+
+async def test_dispatch_dead_letters_after_max_attempts(db_session):
+    await MailQueue(OutboxRepository(db_session)).send_reset_email("a@test.com", "token-a")
+
+    assert await _dispatcher(db_session, FakeMailer(fail=True), max_attempts=1).run_once() == 1
+
+    assert await _events(db_session) == []
+    dead = await _events(db_session, f"{MAIL}.dead")
+    assert len(dead) == 1
+    assert dead[0].attempts == 1
+    # kept for inspection, but not the live reset token
+    assert dead[0].payload["kwargs"] == {"email": "a@test.com", "token": "[redacted]"}
+
+
+async def test_dispatch_rejects_unknown_method(db_session):
+    await OutboxRepository(db_session).enqueue(MAIL, {"method": "delete_everything", "kwargs": {}})
+
+    mailer = FakeMailer()
+    assert await _dispatcher(db_session, mailer, max_attempts=1).run_once() == 1
+
+    assert mailer.sent == []
+    assert len(await _events(db_session, f"{MAIL}.dead")) == 1
+
+
+async def test_leased_messages_are_not_claimed_again(db_session):
+    queue = MailQueue(OutboxRepository(db_session))
+    await queue.send_reset_email("a@test.com", "token-a")
+    outbox = OutboxRepository(db_session)
+
+    (event,) = await outbox.lease(MAIL, 10, timedelta(minutes=5))
+
+    assert event.payload["kwargs"]["email"] == "a@test.com"
+    # a second dispatcher finds nothing until the lease runs out
+    assert await outbox.lease(MAIL, 10, timedelta(minutes=5)) == []
+    assert await _dispatcher(db_session, FakeMailer()).run_once() == 0
+
+
+async def test_dispatchers_share_one_send_rate():
+    # two dispatchers (two workers) pace against the same bucket
+    store = MemoryRateLimitStore(clock=lambda: 0.0)
+    first, second = _Pacer(1, store), _Pacer(1, store)
+
+    await first.wait()
+
+    with pytest.raises(TimeoutError):
+        await asyncio.wait_for(second.wait(), 0.05)
+
+
+# Mailer + backends
+
+
+async def test_dispatch_through_mailer_renders_message(db_session):
+    backend = MemoryBackend()
+    queue = MailQueue(OutboxRepository(db_session))
+    await queue.send_low_stock_digest(
+        to=["ops@test.com", "buyer@test.com"],
+        location_name="warehouse",
+        items=[{"sku": "SKU-1", "name": "widget", "available": 1, "reorder_point": 5}],
+    )
+
+    assert await _dispatcher(db_session, Mailer(backend)).run_once() == 1
+
+    (message,) = backend.sent
+    assert message.to == ["ops@test.com", "buyer@test.com"]
+    assert "warehouse" in message.subject
+    assert "SKU-1" in message.body_text
+
+
+def test_get_mailer_is_process_wide():
+    mailer = get_mailer()
+    assert get_mailer() is mailer
+    assert isinstance(mailer.backend, MemoryBackend)
+
+
+async def test_file_backend_writes_json(tmp_path):
+    backend = FileBackend(str(tmp_path))
+    await backend.send(MailMessage(to=["a@test.com"], subject="hi", body_text="t", body_html="h"))
+
+    (path,) = tmp_path.iterdir()
+    assert json.loads(path.read_text())["to"] == ["a@test.com"]
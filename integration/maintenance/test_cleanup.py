@@ -0,0 +1,88 @@
+"""
+cleanup job: which token rows it deletes and which it must keep. The job runs
+against the test session (no commit per batch), with a small batch size so
+the loop takes more than one batch.
+"""
+
+import uuid
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+
+from app.auth.model import PasswordResetToken, RefreshToken
+from app.maintenance.cleanup import CleanupJob
+from sqlalchemy import select
+
+
+def _job(db_session, batch_size: int = 2) -> CleanupJob:
+    @asynccontextmanager
+    async def session_factory():
+        yield db_session
+
+    return CleanupJob(session_factory=session_factory, batch_size=batch_size)
+
+
+def _refresh(user, name: str, family_id: uuid.UUID, *, revoked=False, expired=False) -> RefreshToken:
+    now = datetime.now(timezone.utc)
+    return RefreshToken(
+        user_id=user.id,
+        token_hash=name,
+        family_id=family_id,
+        is_revoked=revoked,
+        expires_at=now - timedelta(days=1) if expired else now + timedelta(days=1),
+    )
+
+
+async def _remaining(db_session, column) -> set[str]:
+    result = await db_session.execute(select(column))
+    return set(result.scalars().all())
+
+
+async def test_cleanup_deletes_dead_refresh_tokens_only(db_session, plain_user):
+    live_family, dead_family = uuid.uuid7(), uuid.uuid7()
+    db_session.add_all([
+        _refresh(plain_user, "live", live_family),
+        # rotated out of a live family: kept for reuse detection
+        _refresh(plain_user, "rotated", live_family, revoked=True),
+        _refresh(plain_user, "expired", live_family, expired=True),
+        _refresh(plain_user, "logged-out-1", dead_family, revoked=True),
+        _refresh(plain_user, "logged-out-2", dead_family, revoked=True),
+        _refresh(plain_user, "logged-out-3", dead_family, revoked=True),
+    ])
+    await db_session.commit()
+
+    results = await _job(db_session).run_once()
+
+    assert await _remaining(db_session, RefreshToken.token_hash) == {"live", "rotated"}
+    report = {result.table: result for result in results}
+    assert report["refresh_tokens"].deleted == 4
+    assert report["refresh_tokens"].batches == 3
+    assert report["refresh_tokens"].index_bytes > 0
+
+
+async def test_cleanup_deletes_used_and_expired_reset_tokens(db_session, plain_user):
+    now = datetime.now(timezone.utc)
+    db_session.add_all([
+        PasswordResetToken(user_id=plain_user.id, token="valid", expires_at=now + timedelta(minutes=5)),
+        PasswordResetToken(user_id=plain_user.id, token="used", used=True, expires_at=now + timedelta(minutes=5)),
+        PasswordResetToken(user_id=plain_user.id, token="expired", expires_at=now - timedelta(minutes=5)),
+    ])
+    await db_session.commit()
+
+    await _job(db_session).run_once()
+
+    assert await _remaining(db_session, PasswordResetToken.token) == {"valid"}
+
+
+async def test_cleanup_stops_after_max_batches(db_session, plain_user):
+    family_id = uuid.uuid7()
+    db_session.add_all(
+        [_refresh(plain_user, f"old-{i}", family_id, expired=True) for i in range(5)]
+    )
+    await db_session.commit()
+
+    job = _job(db_session, batch_size=1)
+    job.max_batches = 2
+    results = await job.run_once()
+
+    assert results[0].deleted == 2
+    assert len(await _remaining(db_session, RefreshToken.token_hash)) == 3
@@ -0,0 +1,143 @@
+"""
+RequestIdMiddleware: pure ASGI vs the previous BaseHTTPMiddleware version.
+
+Not collected by pytest. Run from the repository root:
+
+    python integration/observability/bench_request_id.py [requests]
+
+Each variant wraps the same Starlette app and serves a plain JSON response
+and a 64-chunk streamed response, called in-process (no server or socket), so
+the difference is the middleware's own cost. Log records go through the
+plain formatter into a discarded stream.
+"""
+
+import asyncio
+import io
+import logging
+import sys
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from app.observability.request_id import (  # noqa: E402
+    RequestIdFilter,
+    RequestIdMiddleware,
+    request_id_var,
+)
+from starlette.applications import Starlette  # noqa: E402
+from starlette.middleware.base import BaseHTTPMiddleware  # noqa: E402
+from starlette.requests import Request  # noqa: E402
+from starlette.responses import JSONResponse, StreamingResponse  # noqa: E402
+from starlette.routing import Route  # noqa: E402
+
+baseline_logger = logging.getLogger("app.observability.request_id.baseline")
+
+
+class BaseHTTPRequestIdMiddleware(BaseHTTPMiddleware):
+    """The implementation this replaced, kept as the baseline."""
+
+    async def dispatch(self, request: Request, call_next):
+        request_id = str(uuid.uuid4())
+        request_id_var.set(request_id)
+        baseline_logger.info(
+            "Request started",
+            extra={"method": request.method, "path": request.url.path},
+        )
+        response = await call_next(request)
+        response.headers["X-Request-ID"] = request_id
+        baseline_logger.info(
+            "Request finished", extra={"status_code": response.status_code}
+        )
+        return response
+
+
+async def _json(request: Request) -> JSONResponse:
+    return JSONResponse({"status": "ok"})
+
+
+async def _stream(request: Request) -> StreamingResponse:
+    async def chunks():
+        for _ in range(64):
+            yield b"x" * 512
+
+    return StreamingResponse(chunks(), media_type="application/octet-stream")
+
+
+def _app(middleware) -> Starlette:
+    app = Starlette(routes=[Route("/json", _json), Route("/stream", _stream)])
+    app.add_middleware(middleware)
+    return app
+
+
+async def _call(app, path: str) -> None:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 1234),
+        "server": ("bench", 80),
+    }
+    sent = False
+
+    async def receive():
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await asyncio.sleep(3600)  # client stays connected
+
+    async def send(message):
+        pass
+
+    await app(scope, receive, send)
+
+
+async def _measure(app, path: str, requests: int) -> float:
+    for _ in range(200):  # warm-up
+        await _call(app, path)
+    started = time.perf_counter()
+    for _ in range(requests):
+        await _call(app, path)
+    return (time.perf_counter() - started) / requests * 1e6
+
+
+def _configure_logging() -> None:
+    handler = logging.StreamHandler(io.StringIO())
+    handler.addFilter(RequestIdFilter())
+    handler.setFormatter(
+        logging.Formatter("%(asctime)s %(name)s %(levelname)s [%(request_id)s] %(message)s")
+    )
+    # StringIO grows without bound; discard what was written
+    handler.stream.write = lambda text: len(text)
+    root = logging.getLogger()
+    root.handlers = [handler]
+    root.setLevel(logging.INFO)
+
+
+async def main(requests: int) -> None:
+    _configure_logging()
+    variants = {
+        "BaseHTTPMiddleware": _app(BaseHTTPRequestIdMiddleware),
+        "pure ASGI": _app(RequestIdMiddleware),
+    }
+    print(f"{requests} requests per case, µs per request")
+    for path in ("/json", "/stream"):
+        results = {name: await _measure(app, path, requests) for name, app in variants.items()}
+        base, new = results["BaseHTTPMiddleware"], results["pure ASGI"]
+        print(
+            f"{path:8} BaseHTTPMiddleware {base:8.1f}   pure ASGI {new:8.1f}"
+            f"   ({(1 - new / base) * 100:.0f}% less)"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000))
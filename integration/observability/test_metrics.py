@@ -0,0 +1,63 @@
+"""
+Prometheus metrics: the middleware labels requests by route template, counts
+their SQL statements, and GET /metrics serves the registry.
+
+Samples accumulate in the process-wide registry across tests, so every
+assertion compares against the value read before the request.
+"""
+
+import uuid
+
+from app.core.security.passwords import password_hashing
+from prometheus_client import REGISTRY
+
+
+def _sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+async def test_requests_are_labelled_by_route_template(client, admin_user, auth_headers):
+    labels = {"method": "GET", "route": "/inventory/products/{id}"}
+    before = _sample("http_request_duration_seconds_count", status="404", **labels)
+    queries_before = _sample("http_request_db_queries_sum", **labels)
+
+    response = await client.get(
+        f"/inventory/products/{uuid.uuid4()}", headers=auth_headers(admin_user)
+    )
+
+    assert response.status_code == 404
+    assert _sample("http_request_duration_seconds_count", status="404", **labels) == before + 1
+    # the principal, its permissions and the product lookup at least
+    assert _sample("http_request_db_queries_sum", **labels) > queries_before
+    assert _sample("http_requests_in_progress", method="GET") == 0
+
+
+async def test_unknown_paths_share_one_series(client):
+    labels = {"method": "GET", "route": "unmatched", "status": "404"}
+    before = _sample("http_request_duration_seconds_count", **labels)
+
+    await client.get(f"/no-such-path/{uuid.uuid4()}")
+    await client.get(f"/no-such-path/{uuid.uuid4()}")
+
+    assert _sample("http_request_duration_seconds_count", **labels) == before + 2
+
+
+async def test_password_hashing_is_timed(client):
+    before = _sample("password_hash_duration_seconds_count", operation="hash_password")
+    waits_before = _sample("password_hash_wait_seconds_count")
+
+    await password_hashing.hash("correct horse battery staple")
+
+    assert _sample("password_hash_duration_seconds_count", operation="hash_password") == before + 1
+    assert _sample("password_hash_wait_seconds_count") == waits_before + 1
+
+
+async def test_metrics_endpoint_serves_the_text_format(client):
+    await client.get("/health")
+
+    response = await client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'http_request_duration_seconds_count{method="GET",route="/health",status="200"}' in response.text
+    assert "db_query_duration_seconds_bucket" in response.text
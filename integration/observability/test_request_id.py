@@ -0,0 +1,40 @@
+"""
+RequestIdMiddleware: X-Request-ID on every response (the caller's when valid)
+and a single access log line per request.
+"""
+
+import logging
+import uuid
+
+
+async def test_new_request_id_is_returned(client):
+    response = await client.get("/health")
+
+    assert response.status_code == 200
+    assert uuid.UUID(response.headers["X-Request-ID"])
+
+
+async def test_incoming_request_id_is_honoured(client):
+    response = await client.get("/health", headers={"X-Request-ID": "lb-7f3a:42"})
+
+    assert response.headers["X-Request-ID"] == "lb-7f3a:42"
+
+
+async def test_invalid_incoming_request_id_is_replaced(client):
+    response = await client.get("/health", headers={"X-Request-ID": "x" * 129})
+
+    assert uuid.UUID(response.headers["X-Request-ID"])
+
+
+async def test_one_access_line_per_request(client, caplog):
+    with caplog.at_level(logging.INFO, logger="app.access"):
+        await client.get("/health")
+        await client.get(f"/no-such-path/{uuid.uuid4()}")
+
+    records = [record for record in caplog.records if record.name == "app.access"]
+    assert [(record.path, record.status_code) for record in records] == [
+        ("/health", 200),
+        (records[1].path, 404),
+    ]
+    assert all(record.duration_ms >= 0 for record in records)
+    assert records[0].getMessage().startswith("GET /health 200 ")
@@ -0,0 +1,96 @@
+"""
+reservation expiry: the sweeper releases holds past their expires_at and
+moves their orders to EXPIRED. It runs with `run_once()` against the test
+session; deadlines are moved into the past with a plain UPDATE.
+"""
+
+from contextlib import asynccontextmanager
+from datetime import timedelta
+
+from app.inventory.models.enums import ReservationStatus
+from app.inventory.models.reservation import StockReservation
+from app.inventory.models.stock import InventoryStock
+from app.orders.expiry import ReservationSweeper
+from app.orders.models.order import Order
+from sqlalchemy import func, select, update
+
+
+def _sweeper(db_session) -> ReservationSweeper:
+    @asynccontextmanager
+    async def session_factory():
+        yield db_session
+
+    return ReservationSweeper(session_factory=session_factory, interval=1)
+
+
+async def _confirmed_order(client, auth_headers, user, stock, quantity) -> str:
+    response = await client.post("/orders/", headers=auth_headers(user))
+    order_id = response.json()["id"]
+    await client.post(
+        f"/orders/{order_id}/items",
+        headers=auth_headers(user),
+        json={"product_id": stock["product_id"], "quantity": quantity},
+    )
+    response = await client.patch(
+        f"/orders/{order_id}/confirm",
+        headers=auth_headers(user, location_id=stock["location_id"]),
+    )
+    assert response.status_code == 200
+    return order_id
+
+
+async def _expire(db_session) -> None:
+    await db_session.execute(
+        update(StockReservation).values(expires_at=func.now() - timedelta(hours=1))
+    )
+
+
+async def test_sweeper_releases_expired_holds(
+    client, auth_headers, admin_user, employee_user, make_stock, db_session
+):
+    stock = await make_stock(admin_user, quantity=10)
+    first = await _confirmed_order(client, auth_headers, employee_user, stock, 3)
+    second = await _confirmed_order(client, auth_headers, employee_user, stock, 2)
+    await _expire(db_session)
+
+    assert await _sweeper(db_session).run_once() == 2
+
+    row = await db_session.get(InventoryStock, stock["stock_id"], populate_existing=True)
+    assert row.quantity == 10
+    assert row.reserved_quantity == 0
+    for order_id in (first, second):
+        order = await db_session.get(Order, order_id, populate_existing=True)
+        assert order.status == "expired"
+    statuses = await db_session.scalars(
+        select(StockReservation.status).execution_options(populate_existing=True)
+    )
+    assert set(statuses) == {ReservationStatus.RELEASED}
+
+    # an expired order can no longer be cancelled
+    response = await client.patch(
+        f"/orders/{first}/cancel",
+        headers=auth_headers(employee_user, location_id=stock["location_id"]),
+    )
+    assert response.status_code == 409
+
+
+async def test_sweeper_leaves_live_and_settled_holds(
+    client, auth_headers, admin_user, employee_user, make_stock, db_session
+):
+    stock = await make_stock(admin_user, quantity=10)
+    completed = await _confirmed_order(client, auth_headers, employee_user, stock, 3)
+    response = await client.patch(
+        f"/orders/{completed}/complete",
+        headers=auth_headers(employee_user, location_id=stock["location_id"]),
+    )
+    assert response.status_code == 200
+    await _expire(db_session)
+    live = await _confirmed_order(client, auth_headers, employee_user, stock, 2)
+
+    assert await _sweeper(db_session).run_once() == 0
+
+    row = await db_session.get(InventoryStock, stock["stock_id"], populate_existing=True)
+    assert row.quantity == 7
+    assert row.reserved_quantity == 2
+    order = await db_session.get(Order, live, populate_existing=True)
+    assert order.status == "confirmed"
@@ -1,3 +1,4 @@
+import json
 import uuid
 
 from app.orders.models.order import Order
@@ -23,6 +24,23 @@ async def test_list_my_orders_returns_own_orders(
     assert all(o["user_id"] == str(employee_user.id) for o in body)
 
 
+async def test_list_my_orders_stream_ndjson(
+    client, employee_user, auth_headers, make_order
+):
+    first = await make_order(employee_user)
+    second = await make_order(employee_user)
+
+    response = await client.get(
+        "/orders/me",
+        headers={**auth_headers(employee_user), "Accept": "application/x-ndjson"},
+    )
+
+    assert response.status_code == 200
+    orders = [json.loads(line) for line in response.text.splitlines()]
+    assert {o["id"] for o in orders} == {first, second}
+    assert all(o["items"] == [] for o in orders)
+
+
 async def test_list_my_orders_excludes_other_users_orders(
     client, employee_user, admin_user, auth_headers, make_order
 ):
@@ -52,6 +70,23 @@ async def test_list_my_orders_allowed_without_order_permission(
     assert response.json() == []
 
 
+async def test_list_my_orders_not_modified(
+    client, employee_user, auth_headers, make_order
+):
+    await make_order(employee_user)
+    headers = auth_headers(employee_user)
+    etag = (await client.get("/orders/me", headers=headers)).headers["ETag"]
+
+    response = await client.get("/orders/me", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["Cache-Control"] == "private, no-cache"
+
+    await make_order(employee_user)
+    response = await client.get("/orders/me", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert len(response.json()) == 2
+
+
 async def test_list_my_orders_unauthenticated(client):
     response = await client.get("/orders/me")
 
@@ -202,6 +237,31 @@ async def test_get_order_by_code_normalizes_input(
     assert response.json()["id"] == order_id
 
 
+async def test_get_order_by_code_not_modified_until_items_change(
+    client, db_session, employee_user, auth_headers, make_order, make_product
+):
+    order_id = await make_order(employee_user)
+    code = await _order_code(db_session, order_id)
+    etag = (await client.get(f"/orders/code/{code}")).headers["ETag"]
+
+    response = await client.get(f"/orders/code/{code}", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+
+    # items live in their own table; adding one still moves the order's tag
+    product_id = await make_product(employee_user)
+    response = await client.post(
+        f"/orders/{order_id}/items",
+        headers=auth_headers(employee_user),
+        json={"product_id": product_id, "quantity": 1},
+    )
+    assert response.status_code == 200
+
+    response = await client.get(f"/orders/code/{code}", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert len(response.json()["items"]) == 1
+
+
 async def test_get_order_by_code_not_found(client):
     response = await client.get("/orders/code/ZZZZ-ZZZZ")
 
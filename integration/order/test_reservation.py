@@ -1,4 +1,26 @@
+from app.core.config import settings
 from app.inventory.models.stock import InventoryStock
+from app.inventory.repositories.stock_repo import StockRepository
+from sqlalchemy import text
+
+# makes postgres itself report a deadlock, so the retry path sees the real
+# error and the aborted transaction state that comes with it
+_RAISE_DEADLOCK = "DO $$ BEGIN RAISE EXCEPTION 'deadlock' USING ERRCODE = '40P01'; END $$"
+
+
+def _deadlock_stock_lock(monkeypatch, times: int) -> None:
+    original = StockRepository.get_stocks_for_update
+    calls = 0
+
+    async def _locked(self, keys, lock_mode="wait"):
+        nonlocal calls
+        calls += 1
+        if calls <= times:
+            await self.db.execute(text(_RAISE_DEADLOCK))
+        return await original(self, keys, lock_mode)
+
+    monkeypatch.setattr(StockRepository, "get_stocks_for_update", _locked)
+    monkeypatch.setattr(settings, "RESERVATION_RETRY_BASE_MS", 1)
 
 
 async def _read_stock(db_session, stock_id: int) -> InventoryStock:
@@ -41,6 +63,133 @@ async def test_confirm_order(
     assert row.reserved_quantity == 3
 
 
+async def test_confirm_order_multiple_items(
+    client, auth_headers, admin_user, employee_user, make_category, make_product,
+    make_stock, make_order, db_session
+):
+    # every line is reserved in one batch against the same location
+    first = await make_stock(admin_user, quantity=10)
+    location_id = first["location_id"]
+    category_id = await make_category(admin_user, name="parts")
+    other_product_id = await make_product(
+        admin_user, name="gadget", sku="SKU-2", category_id=category_id
+    )
+    second = await make_stock(
+        admin_user, product_id=other_product_id, location_id=location_id, quantity=5
+    )
+
+    order_id = await make_order(employee_user)
+    for stock, quantity in ((first, 3), (second, 5)):
+        await client.post(
+            f"/orders/{order_id}/items",
+            headers=auth_headers(employee_user),
+            json={"product_id": stock["product_id"], "quantity": quantity},
+        )
+
+    response = await client.patch(
+        f"/orders/{order_id}/confirm",
+        headers=auth_headers(employee_user, location_id=location_id),
+    )
+
+    assert response.status_code == 200
+
+    row = await _read_stock(db_session, first["stock_id"])
+    assert row.reserved_quantity == 3
+    row = await _read_stock(db_session, second["stock_id"])
+    assert row.reserved_quantity == 5
+
+
+async def test_confirm_order_multiple_items_all_or_nothing(
+    client, auth_headers, admin_user, employee_user, make_category, make_product,
+    make_stock, make_order, db_session
+):
+    # the second line can't be covered, so the first one must not be reserved either
+    first = await make_stock(admin_user, quantity=10)
+    location_id = first["location_id"]
+    category_id = await make_category(admin_user, name="parts")
+    other_product_id = await make_product(
+        admin_user, name="gadget", sku="SKU-2", category_id=category_id
+    )
+    second = await make_stock(
+        admin_user, product_id=other_product_id, location_id=location_id, quantity=2
+    )
+
+    order_id = await make_order(employee_user)
+    for stock, quantity in ((first, 3), (second, 5)):
+        await client.post(
+            f"/orders/{order_id}/items",
+            headers=auth_headers(employee_user),
+            json={"product_id": stock["product_id"], "quantity": quantity},
+        )
+
+    response = await client.patch(
+        f"/orders/{order_id}/confirm",
+        headers=auth_headers(employee_user, location_id=location_id),
+    )
+
+    assert response.status_code == 409
+
+    row = await _read_stock(db_session, first["stock_id"])
+    assert row.reserved_quantity == 0
+    row = await _read_stock(db_session, second["stock_id"])
+    assert row.reserved_quantity == 0
+
+
+async def test_confirm_order_retries_after_deadlock(
+    client, auth_headers, admin_user, employee_user, make_stock, make_order, db_session,
+    monkeypatch,
+):
+    # the first attempt is chosen as the deadlock victim; the retry succeeds
+    stock = await make_stock(admin_user, quantity=10)
+    location_id = stock["location_id"]
+
+    order_id = await make_order(employee_user)
+    await client.post(
+        f"/orders/{order_id}/items",
+        headers=auth_headers(employee_user),
+        json={"product_id": stock["product_id"], "quantity": 3},
+    )
+
+    _deadlock_stock_lock(monkeypatch, times=1)
+    response = await client.patch(
+        f"/orders/{order_id}/confirm",
+        headers=auth_headers(employee_user, location_id=location_id),
+    )
+
+    assert response.status_code == 200
+
+    row = await _read_stock(db_session, stock["stock_id"])
+    assert row.reserved_quantity == 3
+
+
+async def test_confirm_order_gives_up_after_retries(
+    client, auth_headers, admin_user, employee_user, make_stock, make_order, db_session,
+    monkeypatch,
+):
+    # contention that never clears ends in a 409, not a 500
+    stock = await make_stock(admin_user, quantity=10)
+    location_id = stock["location_id"]
+
+    order_id = await make_order(employee_user)
+    await client.post(
+        f"/orders/{order_id}/items",
+        headers=auth_headers(employee_user),
+        json={"product_id": stock["product_id"], "quantity": 3},
+    )
+
+    _deadlock_stock_lock(monkeypatch, times=settings.RESERVATION_MAX_ATTEMPTS)
+    response = await client.patch(
+        f"/orders/{order_id}/confirm",
+        headers=auth_headers(employee_user, location_id=location_id),
+    )
+
+    assert response.status_code == 409
+    assert response.json()["error_code"] == "STOCK_LOCKED"
+
+    row = await _read_stock(db_session, stock["stock_id"])
+    assert row.reserved_quantity == 0
+
+
 async def test_confirm_order_forbidden(
     client, auth_headers, admin_user, employee_user, client_user, make_stock, make_order
 ):
@@ -0,0 +1,91 @@
+"""
+token-bucket stores. The memory store runs on a fake clock; the Postgres
+store runs against the test session, one statement per take (its clock is
+statement_timestamp(), so takes inside the test transaction still differ).
+"""
+
+from contextlib import asynccontextmanager
+
+import pytest
+from app.ratelimit.limiter import (
+    MemoryRateLimitStore,
+    PostgresRateLimitStore,
+    RateLimit,
+    RateLimiter,
+    RateLimitExceeded,
+)
+
+LIMIT = RateLimit("test", burst=2, per_minute=60)  # one token per second
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+async def test_memory_store_allows_burst_then_refills():
+    clock = FakeClock()
+    store = MemoryRateLimitStore(clock=clock)
+
+    assert await store.take("k", LIMIT) == 0
+    assert await store.take("k", LIMIT) == 0
+    assert await store.take("k", LIMIT) == pytest.approx(1.0)
+
+    clock.now = 0.5
+    assert await store.take("k", LIMIT) == pytest.approx(0.5)
+    assert await store.take("other", LIMIT) == 0
+
+    clock.now = 1.0
+    assert await store.take("k", LIMIT) == 0
+
+
+async def test_memory_store_prunes_full_buckets_first():
+    clock = FakeClock()
+    store = MemoryRateLimitStore(max_keys=2, clock=clock)
+    await store.take("idle", LIMIT)
+    await store.take("busy", LIMIT)
+    await store.take("busy", LIMIT)
+
+    clock.now = 1.0  # "idle" is full again, "busy" is not
+    await store.take("new", LIMIT)
+
+    assert len(store) == 2
+    assert await store.take("busy", LIMIT) == 0
+    assert await store.take("busy", LIMIT) > 0
+
+
+async def test_limiter_raises_with_retry_after():
+    limiter = RateLimiter(MemoryRateLimitStore(clock=FakeClock()))
+    await limiter.hit(LIMIT, "1.2.3.4")
+    await limiter.hit(LIMIT, "1.2.3.4")
+
+    with pytest.raises(RateLimitExceeded) as exc_info:
+        await limiter.hit(LIMIT, "1.2.3.4")
+    assert exc_info.value.status_code == 429
+    assert exc_info.value.retry_after == pytest.approx(1.0)
+    assert limiter.rejected == 1
+
+
+async def test_disabled_limiter_never_rejects():
+    limiter = RateLimiter(MemoryRateLimitStore(clock=FakeClock()), enabled=False)
+    for _ in range(5):
+        await limiter.hit(LIMIT, "1.2.3.4")
+
+
+async def test_postgres_store_shares_one_bucket_per_key(db_session):
+    @asynccontextmanager
+    async def session_factory():
+        yield db_session
+
+    store = PostgresRateLimitStore(session_factory=session_factory)
+
+    assert await store.take("k", LIMIT) == 0
+    assert await store.take("k", LIMIT) == 0
+    retry_after = await store.take("k", LIMIT)
+    assert 0 < retry_after <= 1
+    # a rejected take doesn't consume anything
+    assert 0 < await store.take("k", LIMIT) <= retry_after
+    assert await store.take("other", LIMIT) == 0
@@ -176,3 +176,28 @@ async def test_remove_role_forbidden(
         headers=auth_headers(client_user),
     )
     assert response.status_code == 403
+
+
+# permission cache - role changes take effect on the next request
+
+async def test_role_changes_invalidate_cached_permissions(
+    client, admin_user, plain_user, auth_headers, seeded
+):
+    admin_role_id = seeded["roles"]["admin"].id
+
+    # first request caches plain_user's (empty) permission set
+    denied = await client.get("/rbac/roles", headers=auth_headers(plain_user))
+    assert denied.status_code == 403
+
+    await _assign_role(client, admin_user, auth_headers, plain_user.id, admin_role_id)
+    granted = await client.get("/rbac/roles", headers=auth_headers(plain_user))
+    assert granted.status_code == 200
+
+    response = await client.delete(
+        f"/rbac/users/{plain_user.id}/roles/{admin_role_id}",
+        headers=auth_headers(admin_user),
+    )
+    assert response.status_code == 204
+
+    revoked = await client.get("/rbac/roles", headers=auth_headers(plain_user))
+    assert revoked.status_code == 403
@@ -153,6 +153,16 @@ async def test_list_users(client, admin_user, auth_headers):
     response = await client.get("/users/list", headers=auth_headers(admin_user))
     assert response.status_code == 200
 
+async def test_list_users_stream(client, admin_user, client_user, auth_headers):
+    response = await client.get(
+        "/users/list",
+        headers=auth_headers(admin_user),
+        params={"stream": "true"},
+    )
+    assert response.status_code == 200
+    ids = {user["id"] for user in response.json()}
+    assert {str(admin_user.id), str(client_user.id)} <= ids
+
 async def test_list_users_forbidden(client, client_user, auth_headers):
     response = await client.get("/users/list", headers=auth_headers(client_user))
     assert response.status_code == 403